@@ -0,0 +1,52 @@
+import timeit
+
+from benchmarks.clone_benchmark import mid_game
+from hsgame.board_mirror import BoardMirror
+
+__author__ = 'Daniel'
+
+AMOUNTS = [1, 2, 3, 4]
+
+
+def evaluate_minions(players):
+    """
+        A board heuristic going through the minions one by one: the attack available on each board, and how many
+        minions damage to the whole board would kill for each amount
+    """
+    results = []
+    for player in players:
+        attack = sum([minion.attack_power + minion.temp_attack for minion in player.minions
+                      if minion.active and not minion.frozen])
+        kills = [len([minion for minion in player.minions if not minion.divine_shield and minion.defense <= amount])
+                 for amount in AMOUNTS]
+        results.append((attack, kills))
+    return results
+
+
+def evaluate_mirror(mirror):
+    mirror.refresh()
+    attack = mirror.attack_power()
+    kills = [mirror.killed_by(amount).sum(axis=1) for amount in AMOUNTS]
+    return [(int(attack[board]), [int(kill[board]) for kill in kills]) for board in range(0, len(mirror))]
+
+
+def main():
+    players = [player for game in [mid_game(seed, 14) for seed in range(0, 20)] for player in game.players]
+    print("{0:.1f} minions per board".format(sum([len(player.minions) for player in players]) / len(players)))
+
+    for boards in [1, 10, 100, 1000]:
+        board_players = [players[index % len(players)] for index in range(0, boards)]
+        mirror = BoardMirror(board_players)
+        assert evaluate_minions(board_players) == evaluate_mirror(mirror)
+
+        count = max(10, 20000 // boards)
+        objects = min(timeit.repeat(lambda: evaluate_minions(board_players), number=count, repeat=3))
+        mirrored = min(timeit.repeat(lambda: evaluate_mirror(mirror), number=count, repeat=3))
+        refresh = min(timeit.repeat(lambda: mirror.refresh(), number=count, repeat=3))
+        print("{0} boards: minion objects {1:.2f} us per board, board mirror {2:.2f} us per board "
+              "({3:.2f} us of it refreshing)".format(boards, objects / count / boards * 1e6,
+                                                     mirrored / count / boards * 1e6, refresh / count / boards * 1e6))
+
+
+if __name__ == "__main__":
+    main()
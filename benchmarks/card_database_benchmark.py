@@ -0,0 +1,55 @@
+import csv
+import timeit
+
+from hsgame.card_database import CARDS_FILE, card_database
+from hsgame.constants import CHARACTER_CLASS
+
+__author__ = 'Daniel'
+
+CLASSES = ["Mage", "Hunter", "Shaman", "Warrior", "Druid", "Priest", "Paladin", "Rogue", "Warlock"]
+
+
+def filter_rows(rows):
+    """
+        Filters the rows of cards.csv directly, as a baseline
+    """
+    found = 0
+    for class_name in CLASSES:
+        for cost in range(0, 11):
+            found += len([row for row in rows if row["Class"] in ("", class_name) and int(row["Cost"]) <= cost and
+                          row["Minion/Spell"] == "Minion" and row["Implemented?"] == "yes"])
+    return found
+
+
+def select(database):
+    found = 0
+    for class_name in CLASSES:
+        character_class = CHARACTER_CLASS.from_str(class_name)
+        for cost in range(0, 11):
+            found += database.count(database.playable_by(character_class) &
+                                    database.select(max_cost=cost, kind="Minion", implemented=True))
+    return found
+
+
+def main():
+    with open(CARDS_FILE, "r") as file:
+        rows = list(csv.DictReader(file))
+    database = card_database()
+    assert filter_rows(rows) == select(database)
+
+    queries = len(CLASSES) * 11
+    count = 20
+    elapsed = min(timeit.repeat(lambda: filter_rows(rows), number=count, repeat=3))
+    print("filtering rows: {0:,.0f} queries/sec".format(count * queries / elapsed))
+
+    count = 2000
+    elapsed = min(timeit.repeat(lambda: select(database), number=count, repeat=3))
+    print("card database: {0:,.0f} queries/sec".format(count * queries / elapsed))
+
+    elapsed = min(timeit.repeat(lambda: database.card_types_of(database.select(max_cost=3, implemented=True)),
+                                number=count, repeat=3))
+    print("card types for a selection: {0:.1f} us".format(elapsed / count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
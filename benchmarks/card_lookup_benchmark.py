@@ -0,0 +1,30 @@
+import io
+import timeit
+
+from hsgame.replay import Replay
+
+__author__ = 'Daniel'
+
+DECK_LINES = [
+    "deck(Mage,Stonetusk Boar,Bloodfen Raptor,Arcane Missiles,Frostbolt,Mana Wyrm,Water Elemental)\n",
+    "deck(Druid,Innervate,Moonfire,Claw,Wrath,Swipe,Keeper of the Grove,Druid of the Claw,Cenarius)\n",
+    "deck(Paladin,Argent Protector,Consecration,Guardian of Kings,Humility,Equality)\n",
+    "deck(Priest,Holy Nova,Mind Blast,Circle of Healing,Novice Engineer,War Golem)\n",
+]
+
+
+def parse_replays(count):
+    for index in range(0, count):
+        replay = Replay()
+        replay.parse_replay(io.StringIO(DECK_LINES[index % 4] + DECK_LINES[(index + 1) % 4]))
+
+
+def main():
+    count = 5000
+    elapsed = min(timeit.repeat(lambda: parse_replays(count), number=1, repeat=3))
+    print("{0:,.0f} deck lines parsed in {1:.3f}s ({2:,.0f} lines/sec)".format(count * 2, elapsed,
+                                                                             count * 2 / elapsed))
+
+
+if __name__ == "__main__":
+    main()
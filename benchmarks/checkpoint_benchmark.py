@@ -0,0 +1,26 @@
+import timeit
+
+from benchmarks.clone_benchmark import mid_game
+
+__author__ = 'Daniel'
+
+
+def main():
+    games = [mid_game(seed) for seed in range(0, 10)]
+    checkpoints = [game.checkpoint() for game in games]
+
+    count = 2000
+    elapsed = min(timeit.repeat(lambda: [game.checkpoint() for game in games], number=count // len(games),
+                                repeat=3))
+    print("Game.checkpoint(): {0:,.0f}/sec ({1:.0f} us each)".format(count / elapsed, elapsed / count * 1e6))
+
+    elapsed = min(timeit.repeat(lambda: [game.rollback(checkpoint) for game, checkpoint in zip(games, checkpoints)],
+                                number=count // len(games), repeat=3))
+    print("Game.rollback(): {0:,.0f}/sec ({1:.0f} us each)".format(count / elapsed, elapsed / count * 1e6))
+
+    elapsed = min(timeit.repeat(lambda: [game.clone() for game in games], number=count // len(games), repeat=3))
+    print("Game.clone(): {0:,.0f}/sec ({1:.0f} us each)".format(count / elapsed, elapsed / count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
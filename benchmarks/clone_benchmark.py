@@ -0,0 +1,43 @@
+import copy
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, Game, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def mid_game(seed, turns=10):
+    random.seed(seed)
+    deck1 = Deck([card_lookup("Stonetusk Boar"), card_lookup("Mana Wyrm"), card_lookup("Bloodfen Raptor")] * 10,
+                 CHARACTER_CLASS.MAGE)
+    deck2 = Deck([card_lookup("Novice Engineer"), card_lookup("Mark of the Wild"), card_lookup("Oasis Snapjaw")] * 10,
+                 CHARACTER_CLASS.DRUID)
+    game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+    game.pre_game()
+    game.current_player = game.players[1]
+    for turn in range(0, turns):
+        game.play_single_turn()
+    return game
+
+
+def main():
+    games = [mid_game(seed) for seed in range(0, 10)]
+    minions = sum(len(player.minions) for game in games for player in game.players)
+    print("{0:.1f} minions on the board per game".format(minions / len(games)))
+
+    count = 2000
+    elapsed = min(timeit.repeat(lambda: [game.clone() for game in games], number=count // len(games), repeat=3))
+    print("Game.clone(): {0:,.0f} clones/sec ({1:.0f} us per clone)".format(count / elapsed, elapsed / count * 1e6))
+
+    count = 200
+    elapsed = min(timeit.repeat(lambda: [copy.deepcopy(game) for game in games], number=count // len(games),
+                                repeat=3))
+    print("copy.deepcopy(): {0:,.0f} copies/sec ({1:.0f} us per copy)".format(count / elapsed, elapsed / count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
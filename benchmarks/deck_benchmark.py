@@ -0,0 +1,44 @@
+import random
+import timeit
+
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def draw_all(cards, randint):
+    deck = Deck(cards, CHARACTER_CLASS.MAGE)
+    while deck.can_draw():
+        deck.draw(randint)
+
+
+def mulligan(cards, randint):
+    deck = Deck(cards, CHARACTER_CLASS.MAGE)
+    hand = [deck.draw(randint) for i in range(0, 4)]
+    for card in hand:
+        deck.draw(randint)
+        deck.put_back(card)
+
+
+def main():
+    names = ["Stonetusk Boar", "Bloodfen Raptor", "Novice Engineer", "Oasis Snapjaw", "War Golem", "Moonfire",
+             "Innervate", "Claw", "Wrath", "Swipe", "Starfire", "Bite", "Savagery", "Nourish", "Cenarius"]
+    cards = [card_lookup(name) for name in names for copy in range(0, 2)]
+    randint = random.Random(1).randint
+
+    count = 5000
+    elapsed = min(timeit.repeat(lambda: draw_all(cards, randint), number=count, repeat=3))
+    print("draw 30 cards: {0:,.0f} decks/sec ({1:.2f} us per draw)".format(count / elapsed, elapsed / count / 30 * 1e6))
+
+    elapsed = min(timeit.repeat(lambda: mulligan(cards, randint), number=count, repeat=3))
+    print("mulligan 4 cards: {0:,.0f} mulligans/sec".format(count / elapsed))
+
+    # Without the cost of generating random numbers
+    elapsed = min(timeit.repeat(lambda: draw_all(cards, lambda lower, upper: upper), number=count, repeat=3))
+    print("draw 30 cards, last card each time: {0:.2f} us per draw".format(elapsed / count / 30 * 1e6))
+
+
+if __name__ == "__main__":
+    main()
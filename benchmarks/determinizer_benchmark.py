@@ -0,0 +1,49 @@
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.determinizer import Determinizer
+from hsgame.game_objects import Deck, Game, card_lookup
+from hsgame.game_random import GameRandom
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def mid_game(seed, turns=10):
+    random.seed(seed)
+    deck1 = Deck([card_lookup("Stonetusk Boar"), card_lookup("Mana Wyrm"), card_lookup("Bloodfen Raptor")] * 10,
+                 CHARACTER_CLASS.MAGE)
+    deck2 = Deck([card_lookup("Novice Engineer"), card_lookup("Mark of the Wild"), card_lookup("Oasis Snapjaw")] * 10,
+                 CHARACTER_CLASS.DRUID)
+    game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+    determinizer = Determinizer(game, seed)
+    game.pre_game()
+    game.current_player = game.players[1]
+    for turn in range(0, turns):
+        game.play_single_turn()
+    return determinizer
+
+
+def main():
+    determinizers = [mid_game(seed) for seed in range(0, 10)]
+    games = [determinizer.game for determinizer in determinizers]
+    randint = GameRandom(1).randint
+
+    count = 2000
+    elapsed = min(timeit.repeat(lambda: [game.clone() for game in games], number=count // len(games), repeat=3))
+    print("Game.clone(): {0:,.0f} clones/sec ({1:.0f} us per clone)".format(count / elapsed, elapsed / count * 1e6))
+
+    for name, sample in [("Determinizer.sample()",
+                          lambda determinizer: determinizer.sample(determinizer.game.current_player)),
+                         ("Determinizer.sample() sharing random numbers",
+                          lambda determinizer: determinizer.sample(determinizer.game.current_player, randint=randint))]:
+        elapsed = min(timeit.repeat(lambda: [sample(determinizer) for determinizer in determinizers],
+                                    number=count // len(determinizers), repeat=3))
+        print("{0}: {1:,.0f} samples/sec ({2:.0f} us per sample)".format(name, count / elapsed,
+                                                                           elapsed / count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
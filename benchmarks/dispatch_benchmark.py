@@ -0,0 +1,65 @@
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Bindable, Deck, Game, GameException, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def trigger_plain(count):
+    binder = Bindable()
+    binder.bind("event", lambda amount, target: None)
+    binder.bind("event", lambda amount, target: None)
+    for i in range(0, count):
+        binder.trigger("event", 1, binder)
+
+
+def trigger_with_bound_args(count):
+    binder = Bindable()
+    binder.bind("event", lambda amount, target, player: None, binder)
+    binder.bind("event", lambda amount, target, player=None: None, player=binder)
+    for i in range(0, count):
+        binder.trigger("event", 1, binder)
+
+
+def trigger_once(count):
+    binder = Bindable()
+    binder.bind("event", lambda: None)
+    for i in range(0, count):
+        binder.bind_once("event", lambda: None)
+        binder.trigger("event")
+
+
+def play_games(count):
+    random.seed(1857)
+    for i in range(0, count):
+        deck1 = Deck([card_lookup("Stonetusk Boar")] * 15 + [card_lookup("Bloodfen Raptor")] * 15,
+                     CHARACTER_CLASS.MAGE)
+        deck2 = Deck([card_lookup("Novice Engineer")] * 15 + [card_lookup("Moonfire")] * 15,
+                     CHARACTER_CLASS.DRUID)
+        game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+        try:
+            game.start()
+        except GameException:
+            # PredictableBot keeps playing cards after a lethal attack
+            pass
+
+
+def main():
+    count = 100000
+    for name, bench in [("plain", trigger_plain),
+                        ("bound args", trigger_with_bound_args),
+                        ("bind_once", trigger_once)]:
+        elapsed = min(timeit.repeat(lambda: bench(count), number=1, repeat=5))
+        print("{0:>12}: {1:,.0f} triggers/sec".format(name, count / elapsed))
+
+    games = 200
+    elapsed = min(timeit.repeat(lambda: play_games(games), number=1, repeat=3))
+    print("{0:>12}: {1:,.0f} games/sec".format("full game", games / elapsed))
+
+
+if __name__ == "__main__":
+    main()
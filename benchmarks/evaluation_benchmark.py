@@ -0,0 +1,54 @@
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.agents.search_agents import GreedyAgent, MCTSAgent, health_evaluation
+from hsgame.evaluation import state_vector, state_vectors, MATERIAL, TEMPO, LETHAL_THREAT, DEFAULT
+from hsgame.game_objects import Game
+from hsgame.game_random import GameRandom
+from hsgame.tournament import make_deck
+from benchmarks.parallel_mcts_benchmark import positions, DECKS
+
+__author__ = 'Daniel'
+
+
+def measure(function, count):
+    return min(timeit.repeat(function, number=1, repeat=5)) / count * 1e6
+
+
+def main():
+    games = positions(8) * 8
+    count = len(games)
+    print("{0} positions".format(count))
+    print("state_vector(): {0:.1f} us per game".format(measure(lambda: [state_vector(game, 0) for game in games],
+                                                               count)))
+    print("state_vectors(): {0:.1f} us per game".format(measure(lambda: state_vectors(games, 0), count)))
+    print("health_evaluation(), for comparison: {0:.1f} us per game".format(
+        measure(lambda: [health_evaluation(game, 0) for game in games], count)))
+
+    vectors = state_vectors(games, 0)
+    rows = [tuple(row) for row in vectors.tolist()]
+    for name, evaluator in [("MATERIAL", MATERIAL), ("TEMPO", TEMPO), ("LETHAL_THREAT", LETHAL_THREAT),
+                            ("DEFAULT", DEFAULT)]:
+        single = measure(lambda: [evaluator.score(row) for row in rows], count)
+        batch = measure(lambda: evaluator.score_batch(vectors), count)
+        games_single = measure(lambda: [evaluator(game, 0) for game in games], count)
+        games_batch = measure(lambda: evaluator.score_games(games, 0), count)
+        print("{0}: score() {1:.2f} us, score_batch() {2:.2f} us per vector; from games {3:.1f} us one at a time, "
+              "{4:.1f} us with score_games()".format(name, single, batch, games_single, games_batch))
+
+    matches = 20
+    for name, make_agent in [("GreedyAgent", lambda seed: GreedyAgent(seed=seed)),
+                             ("MCTSAgent(evaluation=DEFAULT)",
+                              lambda seed: MCTSAgent(None, 100, evaluation=DEFAULT, seed=seed))]:
+        wins = 0
+        for index in range(0, matches):
+            agent = make_agent(index)
+            game = Game([make_deck(deck) for deck in DECKS], [agent, PredictableBot()], GameRandom(5, index))
+            game.start()
+            if [player for player in game.players if player.agent is agent][0].health > 0:
+                wins += 1
+        print("{0} against PredictableBot: won {1} of {2}".format(name, wins, matches))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import gc
+import random
+import tracemalloc
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, Game, Minion, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def allocated(create, count):
+    """
+        The number of bytes still allocated per object after creating count objects and keeping them
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [create(index) for index in range(0, count)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return size / count
+
+
+def mid_game(seed, turns=10):
+    """
+        A game after a number of turns.  Unlike benchmarks.clone_benchmark.mid_game, every card in the decks is a
+        separate object, as in games loaded from replays or played by the tournament runner.
+    """
+    random.seed(seed)
+    names1 = ["Stonetusk Boar", "Mana Wyrm", "Bloodfen Raptor", "Arcane Missiles", "Frostbolt"]
+    names2 = ["Novice Engineer", "Mark of the Wild", "Oasis Snapjaw", "Moonfire", "Claw"]
+    deck1 = Deck([card_lookup(names1[index % 5]) for index in range(0, 30)], CHARACTER_CLASS.MAGE)
+    deck2 = Deck([card_lookup(names2[index % 5]) for index in range(0, 30)], CHARACTER_CLASS.DRUID)
+    game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+    game.pre_game()
+    game.current_player = game.players[1]
+    for turn in range(0, turns):
+        game.play_single_turn()
+    return game
+
+
+def main():
+    # Warm up the card registry and the caches used when cloning, so they aren't counted
+    mid_game(0).clone()
+
+    print("live game after 10 turns: {0:,.0f} bytes".format(allocated(lambda seed: mid_game(seed), 200)))
+    print("cloned game after 10 turns: {0:,.0f} bytes".format(allocated(lambda seed: mid_game(0).clone(), 200)))
+    print("Minion: {0:,.0f} bytes".format(allocated(lambda index: Minion(1, 1), 10000)))
+    print("Card: {0:,.0f} bytes".format(allocated(lambda index: card_lookup("Stonetusk Boar"), 10000)))
+    print("Deck: {0:,.0f} bytes".format(allocated(lambda index: Deck([], 0), 10000)))
+
+
+if __name__ == "__main__":
+    main()
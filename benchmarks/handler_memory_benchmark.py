@@ -0,0 +1,85 @@
+import random
+import sys
+import tracemalloc
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Bindable, Deck, Game, GameException, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+def handler_size(handler):
+    size = sys.getsizeof(handler)
+    if hasattr(handler, "__dict__"):
+        size += sys.getsizeof(handler.__dict__)
+    if "<locals>" in type(handler).__qualname__:
+        # The class was created just for this handler, so it counts against it as well
+        size += sys.getsizeof(type(handler)) + sys.getsizeof(type(handler).__dict__)
+    return size
+
+
+def measure_game(seed):
+    sizes = []
+    original_bind = Bindable.bind
+    original_bind_once = Bindable.bind_once
+
+    def bind(self, event, function, *args, **kwargs):
+        original_bind(self, event, function, *args, **kwargs)
+        sizes.append(handler_size(self.events[event][-1]))
+
+    def bind_once(self, event, function, *args, **kwargs):
+        original_bind_once(self, event, function, *args, **kwargs)
+        sizes.append(handler_size(self.events[event][-1]))
+
+    Bindable.bind = bind
+    Bindable.bind_once = bind_once
+    try:
+        random.seed(seed)
+        deck1 = Deck([card_lookup("Stonetusk Boar")] * 15 + [card_lookup("Mana Wyrm")] * 15, CHARACTER_CLASS.MAGE)
+        deck2 = Deck([card_lookup("Novice Engineer")] * 15 + [card_lookup("Mark of the Wild")] * 15,
+                     CHARACTER_CLASS.DRUID)
+        game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+        try:
+            game.start()
+        except GameException:
+            pass
+    finally:
+        Bindable.bind = original_bind
+        Bindable.bind_once = original_bind_once
+
+    return sizes
+
+
+def measure_allocations(seed):
+    random.seed(seed)
+    deck1 = Deck([card_lookup("Stonetusk Boar")] * 15 + [card_lookup("Mana Wyrm")] * 15, CHARACTER_CLASS.MAGE)
+    deck2 = Deck([card_lookup("Novice Engineer")] * 15 + [card_lookup("Mark of the Wild")] * 15,
+                 CHARACTER_CLASS.DRUID)
+    tracemalloc.start()
+    game = Game([deck1, deck2], [PredictableBot(), PredictableBot()])
+    try:
+        game.start()
+    except GameException:
+        pass
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    games = 20
+    sizes = []
+    peaks = []
+    for seed in range(0, games):
+        sizes.extend(measure_game(seed))
+        peaks.append(measure_allocations(seed))
+
+    print("handlers bound per game: {0:,.0f}".format(len(sizes) / games))
+    print("bytes per bound handler: {0:,.0f}".format(sum(sizes) / len(sizes)))
+    print("peak traced bytes per game: {0:,.0f}".format(sum(peaks) / games))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import time
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.agents.search_agents import MCTSAgent, random_policy, greedy_policy
+from hsgame.game_objects import Game
+from hsgame.game_random import GameRandom
+from hsgame.tournament import make_deck
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Paladin", ["Argent Protector", "Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Druid", ["Wrath", "Keeper of the Grove", "Druid of the Claw", "Innervate", "Moonfire", "Swipe"]),
+]
+
+
+def play_against_bot(games, make_agent):
+    """
+        Plays the search agent against PredictableBot, with each deck in turn
+        @return: the number of games won, and the rollouts per second of the searches
+    """
+    wins = 0
+    rollouts = 0
+    search_time = 0
+    for index in range(0, games):
+        agent = make_agent(index)
+        side = index % 2
+        agents = [PredictableBot(), PredictableBot()]
+        agents[side] = agent
+        game = Game([make_deck(deck) for deck in DECKS], agents, GameRandom(7, index // 2))
+        game.start()
+        player = [player for player in game.players if player.agent is agent][0]
+        opponent = [player for player in game.players if player.agent is not agent][0]
+        if opponent.dead and not player.dead:
+            wins += 1
+        rollouts += agent.rollouts
+        search_time += agent.search_time
+    return wins, rollouts / search_time
+
+
+def main():
+    games = 20
+    for name, policy in [("random", random_policy), ("greedy", greedy_policy)]:
+        for time_budget in [0.01, 0.05]:
+            start = time.perf_counter()
+            wins, rate = play_against_bot(games, lambda index: MCTSAgent(time_budget, rollout_policy=policy,
+                                                                         seed=index))
+            print("{0} rollouts, {1}s a decision: won {2} of {3} against PredictableBot, {4:,.0f} rollouts/sec "
+                  "({5:.1f}s)".format(name, time_budget, wins, games, rate, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import time
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.agents.search_agents import MCTSAgent, ParallelMCTSAgent
+from hsgame.game_objects import Game
+from hsgame.game_random import GameRandom
+from hsgame.tournament import make_deck
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Paladin", ["Argent Protector", "Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Druid", ["Wrath", "Keeper of the Grove", "Druid of the Claw", "Innervate", "Moonfire", "Swipe"]),
+]
+
+
+def positions(count):
+    """
+        Positions from the middle of games between PredictableBots, at the start of a turn
+    """
+    found = []
+    index = 0
+    while len(found) < count:
+        game = Game([make_deck(deck) for deck in DECKS], [PredictableBot(), PredictableBot()], GameRandom(3, index))
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 8 + index % 4):
+            game.play_single_turn()
+        index += 1
+        if game.game_ended:
+            continue
+        game._start_turn()
+        if len(list(game.legal_actions())) > 1:
+            found.append(game)
+    return found
+
+
+def main():
+    games = positions(8)
+    # The decision of a search many times longer than those being measured is taken to be the right one
+    reference = [MCTSAgent(None, 1500, seed=index).search(game) for index, game in enumerate(games)]
+
+    print("Agreement with a 1,500 iteration search, over {0} positions".format(len(games)))
+    for name, leaf_batch in [("root parallel", None), ("leaf parallel", 4)]:
+        for time_budget in [0.1, 0.4]:
+            for processes in [1, 4, 16]:
+                agreed = 0
+                agents = [ParallelMCTSAgent(processes, leaf_batch, time_budget=time_budget, seed=index)
+                          for index in range(0, len(games))]
+                start = time.perf_counter()
+                for agent, game, best in zip(agents, games, reference):
+                    if agent.search(game) == best:
+                        agreed += 1
+                elapsed = time.perf_counter() - start
+                rollouts = sum([agent.rollouts for agent in agents])
+                print("{0}, {1}s, {2} workers: {3} of {4} agree, {5:,.0f} rollouts/sec".format(
+                    name, time_budget, processes, agreed, len(games), rollouts / elapsed))
+
+
+if __name__ == "__main__":
+    main()
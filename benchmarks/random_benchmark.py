@@ -0,0 +1,91 @@
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, Game, card_lookup
+from hsgame.game_random import GameRandom
+from hsgame.replay import RecordingGame
+import hsgame.cards
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Paladin", ["Argent Protector", "Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Druid", ["Wrath", "Keeper of the Grove", "Druid of the Claw", "Innervate", "Moonfire", "Swipe"]),
+]
+
+
+def make_decks():
+    return [Deck([card_lookup(names[card % len(names)]) for card in range(0, 30)],
+                 CHARACTER_CLASS.from_str(class_name)) for class_name, names in DECKS]
+
+
+def numpy_block_randint(seed, block_size=4096):
+    """
+        Random numbers generated a block at a time by NumPy, and scaled to the range asked for one at a time, for
+        comparison with GameRandom.  Generating them is nearly free, but taking them from the block one at a time still
+        needs a Python function call and a few operations on ints, which is as much as GameRandom does around its call
+        to getrandbits.
+    """
+    generator = numpy.random.PCG64(seed)
+    numbers = iter(())
+
+    def randint(lower_bound, upper_bound):
+        nonlocal numbers
+        count = upper_bound - lower_bound + 1
+        try:
+            number = next(numbers)
+        except StopIteration:
+            numbers = iter(generator.random_raw(block_size).tolist())
+            number = next(numbers)
+        # Lemire's multiply and shift, without the rejection which would remove its slight bias
+        return lower_bound + ((number & 0xFFFFFFFF) * count >> 32)
+
+    return randint
+
+
+def draw_numbers(randint, count):
+    # The ranges the game asks for: cards left in the deck, targets and the coin toss
+    for index in range(0, count):
+        randint(0, index % 30)
+
+
+def play_games(count, make_random):
+    for index in range(0, count):
+        Game(make_decks(), [PredictableBot(), PredictableBot()], make_random(index)).start()
+
+
+def main():
+    count = 1000000
+    generators = [
+        ("random.randint", random.randint),
+        ("random.Random.randint", random.Random(1).randint),
+        ("GameRandom.randint", GameRandom(1).randint),
+    ]
+    if numpy is not None:
+        generators.append(("NumPy block", numpy_block_randint(1)))
+    for name, randint in generators:
+        elapsed = min(timeit.repeat(lambda: draw_numbers(randint, count), number=1, repeat=5))
+        print("{0}: {1:.0f}ns per number".format(name, elapsed / count * 1e9))
+
+    games = 300
+    random.seed(1)
+    for name, make_random in [("Global random.randint", lambda index: random.randint),
+                              ("GameRandom stream per game", lambda index: GameRandom(1, index))]:
+        elapsed = min(timeit.repeat(lambda: play_games(games, make_random), number=1, repeat=5))
+        print("{0}: {1:,.0f} games/sec".format(name, games / elapsed))
+
+    elapsed = min(timeit.repeat(lambda: [RecordingGame(make_decks(), [PredictableBot(), PredictableBot()],
+                                                       random=GameRandom(1, index)).start()
+                                         for index in range(0, games)], number=1, repeat=5))
+    print("Recorded, GameRandom stream per game: {0:,.0f} games/sec".format(games / elapsed))
+
+
+if __name__ == "__main__":
+    main()
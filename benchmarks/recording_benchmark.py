@@ -0,0 +1,54 @@
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, Game, card_lookup
+from hsgame.replay import RecordingGame
+from hsgame.replay_corpus import ReplayCorpus
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Paladin", ["Argent Protector", "Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Druid", ["Wrath", "Keeper of the Grove", "Druid of the Claw", "Innervate", "Moonfire", "Swipe"]),
+]
+
+
+def make_decks():
+    return [Deck([card_lookup(names[card % len(names)]) for card in range(0, 30)],
+                 CHARACTER_CLASS.from_str(class_name)) for class_name, names in DECKS]
+
+
+def play_games(count, make_game):
+    random.seed(2468)
+    for index in range(0, count):
+        make_game(make_decks(), [PredictableBot(), PredictableBot()]).start()
+
+
+def main():
+    count = 300
+    directory = tempfile.mkdtemp()
+    try:
+        with ReplayCorpus(os.path.join(directory, "replays.dat")) as corpus:
+            games = [
+                ("Not recorded", lambda decks, agents: Game(decks, agents, random.randint)),
+                ("Recorded", RecordingGame),
+                ("Recorded into a corpus", lambda decks, agents: RecordingGame(decks, agents, corpus.append_raw)),
+            ]
+            baseline = None
+            for name, make_game in games:
+                elapsed = min(timeit.repeat(lambda: play_games(count, make_game), number=1, repeat=5))
+                if baseline is None:
+                    baseline = elapsed
+                print("{0}: {1:,.0f} games/sec ({2:.2f}x)".format(name, count / elapsed, elapsed / baseline))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import random
+import shutil
+import struct
+import tempfile
+import timeit
+
+from hsgame.replay import Replay
+from hsgame.replay_corpus import ReplayCorpus
+
+__author__ = 'Daniel'
+
+REPLAY_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "replays")
+
+
+def read_with_files(path, indexes):
+    # The same lookups made by seeking and reading the files, as without the mapping
+    offset = struct.Struct("<Q")
+    with open(path + ".idx", 'rb') as index_file, open(path, 'rb') as data_file:
+        for index in indexes:
+            start = 0
+            if index > 0:
+                index_file.seek(5 + (index - 1) * offset.size)
+                start = offset.unpack(index_file.read(offset.size))[0]
+            else:
+                index_file.seek(5)
+            end = offset.unpack(index_file.read(offset.size))[0]
+            data_file.seek(start)
+            data_file.read(end - start)
+
+
+def read_with_mapping(corpus, indexes):
+    for index in indexes:
+        corpus.raw(index)
+
+
+def main():
+    replays = []
+    for name in sorted(name for name in os.listdir(REPLAY_DIRECTORY) if name.endswith(".rep")):
+        replay = Replay()
+        replay.parse_replay(os.path.join(REPLAY_DIRECTORY, name))
+        replays.append(replay)
+
+    count = 100000
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "replays.dat")
+        with ReplayCorpus(path) as corpus:
+            elapsed = timeit.timeit(lambda: corpus.extend(replays[index % len(replays)] for index in range(0, count)),
+                                    number=1)
+            print("{0:,} replays appended at {1:,.0f} replays/sec, {2:,} bytes".format(
+                count, count / elapsed, os.path.getsize(path) + os.path.getsize(path + ".idx")))
+
+            indexes = [random.randrange(0, count) for index in range(0, count)]
+            for name, read in [("file reads", lambda: read_with_files(path, indexes)),
+                               ("mapped", lambda: read_with_mapping(corpus, indexes))]:
+                elapsed = min(timeit.repeat(read, number=1, repeat=3))
+                print("Random access, {0}: {1:,.0f} replays/sec".format(name, count / elapsed))
+
+            scanned = 10000
+            elapsed = timeit.timeit(lambda: [corpus[index] for index in range(0, scanned)], number=1)
+            print("Scan with parsing: {0:,.0f} replays/sec".format(scanned / elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import io
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, card_lookup
+from hsgame.replay import Replay, RecordingGame
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Mage", ["Stonetusk Boar", "Bloodfen Raptor", "Arcane Missiles", "Frostbolt", "Mana Wyrm", "Water Elemental"]),
+    ("Druid", ["Innervate", "Moonfire", "Savage Roar", "Swipe", "Claw", "Bloodfen Raptor"]),
+    ("Paladin", ["Argent Protector", "Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Priest", ["Holy Nova", "Mind Blast", "Novice Engineer", "War Golem", "Bloodfen Raptor"]),
+]
+
+
+def record_games(count):
+    """
+        Plays games between the example decks, returning each one's replay in both formats
+    """
+    replays = []
+    random.seed(1234)
+    for index in range(0, count):
+        decks = []
+        for class_name, names in [DECKS[index % 4], DECKS[(index + 1) % 4]]:
+            decks.append(Deck([card_lookup(names[card % len(names)]) for card in range(0, 30)],
+                              CHARACTER_CLASS.from_str(class_name)))
+        game = RecordingGame(decks, [PredictableBot(), PredictableBot()])
+        game.start()
+        text = io.StringIO()
+        game.replay.write_replay(text)
+        binary = io.BytesIO()
+        game.replay.write_binary_replay(binary)
+        replays.append((text.getvalue(), binary.getvalue()))
+    return replays
+
+
+def main():
+    replays = record_games(50)
+    text_bytes = sum(len(text.encode("utf-8")) for text, binary in replays) / len(replays)
+    binary_bytes = sum(len(binary) for text, binary in replays) / len(replays)
+    print("{0:,.0f} bytes/replay as text, {1:,.0f} as binary ({2:.1%})".format(text_bytes, binary_bytes,
+                                                                             binary_bytes / text_bytes))
+
+    def parse_text():
+        for text, binary in replays:
+            Replay().parse_replay(io.StringIO(text))
+
+    def parse_binary():
+        for text, binary in replays:
+            Replay().parse_binary_replay(binary)
+
+    for name, parse in [("text", parse_text), ("binary", parse_binary)]:
+        elapsed = min(timeit.repeat(parse, number=10, repeat=3))
+        print("{0}: {1:,.0f} replays parsed/sec".format(name, len(replays) * 10 / elapsed))
+
+
+if __name__ == "__main__":
+    main()
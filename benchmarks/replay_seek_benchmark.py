@@ -0,0 +1,62 @@
+import io
+import random
+import timeit
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, card_lookup
+from hsgame.replay import RecordingGame, SavedGame
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+DECKS = [
+    ("Paladin", ["Consecration", "Guardian of Kings", "Bloodfen Raptor", "Stonetusk Boar"]),
+    ("Priest", ["Holy Nova", "Mind Blast", "Novice Engineer", "War Golem", "Bloodfen Raptor"]),
+]
+
+
+def record_longest_game(count):
+    longest = None
+    random.seed(4321)
+    for index in range(0, count):
+        decks = [Deck([card_lookup(names[card % len(names)]) for card in range(0, 30)],
+                      CHARACTER_CLASS.from_str(class_name)) for class_name, names in DECKS]
+        game = RecordingGame(decks, [PredictableBot(), PredictableBot()])
+        game.start()
+        if longest is None or len(game.replay.actions) > len(longest.actions):
+            longest = game.replay
+    output = io.StringIO()
+    longest.write_replay(output)
+    return output.getvalue()
+
+
+def play_to(replay_text, turn):
+    game = SavedGame(io.StringIO(replay_text))
+    game.pre_game()
+    game.current_player = game.players[1]
+    while game.turn < turn and not game.game_ended:
+        game.play_single_turn()
+    return game
+
+
+def main():
+    replay_text = record_longest_game(20)
+    turns = SavedGame(io.StringIO(replay_text))
+    turns.start()
+    print("Replay of {0} turns".format(turns.turn))
+
+    for interval in [1, 5, 10]:
+        game = SavedGame(io.StringIO(replay_text), interval)
+        elapsed = timeit.timeit(lambda: game.seek(0), number=1)
+        print("Snapshots every {0} turns: first seek (playing the game and taking snapshots) {1:.1f}ms".format(
+            interval, elapsed * 1000))
+        for turn in [turns.turn // 2, turns.turn - 1]:
+            scratch = min(timeit.repeat(lambda: play_to(replay_text, turn), number=20, repeat=5)) / 20
+            seek = min(timeit.repeat(lambda: game.seek(turn), number=20, repeat=5)) / 20
+            print("    turn {0}: {1:.2f}ms from the start, {2:.2f}ms seeking".format(turn, scratch * 1000,
+                                                                                   seek * 1000))
+
+
+if __name__ == "__main__":
+    main()
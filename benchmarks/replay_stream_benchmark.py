@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from hsgame.replay import read_replays, SavedGame
+
+__author__ = 'Daniel'
+
+REPLAY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "replays",
+                           "stonetusk_innervate.rep")
+
+
+def write_archive(file, count):
+    with open(REPLAY_FILE, "r") as replay_file:
+        replay = replay_file.read()
+    for index in range(0, count):
+        file.write(replay)
+
+
+def measure(archive, read):
+    tracemalloc.start()
+    start = time.perf_counter()
+    replays = read(archive)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return replays, elapsed, peak
+
+
+def read_all(archive):
+    # Keeps every replay with its actions in a list, as parsing each replay on its own would
+    replays = []
+    for replay in read_replays(archive):
+        replay.actions = list(replay.actions)
+        replays.append(replay)
+    return len(replays)
+
+
+def stream(archive):
+    replays = 0
+    for replay in read_replays(archive):
+        for action in replay.actions:
+            pass
+        replays += 1
+    return replays
+
+
+def play(archive):
+    replays = 0
+    for replay in read_replays(archive):
+        SavedGame(replay).start()
+        replays += 1
+    return replays
+
+
+def main():
+    for count in [100, 1000]:
+        with tempfile.NamedTemporaryFile("w", suffix=".rep", delete=False) as file:
+            write_archive(file, count)
+        try:
+            for name, read in [("kept in lists", read_all), ("streamed", stream), ("streamed and played", play)]:
+                replays, elapsed, peak = measure(file.name, read)
+                print("{0:,} replays {1}: {2:,.0f} replays/sec, peak memory {3:,.0f} KiB".format(
+                    replays, name, replays / elapsed, peak / 1024))
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == "__main__":
+    main()
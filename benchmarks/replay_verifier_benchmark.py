@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from hsgame.replay import Replay
+from hsgame.replay_corpus import ReplayCorpus
+from hsgame.replay_verifier import verify_replays
+
+__author__ = 'Daniel'
+
+REPLAY_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "replays")
+
+
+def main():
+    replays = []
+    for name in sorted(name for name in os.listdir(REPLAY_DIRECTORY) if name.endswith(".rep")):
+        replay = Replay()
+        replay.parse_replay(os.path.join(REPLAY_DIRECTORY, name))
+        replays.append(replay)
+
+    count = 3000
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "replays.dat")
+        with ReplayCorpus(path) as corpus:
+            corpus.extend(replays[index % len(replays)] for index in range(0, count))
+
+        for processes in sorted(set([1, multiprocessing.cpu_count()])):
+            result = verify_replays([path], processes=processes)
+            print("{0} processes: {1:,.0f} replays/sec".format(processes, len(result.digests) / result.elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
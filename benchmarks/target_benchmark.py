@@ -0,0 +1,41 @@
+import timeit
+
+from benchmarks.clone_benchmark import mid_game
+from hsgame.game_objects import card_lookup
+import hsgame.targetting
+
+__author__ = 'Daniel'
+
+
+def check_cards(game, cards, clear):
+    """
+        Checks whether each card can be played, as an agent does when deciding what to do.  With clear, the target
+        cache is emptied before each check, which is how often the targets were found before they were cached.
+    """
+    for card in cards:
+        if clear:
+            game.clear_target_cache()
+        card.can_use(game.current_player, game)
+
+
+def main():
+    games = [mid_game(seed) for seed in range(0, 10)]
+    for game in games:
+        game._start_turn()
+    cards = [card_lookup(name) for name in ["Moonfire", "Wrath", "Swipe", "Elven Archer", "Frostbolt",
+                                              "Keeper of the Grove", "Mark of the Wild", "Ironbeak Owl"]]
+    checks = len(games) * len(cards)
+
+    count = 2000
+    for clear, label in [(True, "finding targets every time"), (False, "cached targets")]:
+        elapsed = min(timeit.repeat(lambda: [check_cards(game, cards, clear) for game in games], number=count,
+                                    repeat=3))
+        print("{0}: {1:.2f} us per can_use".format(label, elapsed / count / checks * 1e6))
+
+    elapsed = min(timeit.repeat(lambda: [hsgame.targetting.find_spell_target(game) for game in games],
+                                number=count * 10, repeat=3))
+    print("cached find_spell_target: {0:.3f} us".format(elapsed / count / 10 / len(games) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import timeit
+
+from hsgame.agents.search_agents import MCTSAgent
+from hsgame.transpositions import state_hash, TranspositionTable
+from benchmarks.parallel_mcts_benchmark import positions
+
+__author__ = 'Daniel'
+
+
+def main():
+    games = positions(8)
+
+    count = 5000
+    elapsed = min(timeit.repeat(lambda: [state_hash(game) for game in games], number=count // len(games), repeat=3))
+    print("state_hash(): {0:,.0f} hashes/sec ({1:.0f} us per hash)".format(count / elapsed, elapsed / count * 1e6))
+    elapsed = min(timeit.repeat(lambda: [game.clone() for game in games], number=500 // len(games), repeat=3))
+    print("Game.clone(), for comparison: {0:.0f} us per clone".format(elapsed / 500 * 1e6))
+
+    iterations = 400
+    for name, table in [("Without a transposition table", None),
+                        ("With a transposition table", TranspositionTable(100000))]:
+        agents = [MCTSAgent(None, iterations, seed=index, transpositions=table) for index in range(0, len(games))]
+        elapsed = min(timeit.repeat(lambda: [agent.search(game) for agent, game in zip(agents, games)], number=1,
+                                    repeat=1))
+        print("{0}: {1:,.0f} rollouts/sec".format(name, iterations * len(games) / elapsed), end="")
+        if table is not None:
+            print(", {0:,} positions, {1:.1%} of expansions found in the table".format(
+                len(table), table.hits / (table.hits + table.misses)), end="")
+        print()
+
+
+if __name__ == "__main__":
+    main()
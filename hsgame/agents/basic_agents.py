@@ -38,10 +38,10 @@ class PredictableBot:
         if player.can_attack():
             player.attack()
 
-        while done_something:
+        while done_something and not self.game.game_ended:
             done_something = False
             for card in player.hand:
-                if card.can_use(player, self.game):
+                if not self.game.game_ended and card.can_use(player, self.game):
                     self.game.play_card(card)
                     done_something = True
 
@@ -0,0 +1,668 @@
+import math
+import multiprocessing
+import time
+
+from hsgame import evaluation
+from hsgame.determinizer import Determinizer
+from hsgame.game_random import GameRandom
+from hsgame.replay import TurnEndAction
+from hsgame.transpositions import state_hash
+
+__author__ = 'Daniel'
+
+# The key of the action which ends the turn
+END_TURN = TurnEndAction().to_output_string()
+
+
+def random_policy(game, actions, randint):
+    """
+        The default rollout policy: any of the actions, or ending the turn, with the same chance
+
+        @game: the Game being played out
+        @actions: list of the legal actions, from Game.legal_actions
+        @randint: a function like random.randint, for the policy's random choices
+        @return: one of actions, or None to end the turn
+    """
+    index = randint(0, len(actions))
+    if index == len(actions):
+        return None
+    return actions[index]
+
+
+def greedy_policy(game, actions, randint):
+    """
+        A rollout policy which plays out turns as PredictableBot does: every card, attack and power it can, in the order
+        they come, and then ends the turn.  Quicker than random_policy, as games end sooner, and the results are closer
+        to those of a sensible player.
+    """
+    if len(actions) == 0:
+        return None
+    return actions[0]
+
+
+def health_evaluation(game, player_index):
+    """
+        How good the position is for a player, from 0 for a loss to 1 for a win, for rollouts stopped before the end of
+        the game.  Positions are scored on the difference in health and armour, and in attack and health on the board.
+
+        @player_index: int, the index of the player in game.players
+    """
+    player = game.players[player_index]
+    opponent = game.players[1 - player_index]
+    if player.dead or opponent.dead:
+        if not opponent.dead:
+            return 0.0
+        if not player.dead:
+            return 1.0
+        return 0.5
+
+    def strength(character):
+        return character.health + character.armour + sum([minion.attack_power + minion.defense
+                                                          for minion in character.minions]) / 2
+
+    return 1 / (1 + math.exp((strength(opponent) - strength(player)) / 10))
+
+
+class RolloutAgent:
+    """
+        Plays out a game with a rollout policy, when a search looks at what could follow an action.  It also takes its
+        choices from next_target, next_index and next_option, so that the actions from Game.legal_actions can be played
+        with it.
+    """
+
+    def __init__(self, policy, randint):
+        """
+            @policy: a function from the game, its legal actions and randint to the action to play, or None to end the
+            turn.  See random_policy.
+            @randint: a function like random.randint for the policy's random choices
+        """
+        self.game = None
+        self.policy = policy
+        self.randint = randint
+        self.next_target = None
+        self.next_index = -1
+        self.next_option = None
+
+    def do_card_check(self, cards):
+        return [True, True, True, True]
+
+    def do_turn(self, player):
+        self.finish_turn()
+
+    def finish_turn(self):
+        """
+            Plays the rest of the current turn, until the policy ends it or the game ends
+        """
+        game = self.game
+        while not game.game_ended:
+            action = self.policy(game, list(game.legal_actions()), self.randint)
+            if action is None:
+                break
+            action.play(game)
+
+    def set_game(self, game):
+        self.game = game
+
+    def choose_target(self, targets):
+        if self.next_target is not None:
+            return self.next_target
+        return targets[self.randint(0, len(targets) - 1)]
+
+    def choose_index(self, card):
+        if self.next_index >= 0:
+            return self.next_index
+        return self.randint(0, len(self.game.current_player.minions))
+
+    def choose_option(self, *options):
+        if self.next_option is not None:
+            return options[self.next_option]
+        return options[self.randint(0, len(options) - 1)]
+
+
+class _Node:
+    __slots__ = ['children', 'visits', 'availability', 'value', 'legal']
+
+    def __init__(self):
+        # Action key -> _Node
+        self.children = {}
+        self.visits = 0
+        # The number of times the node's action was legal when its parent was visited.  With random cards, the same
+        # actions don't always lead to the same position, so an action isn't always there to be chosen.
+        self.availability = 0
+        self.value = 0.0
+        # The keys of the legal actions from the node, when the tree is searched without a copy of the game, as by
+        # ParallelMCTSAgent's leaf parallelism.  None until a rollout has reached the node.
+        self.legal = None
+
+
+class MCTSAgent:
+    """
+        Chooses each action of its turns with a Monte-Carlo tree search.
+
+        The tree covers the agent's own turn: each node is the position after a sequence of actions, and ending the
+        turn is one of the choices.  Each iteration of the search plays a copy of the game (see Game.clone) down the
+        tree, choosing with UCB1, adds an action it hasn't tried, and then plays the game out with RolloutAgents: the
+        rest of the turn, and then rollout_turns more turns for the two players.  The result is scored with the
+        evaluation, 1 for a win and 0 for a loss, and added to the nodes along the way.
+
+        The actions in the tree are kept by their replay strings, such as "play(0)" or "attack(p1:0,p2)".  Each copy of
+        the game is given its own random numbers, so the cards drawn and the results of random effects vary from one
+        iteration to the next, and the copies don't all reach the same position after the same actions.  An action is
+        only chosen when it is legal in the copy being played.
+
+        The search stops when it has used its time_budget, or after the given number of iterations.  rollouts and
+        search_time count every rollout done for the agent, see rollouts_per_second.
+    """
+
+    def __init__(self, time_budget=1.0, iterations=None, rollout_policy=random_policy, rollout_turns=2,
+                 evaluation=health_evaluation, exploration=math.sqrt(2), seed=None, determinize=False,
+                 transpositions=None):
+        """
+            @time_budget: float, the seconds to spend on each decision, or None to use iterations alone
+            @iterations: int, the most iterations of the search for each decision, or None to use the time budget alone
+            @rollout_policy: a function choosing the actions of rollouts, see random_policy
+            @rollout_turns: int, the number of turns after the agent's own to play out, or None to play until the game
+            ends
+            @evaluation: a function from a game and the index of the agent's player to how good the game is for the
+            player, from 0 to 1.  See health_evaluation.
+            @exploration: float, the UCB1 constant.  Higher explores more actions, lower looks deeper at the best ones.
+            @seed: the seed for the random choices of the search and its rollouts, see GameRandom
+            @determinize: bool, whether to search games sampled with a Determinizer, which only show what the player
+            could know, instead of copies of the game, which show the opponent's hand and the cards to be drawn.  The
+            agent has to be given to the game before it starts.
+            @transpositions: a hsgame.transpositions.TranspositionTable.  If given, positions reached by playing actions in a
+            different order share one node of the tree, found by the hash of the game.  The table can be shared
+            between agents, and the nodes are kept from one search to the next.
+        """
+        if time_budget is None and iterations is None:
+            raise ValueError("Either a time budget or a number of iterations is needed")
+        self.game = None
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.rollout_policy = rollout_policy
+        self.rollout_turns = rollout_turns
+        self.evaluation = evaluation
+        self.exploration = exploration
+        self.determinize = determinize
+        self.determinizer = None
+        self.transpositions = transpositions
+        self.randint = GameRandom(seed).randint
+        self.rollouts = 0
+        self.search_time = 0.0
+        self.next_target = None
+        self.next_index = -1
+        self.next_option = None
+
+    def do_card_check(self, cards):
+        # Cards which can't be played early on are swapped for a chance of cheaper ones
+        return [card.mana <= 3 for card in cards]
+
+    def do_turn(self, player):
+        game = self.game
+        while not game.game_ended:
+            key = self.search(game)
+            if key == END_TURN:
+                break
+            for action in game.legal_actions():
+                if action.to_output_string() == key:
+                    action.play(game)
+                    break
+            else:
+                break
+
+    def search(self, game):
+        """
+            Searches from the game's current position
+            @return: string, the key of the best action, END_TURN to end the turn
+        """
+        root = _Node()
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        self.rollouts += self.run(game, root, deadline, self.iterations)
+        self.search_time += time.perf_counter() - start
+        return best_action(root)
+
+    def run(self, game, root, deadline, iterations):
+        """
+            Iterates the search of a tree until the deadline, or for the given number of iterations
+            @return: int, the number of iterations
+        """
+        player_index = game.players.index(game.current_player)
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            self.iterate(game, root, player_index)
+            iteration += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return iteration
+
+    def rollout_agents(self, randint=None):
+        randint = randint or self.randint
+        return [RolloutAgent(self.rollout_policy, randint), RolloutAgent(self.rollout_policy, randint)]
+
+    def iterate(self, game, root, player_index):
+        """
+            One iteration of the search: selection, expansion, rollout and backing up the result
+        """
+        agents = self.rollout_agents()
+        simulation = self.simulation(game, agents, self.randint)
+        path = [root]
+        node = root
+        turn_ended = False
+        while not simulation.game_ended:
+            actions = {action.to_output_string(): action for action in simulation.legal_actions()}
+            actions[END_TURN] = None
+            key, node, expanded = self.choose(node, actions)
+            path.append(node)
+            if key == END_TURN:
+                turn_ended = True
+                break
+            actions[key].play(simulation)
+            if expanded:
+                if self.transpositions is not None and not simulation.game_ended:
+                    shared = self.transpositions.setdefault(state_hash(simulation), node)
+                    if shared is not node:
+                        path[-2].children[key] = path[-1] = shared
+                break
+
+        if not simulation.game_ended and not turn_ended:
+            agents[player_index].finish_turn()
+        self.play_out(simulation, simulation.players[player_index])
+
+        value = self.evaluation(simulation, player_index)
+        for node in path:
+            node.visits += 1
+            node.value += value
+
+    def simulation(self, game, agents, randint=None):
+        """
+            The copy of the game for an iteration of the search: a sample from the determinizer, if the agent has one,
+            or a clone.  A clone gets its own random numbers, seeded from randint, as it would otherwise carry on with
+            a copy of the game's, and draw the same cards the game is about to.
+        """
+        randint = randint or self.randint
+        if self.determinizer is not None and self.determinizer.game is game:
+            return self.determinizer.sample(game.current_player, agents, randint)
+        simulation = game.clone(agents)
+        simulation.reseed(GameRandom(randint(0, 1 << 62)))
+        return simulation
+
+    def choose(self, node, keys):
+        """
+            Chooses the action to follow from a node: one that hasn't been tried, if there are any, and otherwise the
+            best by UCB1
+
+            @keys: the keys of the legal actions, including END_TURN
+            @return: the key, the child node for it, and whether the node was added
+        """
+        untried = [key for key in keys if key not in node.children]
+        for key in keys:
+            if key in node.children:
+                node.children[key].availability += 1
+
+        if len(untried) > 0:
+            key = untried[self.randint(0, len(untried) - 1)]
+            child = node.children[key] = _Node()
+            child.availability = 1
+            return key, child, True
+        key, child = max([(key, node.children[key]) for key in keys], key=self._ucb)
+        return key, child, False
+
+    def play_out(self, simulation, player):
+        """
+            Ends the turn the search started in, and plays the following turns
+        """
+        if simulation.game_ended:
+            return
+        simulation._end_turn()
+        turns = 0
+        while not simulation.game_ended and (self.rollout_turns is None or turns < self.rollout_turns):
+            simulation.play_single_turn()
+            turns += 1
+
+    def _ucb(self, item):
+        key, node = item
+        if node.visits == 0:
+            return math.inf
+        return node.value / node.visits + self.exploration * math.sqrt(math.log(node.availability) / node.visits)
+
+    def rollouts_per_second(self):
+        """
+            The rate of the searches so far, including cloning, rollouts and the tree
+        """
+        if self.search_time == 0:
+            return 0.0
+        return self.rollouts / self.search_time
+
+    def set_game(self, game):
+        self.game = game
+        if self.determinize:
+            self.determinizer = Determinizer(game, self.randint(0, 1 << 62))
+
+    def choose_target(self, targets):
+        if self.next_target is not None:
+            return self.next_target
+        return targets[0]
+
+    def choose_index(self, card):
+        if self.next_index >= 0:
+            return self.next_index
+        return 0
+
+    def choose_option(self, *options):
+        if self.next_option is not None:
+            return options[self.next_option]
+        return options[0]
+
+
+def best_action(root):
+    """
+        The action of the root which was visited most, which is the one the search is surest of
+    """
+    if len(root.children) == 0:
+        return END_TURN
+    return max(root.children.items(), key=lambda item: (item[1].visits, item[1].value))[0]
+
+
+def _search_root(agent, game, deadline, iterations, seed, connection):
+    # Runs in a worker for root parallelism, which is forked with the agent and game, so neither is sent to it
+    agent.randint = GameRandom(seed).randint
+    root = _Node()
+    count = agent.run(game, root, deadline, iterations)
+    connection.send((count, dict([(key, (child.visits, child.value)) for key, child in root.children.items()])))
+    connection.close()
+
+
+def _evaluate_leaves(agent, game, connection):
+    # Runs in a worker for leaf parallelism, evaluating the batches of paths it is sent until it is sent None
+    while True:
+        try:
+            tasks = connection.recv()
+        except EOFError:
+            # The search stopped early
+            break
+        if tasks is None:
+            break
+        connection.send([agent.evaluate_path(game, keys, GameRandom(seed).randint) for keys, seed in tasks])
+    connection.close()
+
+
+def _receive(connection):
+    try:
+        return connection.recv()
+    except EOFError:
+        raise RuntimeError("A search worker stopped without sending its results") from None
+
+
+class ParallelMCTSAgent(MCTSAgent):
+    """
+        An MCTSAgent which searches with worker processes, in one of two ways:
+
+        Root parallelism, the default: each worker searches a tree of its own for the whole time budget, with its own
+        random numbers, and the visits to the root's actions are added up across the trees to choose the action.  The
+        trees are independent, so the workers only communicate at the end.
+
+        Leaf parallelism, with leaf_batch: the tree is kept by this process, which chooses leaf_batch leaves for each
+        worker at a time, and the workers play the actions to each leaf on a copy of the game and roll it out.  Each
+        leaf chosen counts as a loss until its result comes back, the "virtual loss", so the leaves of a batch are
+        spread across the tree.  The tree has the rollouts of all the workers, so it grows deeper than the trees of
+        root parallelism, but the workers wait for each batch to finish.
+
+        The workers are forked from this process for each decision, so that they start with the game as it is, however
+        much state its cards have bound.  The game can't be sent to workers that are already running, as the effects
+        of its cards are closures, which can't be pickled.  Where processes can't be forked, with one process, or when
+        the agent is itself running in a daemonic process, such as a worker of hsgame.tournament, which isn't allowed
+        to start processes of its own, the search is done in this process as MCTSAgent does it.
+    """
+
+    def __init__(self, processes=None, leaf_batch=None, **kwargs):
+        """
+            @processes: int, the number of worker processes.  Defaults to the number of CPUs.
+            @leaf_batch: int, the number of leaves given to each worker at a time for leaf parallelism, or None for
+            root parallelism
+            @kwargs: as for MCTSAgent.  With root parallelism, iterations is shared between the workers.
+        """
+        super().__init__(**kwargs)
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+        self.leaf_batch = leaf_batch
+
+    def search(self, game):
+        if self.processes == 1 or "fork" not in multiprocessing.get_all_start_methods() \
+                or multiprocessing.current_process().daemon:
+            return super().search(game)
+
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        if self.leaf_batch is None:
+            iterations = None if self.iterations is None else -(-self.iterations // self.processes)
+            root = self.search_roots(game, deadline, iterations)
+        else:
+            root = self.search_leaves(game, deadline, self.iterations)
+        self.search_time += time.perf_counter() - start
+        return best_action(root)
+
+    def fork_workers(self, target, arguments):
+        """
+            Forks a worker process for each of the arguments, each with a connection to this process as its last
+            argument
+            @return: the workers, and this process's end of each of their connections
+        """
+        context = multiprocessing.get_context("fork")
+        workers = []
+        connections = []
+        for worker_arguments in arguments:
+            connection, worker_connection = context.Pipe()
+            worker = context.Process(target=target, args=worker_arguments + (worker_connection,), daemon=True)
+            worker.start()
+            worker_connection.close()
+            workers.append(worker)
+            connections.append(connection)
+        return workers, connections
+
+    def stop_workers(self, workers, connections):
+        for connection in connections:
+            connection.close()
+        for worker in workers:
+            worker.join(1)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+    def search_roots(self, game, deadline, iterations):
+        """
+            Searches a tree in each worker, and merges their roots
+        """
+        root = _Node()
+        seeds = [self.randint(0, 1 << 62) for worker in range(0, self.processes)]
+        workers, connections = self.fork_workers(_search_root, [(self, game, deadline, iterations, seed)
+                                                                for seed in seeds])
+        try:
+            results = [_receive(connection) for connection in connections]
+        finally:
+            self.stop_workers(workers, connections)
+        for count, children in results:
+            self.rollouts += count
+            for key, (visits, value) in children.items():
+                if key not in root.children:
+                    root.children[key] = _Node()
+                root.children[key].visits += visits
+                root.children[key].value += value
+        return root
+
+    def search_leaves(self, game, deadline, iterations):
+        """
+            Searches one tree in this process, with the rollouts from its leaves done by the workers in batches
+        """
+        root = _Node()
+        root.legal = [action.to_output_string() for action in game.legal_actions()] + [END_TURN]
+        count = 0
+        batch_size = self.leaf_batch * self.processes
+        workers, connections = self.fork_workers(_evaluate_leaves, [(self, game)] * self.processes)
+        try:
+            while iterations is None or count < iterations:
+                if iterations is not None:
+                    batch_size = min(batch_size, iterations - count)
+                paths = [self.select_leaf(root) for leaf in range(0, batch_size)]
+                tasks = [(keys, self.randint(0, 1 << 62)) for nodes, keys in paths]
+                # Each worker is given leaf_batch of the tasks, in order, and the results are put back in the same order
+                busy = []
+                for index, connection in enumerate(connections):
+                    worker_tasks = tasks[index * self.leaf_batch:(index + 1) * self.leaf_batch]
+                    if len(worker_tasks) > 0:
+                        connection.send(worker_tasks)
+                        busy.append(connection)
+                results = [result for connection in busy for result in _receive(connection)]
+                for (nodes, keys), (played, legal, value) in zip(paths, results):
+                    # Take back the virtual loss, from the nodes the copy of the game didn't reach as well
+                    for node in nodes[played + 1:]:
+                        node.visits -= 1
+                    for node in nodes[0:played + 1]:
+                        node.value += value
+                    if nodes[played].legal is None:
+                        nodes[played].legal = legal
+                count += batch_size
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+            for connection in connections:
+                connection.send(None)
+        finally:
+            self.stop_workers(workers, connections)
+        self.rollouts += count
+        return root
+
+    def select_leaf(self, root):
+        """
+            Follows the tree from the root to a node which hasn't been rolled out, using the legal actions found by
+            the rollouts, and gives each node on the way a virtual loss
+            @return: the nodes on the way, and the keys of the actions to them
+        """
+        node = root
+        nodes = [root]
+        keys = []
+        while node.legal is not None:
+            key, node, expanded = self.choose(node, node.legal)
+            nodes.append(node)
+            keys.append(key)
+            if expanded or key == END_TURN:
+                break
+        for node in nodes:
+            node.visits += 1
+        return nodes, keys
+
+    def evaluate_path(self, game, keys, randint):
+        """
+            Plays the actions from the search's position on a copy of the game, rolls it out and evaluates it.  The
+            actions stop at the first one that isn't legal in the copy.
+            @return: the number of actions played, the keys of the legal actions after them, or None if the turn or
+            game ended, and the value of the rollout
+        """
+        player_index = game.players.index(game.current_player)
+        agents = self.rollout_agents(randint)
+        simulation = self.simulation(game, agents, randint)
+        played = 0
+        legal = None
+        turn_ended = False
+        for key in keys:
+            if key == END_TURN:
+                played += 1
+                turn_ended = True
+                break
+            actions = dict([(action.to_output_string(), action) for action in simulation.legal_actions()])
+            if key not in actions:
+                break
+            actions[key].play(simulation)
+            played += 1
+            if simulation.game_ended:
+                break
+
+        if not simulation.game_ended and not turn_ended:
+            legal = [action.to_output_string() for action in simulation.legal_actions()] + [END_TURN]
+            agents[player_index].finish_turn()
+        self.play_out(simulation, simulation.players[player_index])
+        return played, legal, self.evaluation(simulation, player_index)
+
+
+class GreedyAgent:
+    """
+        Plays whichever action leads to the position its evaluator scores best, one action at a time, and ends the turn
+        when no action improves on the position it is in.
+
+        The position after each legal action is found by playing the action on a copy of the game, and all of them are
+        scored together with Evaluator.score_games.  Actions with random results are judged by how they turn out in
+        their one copy.
+    """
+
+    def __init__(self, evaluator=None, seed=None):
+        """
+            @evaluator: a hsgame.evaluation.Evaluator, by default hsgame.evaluation.DEFAULT
+            @seed: the seed for the random choices of the copies of the game, see GameRandom
+        """
+        self.game = None
+        self.evaluator = evaluator or evaluation.DEFAULT
+        self.randint = GameRandom(seed).randint
+        self.next_target = None
+        self.next_index = -1
+        self.next_option = None
+
+    def do_card_check(self, cards):
+        return [card.mana <= 3 for card in cards]
+
+    def do_turn(self, player):
+        game = self.game
+        while not game.game_ended:
+            key = self.best_action(game)
+            if key == END_TURN:
+                break
+            for action in game.legal_actions():
+                if action.to_output_string() == key:
+                    action.play(game)
+                    break
+            else:
+                break
+
+    def best_action(self, game):
+        """
+            @return: string, the key of the action leading to the best position, END_TURN if none is better than the
+            current one
+        """
+        player_index = game.players.index(game.current_player)
+        keys = []
+        children = []
+        for action in game.legal_actions():
+            key = action.to_output_string()
+            child = game.clone([RolloutAgent(random_policy, self.randint), RolloutAgent(random_policy, self.randint)])
+            # As in MCTSAgent.simulation, the copy mustn't draw the cards the game is about to
+            child.reseed(GameRandom(self.randint(0, 1 << 62)))
+            for copy in child.legal_actions():
+                if copy.to_output_string() == key:
+                    copy.play(child)
+                    keys.append(key)
+                    children.append(child)
+                    break
+        if len(children) == 0:
+            return END_TURN
+        scores = self.evaluator.score_games(children, player_index)
+        best = max(range(0, len(scores)), key=lambda index: scores[index])
+        if scores[best] <= self.evaluator(game, player_index):
+            return END_TURN
+        return keys[best]
+
+    def set_game(self, game):
+        self.game = game
+
+    def choose_target(self, targets):
+        if self.next_target is not None:
+            return self.next_target
+        return targets[0]
+
+    def choose_index(self, card):
+        if self.next_index >= 0:
+            return self.next_index
+        return 0
+
+    def choose_option(self, *options):
+        if self.next_option is not None:
+            return options[self.next_option]
+        return options[0]
@@ -0,0 +1,123 @@
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__author__ = 'Daniel'
+
+# Boards are padded to at least this many minions, so that mirrors of different boards have the same shape
+BOARD_SIZE = 7
+
+
+def _minion_state(minion):
+    return (minion.attack_power + minion.temp_attack, minion.defense, minion.max_defense, minion.taunt, minion.stealth,
+            minion.frozen, minion.divine_shield, minion.charge, minion.active)
+
+
+def _per_board(amount):
+    # Lets a value for each board be combined with values for each minion
+    amount = numpy.asarray(amount)
+    if amount.ndim == 1:
+        return amount[:, numpy.newaxis]
+    return amount
+
+
+class BoardMirror:
+    """
+        A copy of the state of the minions of one or more players as NumPy arrays, so that heuristics can look at
+        whole boards with vector operations instead of going through the minions one attribute at a time.
+
+        Each array has a row for each player's board and a column for each place on the board, in board order.  The
+        boards are padded with empty places, which are False in present.  The arrays are attack (including temporary
+        attack), health, max_health, taunt, stealth, frozen, divine_shield, charge and active.  The last six, and
+        present, are boolean.
+
+        NumPy has a cost for each operation which is much larger than going through the handful of minions on one
+        board, so mirrors are worth it when they cover many boards at once, for instance the games being compared by a
+        search.  The minions themselves are not changed by anything done with the mirror.  Their attributes are
+        written directly by card effects, so the mirror doesn't follow them as they change.  Call refresh to bring it
+        up to date.
+
+        NumPy is only needed by this module, and the rest of the simulator runs without it.
+    """
+
+    fields = ["attack", "health", "max_health", "taunt", "stealth", "frozen", "divine_shield", "charge", "active"]
+
+    def __init__(self, players):
+        """
+            @players: list of Player, one for each board
+        """
+        if numpy is None:
+            raise ImportError("BoardMirror needs NumPy")
+        self.players = list(players)
+        self.refresh()
+
+    def refresh(self):
+        """
+            Copies the current state of the players' minions into the arrays
+        """
+        counts = [len(player.minions) for player in self.players]
+        width = max([BOARD_SIZE] + counts)
+        states = [_minion_state(minion) for player in self.players for minion in player.minions]
+        fields = len(self.fields)
+
+        self.present = numpy.arange(0, width) < numpy.array(counts, dtype=numpy.int16).reshape(len(counts), 1)
+        state = numpy.zeros((len(counts), width, fields), dtype=numpy.int16)
+        state[self.present] = numpy.fromiter(itertools.chain.from_iterable(states), dtype=numpy.int16,
+                                             count=len(states) * fields).reshape(len(states), fields)
+        self.attack, self.health, self.max_health = [state[:, :, field] for field in range(0, 3)]
+        self.taunt, self.stealth, self.frozen, self.divine_shield, self.charge, self.active = \
+            [state[:, :, field] != 0 for field in range(3, fields)]
+        return self
+
+    def __len__(self):
+        return len(self.players)
+
+    def minion_count(self):
+        return self.present.sum(axis=1)
+
+    def can_attack(self):
+        """
+            Which minions can attack, as Minion.can_attack
+        """
+        return self.present & self.active & ~self.frozen
+
+    def attack_power(self):
+        """
+            The total attack of the minions on each board that can attack
+        """
+        return numpy.where(self.can_attack(), self.attack, 0).sum(axis=1)
+
+    def attackable(self):
+        """
+            Which minions can be attacked by the other player, following the taunt and stealth rules of
+            hsgame.targetting.find_attack_target
+        """
+        visible = self.present & ~self.stealth
+        taunts = visible & self.taunt
+        return numpy.where(taunts.any(axis=1, keepdims=True), taunts, visible)
+
+    def health_after_damage(self, amount):
+        """
+            The health each minion would have after being dealt the same damage, as by Arcane Explosion or Consecration.
+            Minions with a divine shield keep their health.
+
+            @amount: the damage, either one for all boards or a sequence with one for each board
+        """
+        return numpy.where(self.divine_shield, self.health, self.health - _per_board(amount))
+
+    def killed_by(self, amount):
+        """
+            Which minions would die if each were dealt the given damage
+
+            @amount: the damage, either one for all boards or a sequence with one for each board
+        """
+        return self.present & ~self.divine_shield & (self.health <= _per_board(amount))
+
+    def health_after_healing(self, amount):
+        """
+            The health each minion would have after being healed, as by Holy Nova
+        """
+        return numpy.minimum(self.health + _per_board(amount), self.max_health)
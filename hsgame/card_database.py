@@ -0,0 +1,177 @@
+import array
+import csv
+import os
+
+from hsgame.constants import CHARACTER_CLASS, MINION_TYPE
+from hsgame.game_objects import card_registry
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+CARDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cards.csv")
+
+
+def _rows(mask):
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def _add_to_index(index, key, row):
+    index[key] = index.get(key, 0) | (1 << row)
+
+
+class CardDatabase:
+    """
+        The data about every card from cards.csv, whether the card is implemented or not.
+
+        The data is kept in one column per field, and each row of the file is a row index into those columns.  A set
+        of rows is an int with a bit set for each row in it, so queries are a few bitwise ands over the prebuilt
+        indexes, whatever the number of cards.
+    """
+    def __init__(self, file):
+        """
+            @file: an open file (or any iterable of lines) with the contents of cards.csv
+        """
+        self.names = []
+        self.text = []
+        self.cost = array.array('B')
+        # -1 where the card has no attack or health, e.g. spells
+        self.attack = array.array('b')
+        self.health = array.array('b')
+        self.character_class = array.array('B')
+        self.race = array.array('B')
+        self.card_set = array.array('B')
+        self.kind = array.array('B')
+        self.implemented = array.array('B')
+        # The registered Card subclass for each row, None for cards that haven't been implemented
+        self.card_types = []
+
+        self.card_sets = []
+        self.kinds = []
+        self.rows_by_name = {}
+
+        self.all = 0
+        self.by_class = {}
+        self.by_cost = {}
+        self.by_race = {}
+        self.by_set = {}
+        self.by_kind = {}
+        self.implemented_rows = 0
+
+        registered = set(card_registry.names())
+        for row, fields in enumerate(csv.DictReader(file)):
+            name = fields["Name"]
+            self.rows_by_name[name] = row
+            self.names.append(name)
+            self.text.append(fields["Text"])
+            self.cost.append(int(fields["Cost"]))
+            self.attack.append(int(fields["Attack"]) if fields["Attack"] else -1)
+            self.health.append(int(fields["Health"]) if fields["Health"] else -1)
+            self.character_class.append(CHARACTER_CLASS.from_str(fields["Class"]))
+            self.race.append(MINION_TYPE.from_str(fields["Race"]))
+            self.card_set.append(self._code(self.card_sets, fields["Type"]))
+            self.kind.append(self._code(self.kinds, fields["Minion/Spell"]))
+            self.implemented.append(fields["Implemented?"] == "yes")
+            self.card_types.append(card_registry.card_type(name) if name in registered else None)
+
+            self.all |= 1 << row
+            _add_to_index(self.by_class, self.character_class[row], row)
+            _add_to_index(self.by_cost, self.cost[row], row)
+            _add_to_index(self.by_race, self.race[row], row)
+            _add_to_index(self.by_set, fields["Type"], row)
+            _add_to_index(self.by_kind, fields["Minion/Spell"], row)
+            if self.implemented[row]:
+                self.implemented_rows |= 1 << row
+
+        # cost_at_most[n] is the set of cards that cost n or less
+        self.cost_at_most = []
+        cheaper = 0
+        for cost in range(0, max(self.by_cost) + 1):
+            cheaper |= self.by_cost.get(cost, 0)
+            self.cost_at_most.append(cheaper)
+
+    @staticmethod
+    def _code(codes, value):
+        if value not in codes:
+            codes.append(value)
+        return codes.index(value)
+
+    def select(self, character_class=None, cost=None, max_cost=None, race=None, card_set=None, kind=None,
+               implemented=None):
+        """
+            Finds the cards which match all the given criteria.  Criteria which are None aren't checked.
+
+            @character_class: CHARACTER_CLASS, the class the card belongs to.  CHARACTER_CLASS.ALL is neutral cards
+            only, see playable_by for the cards a class can put in its deck
+            @cost: int
+            @max_cost: int
+            @race: MINION_TYPE
+            @card_set: string, the Type column of cards.csv, e.g. "Basic" or "Expert"
+            @kind: string, "Minion", "Spell" or "Weapon"
+            @implemented: bool
+            @return: int, the set of matching rows.  Use rows, names_of or card_types_of to read it, or combine it
+            with other selections using | and &.
+        """
+        mask = self.all
+        if character_class is not None:
+            mask &= self.by_class.get(character_class, 0)
+        if cost is not None:
+            mask &= self.by_cost.get(cost, 0)
+        if max_cost is not None:
+            if max_cost < 0:
+                return 0
+            mask &= self.cost_at_most[min(max_cost, len(self.cost_at_most) - 1)]
+        if race is not None:
+            mask &= self.by_race.get(race, 0)
+        if card_set is not None:
+            mask &= self.by_set.get(card_set, 0)
+        if kind is not None:
+            mask &= self.by_kind.get(kind, 0)
+        if implemented is not None:
+            if implemented:
+                mask &= self.implemented_rows
+            else:
+                mask &= ~self.implemented_rows
+        return mask
+
+    def playable_by(self, character_class):
+        """
+            The set of cards that a deck of the given class can contain: the class's own cards and the neutral ones
+        """
+        return self.by_class.get(character_class, 0) | self.by_class.get(CHARACTER_CLASS.ALL, 0)
+
+    def row(self, name):
+        return self.rows_by_name[name]
+
+    def rows(self, mask):
+        return _rows(mask)
+
+    def count(self, mask):
+        return bin(mask).count("1")
+
+    def names_of(self, mask):
+        return [self.names[row] for row in _rows(mask)]
+
+    def card_types_of(self, mask):
+        """
+            The registered Card subclasses for a set of rows.  Rows for cards that haven't been implemented are left
+            out.
+        """
+        return [self.card_types[row] for row in _rows(mask) if self.card_types[row] is not None]
+
+
+_card_database = None
+
+
+def card_database():
+    """
+        The database loaded from the cards.csv that comes with the simulator.  It is only read the first time this is
+        called.
+    """
+    global _card_database
+    if _card_database is None:
+        with open(CARDS_FILE, "r") as file:
+            _card_database = CardDatabase(file)
+    return _card_database
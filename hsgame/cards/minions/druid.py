@@ -9,6 +9,7 @@ __author__ = 'Daniel'
 class KeeperOfTheGrove(MinionCard):
     def __init__(self):
         super().__init__("Keeper of the Grove", 4, CHARACTER_CLASS.DRUID, CARD_RARITY.RARE, True, hsgame.targetting.find_minion_battlecry_target)
+        self.option_count = 2
 
     def create_minion(self, player):
 
@@ -36,6 +37,7 @@ class DruidOfTheClaw(MinionCard):
 
     def __init__(self):
         super().__init__("Druid of the Claw", 5, CHARACTER_CLASS.DRUID, CARD_RARITY.COMMON)
+        self.option_count = 2
 
     def create_minion(self, player):
 
@@ -65,6 +67,7 @@ class AncientOfLore(MinionCard):
 
     def __init__(self):
         super().__init__("Ancient of Lore", 7, CHARACTER_CLASS.DRUID, CARD_RARITY.EPIC)
+        self.option_count = 2
 
     def create_minion(self, player):
 
@@ -94,6 +97,7 @@ class AncientOfWar(MinionCard):
 
     def __init__(self):
         super().__init__("Ancient of War", 7, CHARACTER_CLASS.DRUID, CARD_RARITY.EPIC)
+        self.option_count = 2
 
     def create_minion(self, player):
 
@@ -134,6 +138,7 @@ class Cenarius(MinionCard):
 
     def __init__(self):
         super().__init__("Cenarius", 9, CHARACTER_CLASS.DRUID, CARD_RARITY.LEGENDARY)
+        self.option_count = 2
 
     def create_minion(self, player):
 
@@ -81,11 +81,8 @@ class FaerieDragon(MinionCard):
         super().__init__("Faerie Dragon", 2, CHARACTER_CLASS.ALL, CARD_RARITY.COMMON)
 
     def create_minion(self, player):
-        def silence():
-            minion.spell_targettable = lambda : True
         minion = Minion(3, 2, MINION_TYPE.DRAGON)
-        minion.spell_targettable = lambda: False
-        minion.bind("silenced", silence())
+        minion.immune_to_spells = True
         return minion
 
 
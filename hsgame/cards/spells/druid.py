@@ -68,6 +68,7 @@ class MarkOfTheWild(Card):
 class PowerOfTheWild(Card):
     def __init__(self):
         super().__init__("Power of the Wild", 2, CHARACTER_CLASS.DRUID, CARD_RARITY.COMMON, False)
+        self.option_count = 2
 
     def use(self, player, game):
         super().use(player, game)
@@ -127,6 +128,7 @@ class ExcessMana(Card):
 class Wrath(Card):
     def __init__(self):
         super().__init__("Wrath", 2, CHARACTER_CLASS.DRUID, CARD_RARITY.COMMON, True, hsgame.targetting.find_minion_spell_target)
+        self.option_count = 2
 
     def use(self, player, game):
 
@@ -164,6 +166,7 @@ class HealingTouch(Card):
 class MarkOfNature(Card):
     def __init__(self):
         super().__init__("Mark of Nature", 3, CHARACTER_CLASS.DRUID, CARD_RARITY.COMMON, True, hsgame.targetting.find_minion_spell_target)
+        self.option_count = 2
 
     def use(self, player, game):
         class MarkOfNatureAttack(Card):
@@ -256,6 +259,7 @@ class Nourish(Card):
 
     def __init__(self):
         super().__init__("Nourish", 5, CHARACTER_CLASS.DRUID, CARD_RARITY.RARE, False)
+        self.option_count = 2
 
     def use(self, player, game):
         super().use(player, game)
@@ -292,10 +296,17 @@ class Starfall(Card):
 
     def __init__(self):
         super().__init__("Starfall", 5, CHARACTER_CLASS.DRUID, CARD_RARITY.RARE, False)
+        self.option_count = 2
 
     def can_use(self, player, game):
         return super().can_use(player, game) and len(game.other_player.minions) > 0
 
+    def option_targets(self, option, game):
+        # Only the second option, five damage to one minion, asks for a target
+        if option == 1:
+            return hsgame.targetting.find_minion_spell_target(game)
+        return None
+
     def use(self, player, game):
         super().use(player, game)
 
@@ -103,13 +103,17 @@ class MindControl(Card):
         self.target.remove_from_board()
         self.target.add_to_board(self.target.card, self.target.game, player, 0)
         
-class MindVision(Card): # TODO: Can this card be played if opponent has no cards in hand?
+class MindVision(Card):
     def __init__(self):
         super().__init__("Mind Vision", 1, CHARACTER_CLASS.PRIEST, CARD_RARITY.COMMON, False)
 
     def use(self, player, game):
         super().use(player, game)
-        
-        card = copy.deepcopy(game.other_player.hand[game.random(0, len(game.other_player.hand) - 1)])
-        player.hand.append(card)
+
+        # The card can be played when the opponent has no cards, but does nothing
+        if len(game.other_player.hand) == 0:
+            return
+        card = game.other_player.hand[game.random(0, len(game.other_player.hand) - 1)]
+        game.other_player.trigger("card_revealed", card)
+        player.hand.append(copy.deepcopy(card))
         
\ No newline at end of file
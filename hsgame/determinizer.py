@@ -0,0 +1,98 @@
+from hsgame.game_random import GameRandom
+
+__author__ = 'Daniel'
+
+
+class Determinizer:
+    """
+        Samples the games a player can't tell apart from the real one, for search agents which shouldn't see hidden
+        cards.
+
+        A player knows the cards in their own hand, but not the order of either deck, or which of the other player's
+        cards are in the other player's hand, except for those revealed to them, e.g. by Mind Vision.  Each sample is
+        a copy of the game in which the other player's hidden cards have been dealt again from those cards and the rest
+        of their deck, and the random numbers are new, so that the decks are drawn in a different order.  A card is
+        known to be in a hand from when it is revealed until it leaves the hand by being played or put back.
+
+        The determinizer has to be created with the game, before any cards are revealed.  Sampling costs a clone of the
+        game and a handful of list operations, so hundreds of samples can be taken for each decision.
+
+        Secrets aren't hidden, and neither are changes made to cards while they are in a hand, which stay with the
+        card they were made to.
+    """
+
+    def __init__(self, game, seed=None):
+        """
+            @game: the Game to sample
+            @seed: the seed for the choice of samples, see GameRandom
+        """
+        self.game = game
+        self.randint = GameRandom(seed).randint
+        # For each player, the cards in their hand the other player has seen
+        self.revealed = [set(), set()]
+        for index, player in enumerate(game.players):
+            player.bind("card_revealed", self._card_revealed, index)
+            player.bind("card_played", self._card_left_hand, index)
+            player.bind("card_put_back", self._card_left_hand, index)
+
+    def _card_revealed(self, card, index):
+        self.revealed[index].add(card)
+
+    def _card_left_hand(self, card, index):
+        self.revealed[index].discard(card)
+
+    def hidden_cards(self, observer):
+        """
+            The indexes of the cards in the hand of the observer's opponent that the observer hasn't seen
+        """
+        index = 1 - self.game.players.index(observer)
+        revealed = self.revealed[index]
+        return [card_index for card_index, card in enumerate(self.game.players[index].hand) if card not in revealed]
+
+    def sample(self, observer, agents=None, randint=None):
+        """
+            Copies the game as it could be, as far as the observer knows
+
+            @observer: the Player of the game whose knowledge is used
+            @agents: the agents for the copy, as for Game.clone
+            @randint: a function like random.randint for the copy's random numbers.  If not given, the copy gets a
+            GameRandom seeded from this determinizer's random numbers.
+        """
+        opponent_index = 1 - self.game.players.index(observer)
+        hidden = self.hidden_cards(observer)
+        game = self.game.clone(agents)
+        _deal_again(game.players[opponent_index], hidden, self.randint)
+
+        if randint is None:
+            randint = GameRandom(self.randint(0, 1 << 62)).randint
+        game.reseed(randint)
+        return game
+
+
+def _deal_again(player, hidden, randint):
+    """
+        Swaps the cards at the given indexes of a player's hand with any of themselves and the cards left in the
+        player's deck, chosen evenly
+    """
+    deck = player.deck
+    unused = set(deck.unused)
+    # Where each card in the hand came from in the deck.  Cards which didn't come from the deck are left alone.
+    used_positions = {}
+    for position, card in enumerate(deck.cards):
+        if position not in unused:
+            used_positions.setdefault(id(card), []).append(position)
+    slots = []
+    for card_index in hidden:
+        positions = used_positions.get(id(player.hand[card_index]))
+        if positions:
+            slots.append(card_index)
+            unused.add(positions.pop())
+    if len(slots) == 0:
+        return
+
+    pool = list(unused)
+    for slot, card_index in enumerate(slots):
+        chosen = randint(slot, len(pool) - 1)
+        pool[slot], pool[chosen] = pool[chosen], pool[slot]
+        player.hand[card_index] = deck.cards[pool[slot]]
+    deck.unused = sorted(pool[len(slots):])
@@ -0,0 +1,217 @@
+import abc
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__author__ = 'Daniel'
+
+# The features of one player in a state vector.  A vector has these for the player it is made for, followed by the same
+# for their opponent, see FEATURES.
+PLAYER_FEATURES = ["health", "mana", "max_mana", "hand", "deck", "minions", "attack", "minion_health", "taunt_health",
+                   "ready_attack"]
+FEATURES = PLAYER_FEATURES + ["opponent_" + feature for feature in PLAYER_FEATURES]
+_feature_index = dict([(feature, index) for index, feature in enumerate(FEATURES)])
+_HEALTH = _feature_index["health"]
+_OPPONENT_HEALTH = _feature_index["opponent_health"]
+
+
+def _player_features(player):
+    attack = 0
+    minion_health = 0
+    taunt_health = 0
+    ready_attack = player.attack_power if player.can_attack() else 0
+    for minion in player.minions:
+        minion_attack = minion.attack_power + minion.temp_attack
+        attack += minion_attack
+        minion_health += minion.defense
+        if minion.taunt:
+            taunt_health += minion.defense
+        if minion.active and not minion.frozen:
+            ready_attack += minion_attack
+    return (player.health + player.armour, player.mana, player.max_mana, len(player.hand), player.deck.left,
+            len(player.minions), attack, minion_health, taunt_health, ready_attack)
+
+
+def state_vector(game, player_index):
+    """
+        The features of a game that the evaluators score, from the point of view of one of the players, as a tuple of
+        ints in the order of FEATURES.  Health includes armour, and attack includes attack that only lasts for the
+        turn.  Ready attack is the attack of the characters that can still attack this turn.
+
+        @player_index: int, the index of the player in game.players
+    """
+    return _player_features(game.players[player_index]) + _player_features(game.players[1 - player_index])
+
+
+def state_vectors(games, player_index):
+    """
+        The state vectors of many games, as the rows of a NumPy array, for Evaluator.score_batch
+    """
+    if numpy is None:
+        raise ImportError("state_vectors needs NumPy")
+    vectors = numpy.array([state_vector(game, player_index) for game in games], dtype=numpy.int32)
+    return vectors.reshape(len(games), len(FEATURES))
+
+
+def _sigmoid(value):
+    # Bounded so that math.exp can't overflow however lopsided the game is
+    return 1 / (1 + math.exp(-max(-50.0, min(50.0, value))))
+
+
+class Evaluator(abc.ABC):
+    """
+        Scores how good a game is for one of its players, from 0 for a loss to 1 for a win.
+
+        An evaluator can be called with a game and the index of the player, so that it can be given to MCTSAgent as its
+        evaluation.  Subclasses implement score_position, for one state vector, and can implement score_positions, which
+        scores the rows of an array of state vectors at once with NumPy.  Scoring every child of a node in a search, or
+        every action a greedy agent could take, is then one call to score_games.
+
+        Games in which a player has no health left are scored as wins or losses by every evaluator.
+    """
+
+    def __call__(self, game, player_index):
+        return self.score(state_vector(game, player_index))
+
+    def score(self, vector):
+        health = vector[_HEALTH]
+        opponent_health = vector[_OPPONENT_HEALTH]
+        if health <= 0 or opponent_health <= 0:
+            if health > 0:
+                return 1.0
+            if opponent_health > 0:
+                return 0.0
+            return 0.5
+        return self.score_position(vector)
+
+    @abc.abstractmethod
+    def score_position(self, vector):
+        """
+            The score of a state vector in which both players are alive
+        """
+
+    def score_batch(self, vectors):
+        """
+            The scores of the rows of a NumPy array of state vectors, as a NumPy array
+        """
+        vectors = numpy.asarray(vectors)
+        scores = self.score_positions(vectors)
+        health = vectors[:, _HEALTH]
+        opponent_health = vectors[:, _OPPONENT_HEALTH]
+        scores = numpy.where(opponent_health <= 0, 1.0, scores)
+        scores = numpy.where(health <= 0, numpy.where(opponent_health <= 0, 0.5, 0.0), scores)
+        return scores
+
+    def score_positions(self, vectors):
+        """
+            The scores of an array of state vectors, as score_position.  By default, each is scored separately.
+        """
+        return numpy.array([self.score_position(vector) for vector in vectors.tolist()], dtype=numpy.float64)
+
+    def score_games(self, games, player_index):
+        """
+            The scores of many games for the same player, as a list.  Uses score_batch when NumPy is installed.
+        """
+        if numpy is None:
+            return [self(game, player_index) for game in games]
+        if len(games) == 0:
+            return []
+        return self.score_batch(state_vectors(games, player_index)).tolist()
+
+
+class LinearEvaluator(Evaluator):
+    """
+        Scores a weighted sum of the features, squashed to between 0 and 1 with the logistic function.  A sum of scale
+        scores about 0.73, and minus scale about 0.27.
+    """
+
+    def __init__(self, weights, scale):
+        """
+            @weights: dictionary from the names in FEATURES to their weights.  Features not given have no weight.
+            @scale: float
+        """
+        for feature in weights:
+            if feature not in _feature_index:
+                raise KeyError("Unknown feature: " + feature)
+        self.weights = [(_feature_index[feature], weight / scale) for feature, weight in weights.items() if weight]
+        self.weight_vector = [0.0] * len(FEATURES)
+        for index, weight in self.weights:
+            self.weight_vector[index] = weight
+
+    def score_position(self, vector):
+        total = 0.0
+        for index, weight in self.weights:
+            total += vector[index] * weight
+        return _sigmoid(total)
+
+    def score_positions(self, vectors):
+        totals = vectors @ numpy.array(self.weight_vector)
+        return 1 / (1 + numpy.exp(-numpy.clip(totals, -50, 50)))
+
+
+class LethalThreatEvaluator(Evaluator):
+    """
+        Scores how close each player is to killing the other on their next turn: the attack on their board against
+        the other's health, and the health of the taunts in the way.  Positions where only the player has lethal on
+        board score near 1, and where only the opponent has it, near 0.
+    """
+
+    def __init__(self, scale=4):
+        self.scale = scale
+        self.indexes = [_feature_index[feature] for feature in ["attack", "taunt_health", "health", "opponent_attack",
+                                                                "opponent_taunt_health", "opponent_health"]]
+
+    def score_position(self, vector):
+        attack, taunt_health, health, opponent_attack, opponent_taunt_health, opponent_health = \
+            [vector[index] for index in self.indexes]
+        # How much more damage each player could do than they need to win, which is negative without lethal
+        reach = attack - opponent_taunt_health - opponent_health
+        opponent_reach = opponent_attack - taunt_health - health
+        lethal = (reach >= 0) - (opponent_reach >= 0)
+        return _sigmoid((min(reach, 0) - min(opponent_reach, 0)) / self.scale + 2 * lethal)
+
+    def score_positions(self, vectors):
+        attack, taunt_health, health, opponent_attack, opponent_taunt_health, opponent_health = \
+            [vectors[:, index] for index in self.indexes]
+        reach = attack - opponent_taunt_health - opponent_health
+        opponent_reach = opponent_attack - taunt_health - health
+        lethal = (reach >= 0).astype(numpy.int8) - (opponent_reach >= 0)
+        totals = (numpy.minimum(reach, 0) - numpy.minimum(opponent_reach, 0)) / self.scale + 2 * lethal
+        return 1 / (1 + numpy.exp(-numpy.clip(totals, -50, 50)))
+
+
+class CombinedEvaluator(Evaluator):
+    """
+        A weighted average of the scores of other evaluators
+    """
+
+    def __init__(self, evaluators):
+        """
+            @evaluators: list of (Evaluator, weight) tuples
+        """
+        self.evaluators = evaluators
+        self.total_weight = sum([weight for evaluator, weight in evaluators])
+
+    def score_position(self, vector):
+        return sum([evaluator.score_position(vector) * weight for evaluator, weight in self.evaluators]) / \
+            self.total_weight
+
+    def score_positions(self, vectors):
+        return sum([evaluator.score_positions(vectors) * weight for evaluator, weight in self.evaluators]) / \
+            self.total_weight
+
+
+# The difference in health, in the attack and health on the board and in the cards in hand
+MATERIAL = LinearEvaluator({"health": 1, "opponent_health": -1, "attack": 1, "opponent_attack": -1,
+                            "minion_health": 1, "opponent_minion_health": -1, "hand": 2, "opponent_hand": -2}, 15)
+
+# Control of the board: minions and their attack, and not leaving mana unspent
+TEMPO = LinearEvaluator({"minions": 2, "opponent_minions": -2, "attack": 2, "opponent_attack": -2,
+                         "minion_health": 1, "opponent_minion_health": -1, "mana": -1}, 10)
+
+LETHAL_THREAT = LethalThreatEvaluator()
+
+DEFAULT = CombinedEvaluator([(MATERIAL, 2), (TEMPO, 1), (LETHAL_THREAT, 1)])
@@ -1,4 +1,8 @@
+import bisect
+import copy
+import operator
 import random
+import types
 import hsgame.powers
 import hsgame.targetting
 import hsgame.constants
@@ -6,23 +10,294 @@ import hsgame.constants
 
 __author__ = 'Daniel'
 
-card_table = {}
+class CardRegistry:
+    """
+        Keeps track of every type of card, so that cards can be created from their names.  Card types register
+        themselves when they are defined, and are indexed the first time the registry is used after that.  Only card
+        types without subclasses of their own are playable cards, so only those are indexed.
+    """
+    def __init__(self):
+        self.card_types = []
+        self.pending = []
+        self.by_name = {}
+        self.by_id = []
+        self.ids = {}
+        self.by_class = {}
+        self.by_mana = {}
+        self.by_rarity = {}
+
+    def register(self, card_type):
+        self.pending.append(card_type)
+
+    def build(self):
+        # Nothing is changed until the new card types are known to be valid, so that a failed build leaves the indexes
+        # as they were, and the next use of the registry fails in the same way
+        card_types = self.card_types + self.pending
+        parents = set()
+        for card_type in card_types:
+            parents.update(card_type.__mro__[1:])
+
+        cards = {}
+        for card_type in card_types:
+            if card_type not in parents:
+                card = card_type()
+                if card.name in cards:
+                    raise GameException("Two types of card are named " + card.name)
+                cards[card.name] = card
+
+        self.card_types = card_types
+        self.pending = []
+        self.by_name = {}
+        self.by_id = []
+        self.ids = {}
+        self.by_class = {}
+        self.by_mana = {}
+        self.by_rarity = {}
+        # Ids follow the order of the names, so they don't depend on the order the cards were defined in
+        for name in sorted(cards):
+            card = cards[name]
+            card_type = type(card)
+            self.by_name[name] = card_type
+            self.ids[name] = len(self.by_id)
+            self.by_id.append(card_type)
+            self.by_class.setdefault(card.character_class, []).append(card_type)
+            self.by_mana.setdefault(card.mana, []).append(card_type)
+            self.by_rarity.setdefault(card.status, []).append(card_type)
+
+    def _index(self):
+        if len(self.pending) > 0:
+            self.build()
+
+    def lookup(self, name):
+        """
+            Creates a new card with the given name
+        """
+        self._index()
+        return self.by_name[name]()
+
+    def card_type(self, name):
+        self._index()
+        return self.by_name[name]
+
+    def card_id(self, name):
+        self._index()
+        return self.ids[name]
+
+    def from_id(self, card_id):
+        self._index()
+        return self.by_id[card_id]()
+
+    def names(self):
+        self._index()
+        return list(self.ids)
+
+    def for_class(self, character_class):
+        self._index()
+        return list(self.by_class.get(character_class, []))
+
+    def for_mana(self, mana):
+        self._index()
+        return list(self.by_mana.get(mana, []))
+
+    def for_rarity(self, rarity):
+        self._index()
+        return list(self.by_rarity.get(rarity, []))
+
+
+card_registry = CardRegistry()
 
 
 def card_lookup(card_name):
-    def card_lookup_rec(card_type):
-        subclasses = card_type.__subclasses__()
-        if len(subclasses) is 0:
-                card = card_type()
-                card_table[card.name] = card_type
-        for sub_type in subclasses:
-            card_lookup_rec(sub_type)
+    return card_registry.lookup(card_name)
+
+
+_atomic_types = {int, float, bool, str, type(None), type, types.ModuleType}
+
+
+def _clone_list(value, memo):
+    result = []
+    memo[id(value)] = result
+    result.extend([item if type(item) in _atomic_types else _clone(item, memo) for item in value])
+    return result
+
+
+def _clone_tuple(value, memo):
+    items = [item if type(item) in _atomic_types else _clone(item, memo) for item in value]
+    # Tuples can't be registered before their items are copied, so one of the items may have copied it already
+    if id(value) in memo:
+        return memo[id(value)]
+    if all(item is original for item, original in zip(items, value)):
+        result = value
+    else:
+        result = tuple(items)
+    memo[id(value)] = result
+    return result
+
+
+def _clone_dict(value, memo):
+    result = {}
+    memo[id(value)] = result
+    for key, item in value.items():
+        if type(key) not in _atomic_types:
+            key = _clone(key, memo)
+        result[key] = item if type(item) in _atomic_types else _clone(item, memo)
+    return result
+
+
+def _clone_set(value, memo):
+    result = type(value)([_clone(item, memo) for item in value])
+    memo[id(value)] = result
+    return result
+
+
+def _clone_cell(value, memo):
+    result = types.CellType()
+    memo[id(value)] = result
+    try:
+        result.cell_contents = _clone(value.cell_contents, memo)
+    except ValueError:
+        # The variable hasn't been assigned yet
+        pass
+    return result
+
+
+def _clone_function(value, memo):
+    # Closures are what tie card effects to the objects they affect, so their cells have to follow the clone
+    if value.__closure__ is None:
+        return value
+    result = types.FunctionType(value.__code__, value.__globals__, value.__name__, value.__defaults__,
+                                tuple([_clone_cell(cell, memo) for cell in value.__closure__]))
+    result.__kwdefaults__ = value.__kwdefaults__
+    result.__qualname__ = value.__qualname__
+    result.__dict__.update(value.__dict__)
+    memo[id(value)] = result
+    return result
 
-    if len(card_table) == 0:
-        for card_type in Card.__subclasses__():
-            card_lookup_rec(card_type)
 
-    return card_table[card_name]()
+def _clone_method(value, memo):
+    result = types.MethodType(_clone(value.__func__, memo), _clone(value.__self__, memo))
+    memo[id(value)] = result
+    return result
+
+
+def _clone_builtin_method(value, memo):
+    if value.__self__ is None or isinstance(value.__self__, types.ModuleType):
+        return value
+    result = getattr(_clone(value.__self__, memo), value.__name__)
+    memo[id(value)] = result
+    return result
+
+
+def _clone_random(value, memo):
+    result = random.Random.__new__(type(value))
+    result.setstate(value.getstate())
+    memo[id(value)] = result
+    return result
+
+
+_object_slots = {}
+_unset = object()
+
+
+def _slots(cls):
+    """
+        Whether instances of a class have a __dict__, the names of the slots of the class and all its bases, and a
+        function which reads all of those slots at once
+    """
+    try:
+        return _object_slots[cls]
+    except KeyError:
+        pass
+    slots = []
+    for klass in cls.__mro__:
+        slot_names = klass.__dict__.get("__slots__", ())
+        if isinstance(slot_names, str):
+            slot_names = [slot_names]
+        slots.extend([slot for slot in slot_names if slot not in ("__dict__", "__weakref__")])
+    if len(slots) == 0:
+        def get_slots(value):
+            return ()
+    elif len(slots) == 1:
+        def get_slots(value, get_slot=operator.attrgetter(slots[0])):
+            return get_slot(value),
+    else:
+        get_slots = operator.attrgetter(*slots)
+    has_dict = hasattr(cls, "__dictoffset__") and cls.__dictoffset__ != 0
+    _object_slots[cls] = has_dict, slots, get_slots
+    return _object_slots[cls]
+
+
+def _slot_values(value, slots, get_slots):
+    try:
+        return get_slots(value)
+    except AttributeError:
+        # Some slots haven't been set
+        return tuple([getattr(value, slot, _unset) for slot in slots])
+
+
+def _set_slots(value, slots, values):
+    for slot, item in zip(slots, values):
+        if item is not _unset:
+            object.__setattr__(value, slot, item)
+        elif hasattr(value, slot):
+            object.__delattr__(value, slot)
+
+
+def _object_layout(cls):
+    if cls.__new__ is not object.__new__ or cls.__reduce_ex__ is not object.__reduce_ex__ \
+            or hasattr(cls, "__deepcopy__"):
+        return None
+    return _slots(cls)
+
+
+_object_layouts = {}
+
+
+def _clone_object(value, memo):
+    cls = type(value)
+    try:
+        layout = _object_layouts[cls]
+    except KeyError:
+        layout = _object_layouts[cls] = _object_layout(cls)
+
+    if layout is None:
+        return copy.deepcopy(value, memo)
+
+    has_dict, slots, get_slots = layout
+    result = object.__new__(cls)
+    memo[id(value)] = result
+    if has_dict:
+        result.__dict__.update([(key, item if type(item) in _atomic_types else _clone(item, memo))
+                                for key, item in value.__dict__.items()])
+    if slots:
+        _set_slots(result, slots,
+                   [item if type(item) in _atomic_types or item is _unset else _clone(item, memo)
+                    for item in _slot_values(value, slots, get_slots)])
+    return result
+
+
+_cloners = {
+    types.BuiltinFunctionType: _clone_builtin_method,
+    types.FunctionType: _clone_function,
+    types.MethodType: _clone_method,
+    list: _clone_list,
+    tuple: _clone_tuple,
+    dict: _clone_dict,
+    set: _clone_set,
+    frozenset: _clone_set,
+    random.Random: _clone_random,
+}
+
+
+def _clone(value, memo):
+    if type(value) in _atomic_types:
+        return value
+    try:
+        return memo[id(value)]
+    except KeyError:
+        pass
+
+    return _cloners.get(type(value), _clone_object)(value, memo)
 
 
 class GameException(Exception):
@@ -30,62 +305,73 @@ class GameException(Exception):
         super().__init__(message)
 
 
-class Bindable:
-    def __init__(self):
-        self.events = {}
+class Handler:
 
-    def bind(self, event, function, *args, **kwargs):
-        class Handler:
-            def __init__(self, function, args, kwargs):
-                self.args = args
-                self.kwargs = kwargs
-                self.function = function
-                self.remove = False
-                self.active = False
+    __slots__ = ['function', 'args', 'kwargs', 'remove', 'active']
 
+    def __init__(self, function, args, kwargs, remove):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.remove = remove
+        self.active = False
 
-        if not event in self.events:
-            self.events[event] = []
 
-        self.events[event].append(Handler(function, args, kwargs))
+class Bindable:
 
-    def bind_once(self, event, function, *args, **kwargs):
-        class Handler:
-            def __init__(self, function, args, kwargs):
-                self.args = args
-                self.kwargs = kwargs
-                self.function = function
-                self.remove = True
-                self.active = False
+    __slots__ = ['events']
 
-        if not event in self.events:
-            self.events[event] = []
+    def __init__(self):
+        # Each event maps to a tuple of handlers.  The tuples are never modified in place, binding and unbinding
+        # replace them, so trigger can walk the handlers it started with without taking a copy first.
+        self.events = {}
+
+    def bind(self, event, function, *args, **kwargs):
+        self.events[event] = self.events.get(event, ()) + (Handler(function, args, kwargs, False),)
 
-        self.events[event].append(Handler(function, args, kwargs))
+    def bind_once(self, event, function, *args, **kwargs):
+        self.events[event] = self.events.get(event, ()) + (Handler(function, args, kwargs, True),)
 
     def trigger(self, event, *args, **kwargs):
-        if event in self.events:
-            for handler in self.events[event].copy():
-                if not handler.active:
-                    pass_args = args + handler.args
+        handlers = self.events.get(event)
+        if handlers is None:
+            return
+
+        for handler in handlers:
+            if not handler.active:
+                handler.active = True
+                if handler.kwargs:
                     pass_kwargs = kwargs.copy()
                     pass_kwargs.update(handler.kwargs)
-                    handler.active = True
-                    handler.function(*pass_args, **pass_kwargs)
-                    handler.active = False
-                    if handler.remove:
-                        self.events[event].remove(handler)
-                        if len(self.events[event]) is 0:
-                            del (self.events[event])
-
-
-
+                    handler.function(*(args + handler.args), **pass_kwargs)
+                elif handler.args:
+                    handler.function(*(args + handler.args), **kwargs)
+                else:
+                    handler.function(*args, **kwargs)
+                handler.active = False
+                if handler.remove:
+                    self._remove_handler(event, handler)
+
+    def _remove_handler(self, event, handler):
+        handlers = self.events.get(event)
+        if handlers is None:
+            return
+        if handlers[-1] is handler:
+            handlers = handlers[:-1]
+        else:
+            handlers = tuple(other for other in handlers if other is not handler)
+        if len(handlers) == 0:
+            del self.events[event]
+        else:
+            self.events[event] = handlers
 
     def unbind(self, event, function):
         if event in self.events:
-            self.events[event] = [handler for handler in self.events[event] if not handler.function == function]
-            if len(self.events[event]) is 0:
-                del (self.events[event])
+            handlers = tuple(handler for handler in self.events[event] if not handler.function == function)
+            if len(handlers) == 0:
+                del self.events[event]
+            else:
+                self.events[event] = handlers
 
 
 class Card(Bindable):
@@ -103,12 +389,19 @@ class Card(Bindable):
         self.character_class = character_class
         self.status = status
         self.cancel = False
+        self.option_count = 0
         self.targetable = targetable
         if targetable:
             self.targets = []
             self.target = None
             self.get_targets = target_func
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Classes defined inside functions (in tests, for instance) aren't cards that can be looked up by name
+        if "<locals>" not in cls.__qualname__:
+            card_registry.register(cls)
+
     def can_use(self, player, game):
         if self.targetable:
             self.targets = self.get_targets(game)
@@ -124,6 +417,18 @@ class Card(Bindable):
             else:
                 self.target = player.agent.choose_target(self.targets)
 
+    def option_targets(self, option, game):
+        """
+            The targets the agent will be asked to choose from when this card is played with the given option, or None
+            if it won't be asked for one.  By default every option uses the card's own targets, as found by can_use.
+            Cards which only ask for a target for some of their options override this.
+
+            @option: int, the index of the option, or None for cards without options
+        """
+        if self.targetable:
+            return self.targets
+        return None
+
     def is_spell(self):
         return True
 
@@ -174,6 +479,11 @@ class SecretCard(Card):
 
 
 class Minion(Bindable):
+
+    __slots__ = ['attack_power', 'max_attack', 'defense', 'max_defense', 'type', 'active', 'dead', 'taunt',
+                 'wind_fury', 'used_wind_fury', 'frozen', 'frozen_this_turn', '_stealth', 'immune_to_spells', 'game',
+                 'player', 'card', 'temp_attack', 'index', 'charge', 'spell_power', 'divine_shield', 'delayed']
+
     def __init__(self, attack, defense, type=hsgame.constants.MINION_TYPE.NONE):
         self.attack_power = self.max_attack = attack
         self.defense = self.max_defense = defense
@@ -185,7 +495,8 @@ class Minion(Bindable):
         self.used_wind_fury = False
         self.frozen = False
         self.frozen_this_turn = False
-        self.stealth = False
+        self._stealth = False
+        self.immune_to_spells = False
         self.game = None
         self.player = None
         self.card = None
@@ -197,6 +508,17 @@ class Minion(Bindable):
         self.delayed = []
         super().__init__()
 
+    @property
+    def stealth(self):
+        return self._stealth
+
+    @stealth.setter
+    def stealth(self, stealth):
+        # Stealthed minions can't be targeted, so the targets found for the board no longer apply
+        self._stealth = stealth
+        if self.game is not None:
+            self.game.clear_target_cache()
+
     def delayed_trigger(self, event, *args, **kwargs):
         self.delayed.append({'event': event, 'args': args, 'kwargs': kwargs})
         self.game.delayed_minions.append(self)
@@ -213,12 +535,13 @@ class Minion(Bindable):
         self.game = game
         self.player = player
         player.spell_power += self.spell_power
-        self.trigger("added_to_board", self)
-        self.game.trigger("minion_added", self)
+        # The indexes have to be right before the battlecry, which can kill the minions next to this one
         for minion in player.minions:
             if minion.index >= index:
                 minion.index += 1
         self.index = index
+        self.trigger("added_to_board", self)
+        self.game.trigger("minion_added", self)
         if self.charge:
             self.active = True
         player.bind("turn_ended", self.turn_complete)
@@ -240,19 +563,7 @@ class Minion(Bindable):
         if not self.can_attack():
             raise GameException("That minion cannot attack")
 
-        found_taunt = False
-        targets = []
-        for enemy in self.game.other_player.minions:
-            if enemy.taunt and not enemy.stealth:
-                found_taunt = True
-            if not enemy.stealth:
-                targets.append(enemy)
-
-        if found_taunt:
-            targets = [target for target in targets if target.taunt]
-        else:
-            targets.append(self.game.other_player)
-
+        targets = hsgame.targetting.find_attack_target(self.game)
         target = self.player.agent.choose_target(targets)
 
         if isinstance(target, Minion):
@@ -337,6 +648,7 @@ class Minion(Bindable):
         self.wind_fury = False
         self.frozen = False
         self.frozen_this_turn = False
+        self.immune_to_spells = False
         self.stealth = False
         self.charge = False
         self.player.spell_power -= self.spell_power
@@ -375,18 +687,24 @@ class Minion(Bindable):
         return not self.stealth
 
     def spell_targettable(self):
-        return not self.stealth
+        return not self.stealth and not self.immune_to_spells
 
     def __str__(self):
         return "({0}) ({1}) {2} at index {3}".format(self.attack_power, self.defense, self.card.name, self.index)
 
 
 class Deck:
+
+    __slots__ = ['cards', 'character_class', 'left', 'unused', 'card_positions']
+
     def __init__(self, cards, character_class):
         self.cards = cards
         self.character_class = character_class
-        self.used = [False] * 30
         self.left = 30
+        # The positions of the unused cards, in order.  The random number given to draw is an index into this list.
+        self.unused = list(range(0, 30))
+        # The first position of each card in the deck, built when a card is first put back
+        self.card_positions = None
 
     def can_draw(self):
         return self.left > 0
@@ -395,30 +713,32 @@ class Deck:
         if not self.can_draw():
             raise GameException("Cannot draw more than 30 cards")
 
-        index = random(0, self.left - 1)
-        count = 0
-        i = 0
-        while count <= index:
-            if not self.used[i]:
-                count += 1
-            i += 1
-
-        self.used[i - 1] = True
+        position = self.unused.pop(random(0, self.left - 1))
         self.left -= 1
-        return self.cards[i - 1]
+        return self.cards[position]
 
     def put_back(self, card):
-        for index in range(0, 30):
-            if self.cards[index] == card:
-                if self.used[index] is False:
-                    raise GameException("Tried to put back a card that hadn't been used yet")
-                self.used[index] = False
-                self.left += 1
-                return
-        raise GameException("Tried to put back a card that didn't come from this deck")
+        if self.card_positions is None:
+            self.card_positions = {}
+            for position in range(29, -1, -1):
+                self.card_positions[self.cards[position]] = position
+
+        if card not in self.card_positions:
+            raise GameException("Tried to put back a card that didn't come from this deck")
+        position = self.card_positions[card]
+        index = bisect.bisect_left(self.unused, position)
+        if index < self.left and self.unused[index] == position:
+            raise GameException("Tried to put back a card that hadn't been used yet")
+        self.left += 1
+        self.unused.insert(index, position)
 
 
 class Player(Bindable):
+
+    __slots__ = ['dead', 'name', 'mana', 'health', 'deck', 'max_mana', 'armour', 'attack_power', 'spell_power',
+                 'minions', 'weapon', 'character_class', 'random', 'hand', 'fatigue', 'agent', 'game',
+                 'frozen_this_turn', 'frozen', 'active', 'secrets', 'power']
+
     def __init__(self, name, deck, agent, game, random=random.randint):
         super().__init__()
         self.dead = False
@@ -520,20 +840,7 @@ class Player(Bindable):
         if not self.can_attack():
             raise GameException("The player cannot attack")
 
-        found_taunt = False
-        targets = []
-        for enemy in self.game.other_player.minions:
-            if enemy.taunt and not enemy.stealth:
-                found_taunt = True
-            if not enemy.stealth:
-                targets.append(enemy)
-
-        if found_taunt:
-            targets = [target for target in targets if target.taunt]
-        else:
-            targets.append(self.game.other_player)
-
-
+        targets = hsgame.targetting.find_attack_target(self.game)
         target = self.agent.choose_target(targets)
 
         if isinstance(target, Minion):
@@ -568,9 +875,94 @@ class Player(Bindable):
         self.attack_power = 0
 
 
+class Checkpoint:
+    """
+        Records the state of every game object reachable from a game: their fields (whether in a __dict__ or in
+        slots), the lists and dictionaries they hold (hands, boards, decks, event tables) and the variables captured by
+        the closures bound to their events.
+        Restoring a checkpoint puts that state back into the same objects, so no new objects are created and
+        references held by agents stay valid.  The state of agents and random number generators is not recorded.
+    """
+
+    def __init__(self, game):
+        self.fields = []
+        self.lists = []
+        self.dicts = []
+        self.cells = []
+        game_object_types = (Bindable, Deck, hsgame.powers.Power)
+        seen = set()
+        pending = [game]
+        while len(pending) > 0:
+            value = pending.pop()
+            value_type = type(value)
+            if value_type in _atomic_types or id(value) in seen:
+                continue
+            seen.add(id(value))
+
+            if value_type is list:
+                self.lists.append((value, value.copy()))
+                pending.extend(value)
+            elif value_type is tuple:
+                pending.extend(value)
+            elif value_type is dict:
+                self.dicts.append((value, value.copy()))
+                pending.extend(value.keys())
+                pending.extend(value.values())
+            elif value_type is Handler:
+                pending.append(value.function)
+                pending.extend(value.args)
+                pending.extend(value.kwargs.values())
+            elif value_type is types.FunctionType:
+                if value.__closure__ is not None:
+                    pending.extend(value.__closure__)
+            elif value_type is types.CellType:
+                try:
+                    contents = value.cell_contents
+                except ValueError:
+                    continue
+                self.cells.append((value, contents))
+                pending.append(contents)
+            elif value_type is types.MethodType:
+                pending.append(value.__func__)
+                pending.append(value.__self__)
+            elif isinstance(value, game_object_types):
+                has_dict, slots, get_slots = _slots(value_type)
+                fields = value.__dict__.copy() if has_dict else None
+                slot_values = _slot_values(value, slots, get_slots)
+                self.fields.append((value, fields, slots, slot_values))
+                if fields is not None:
+                    pending.extend(fields.values())
+                pending.extend(slot_values)
+
+    def restore(self):
+        for game_object, fields, slots, slot_values in self.fields:
+            _set_slots(game_object, slots, slot_values)
+            if fields is not None:
+                game_object.__dict__.clear()
+                game_object.__dict__.update(fields)
+        for list_object, items in self.lists:
+            list_object[:] = items
+        for dict_object, items in self.dicts:
+            dict_object.clear()
+            dict_object.update(items)
+        for cell, contents in self.cells:
+            cell.cell_contents = contents
+
+
 class Game(Bindable):
     def __init__(self, decks, agents, random=random.randint):
+        """
+            @decks: list of two Deck
+            @agents: list of two agents, the first plays the first deck
+            @random: the function giving the game's random numbers, called as random(lower_bound, upper_bound) like
+            random.randint.  An object with a randint method, such as hsgame.game_random.GameRandom, can be given
+            instead.
+        """
         super().__init__()
+        if hasattr(random, "randint"):
+            random = random.randint
+        # The targets found by the functions in hsgame.targetting for the current board, see clear_target_cache
+        self.target_cache = {}
         self.delayed_minions = []
         self.random = random
         first_player = random(0, 1)
@@ -593,6 +985,108 @@ class Game(Bindable):
 
         self.players[0].bind("died", self.game_over)
         self.players[1].bind("died", self.game_over)
+        self.bind("minion_added", self.clear_target_cache)
+        self.bind("minion_removed", self.clear_target_cache)
+
+    def clear_target_cache(self, *args):
+        """
+            Forgets the targets found for the board as it was.  Called whenever something the targetting functions
+            depend on changes: minions being added or removed, a minion's stealth and the current player.
+        """
+        if self.target_cache:
+            self.target_cache = {}
+
+    def clone(self, agents=None):
+        """
+            Copies the entire state of the game, so that the copy can be played independently of this game.
+            Events bound between game objects, including closures created by cards, refer to the copied objects.
+
+            @agents: list of agents for the copy, in the same order as players.  If not given, the agents are copied
+            as well
+        """
+        memo = {}
+        if agents is not None:
+            for player, agent in zip(self.players, agents):
+                memo[id(player.agent)] = agent
+
+        game = _clone(self, memo)
+
+        if agents is not None:
+            for agent in agents:
+                agent.set_game(game)
+        return game
+
+    def reseed(self, random):
+        """
+            Gives the game and both its players a new source of random numbers, such as a clone which shouldn't draw
+            the same cards as the game it was copied from
+
+            @random: a function like random.randint, or an object with a randint method, as given to the constructor
+        """
+        if hasattr(random, "randint"):
+            random = random.randint
+        self.random = random
+        for player in self.players:
+            player.random = random
+
+    def legal_actions(self):
+        """
+            Generates every action the current player can take, as replay actions.  Cards which need a target, board
+            index or option generate one action for each possible choice.  The actions refer to the game as it is
+            when they are generated, so they should all be collected before any are played.  Playing an action
+            requires an agent which uses next_target, next_index and next_option, as the replay agent does.
+        """
+        # hsgame.replay imports the cards, which need this module to be loaded first
+        import hsgame.replay
+
+        player = self.current_player
+        for card_index, card in enumerate(player.hand.copy()):
+            if card.mana > player.mana or not card.can_use(player, self):
+                continue
+
+            if card.option_count > 0:
+                options = range(0, card.option_count)
+            else:
+                options = [None]
+
+            for option in options:
+                targets = card.option_targets(option, self)
+                if targets is None:
+                    targets = [None]
+                for target in targets:
+                    if card.is_spell():
+                        proxy = hsgame.replay.ProxyCard(str(card_index))
+                        if option is not None:
+                            proxy.set_option(option)
+                        yield hsgame.replay.SpellAction(proxy, target, self)
+                    else:
+                        for index in range(0, len(player.minions) + 1):
+                            proxy = hsgame.replay.ProxyCard(str(card_index))
+                            if option is not None:
+                                proxy.set_option(option)
+                            yield hsgame.replay.MinionAction(proxy, index, target, self)
+
+        attackers = [minion for minion in player.minions if minion.can_attack()]
+        if player.can_attack():
+            attackers.append(player)
+        if len(attackers) > 0:
+            attack_targets = hsgame.targetting.find_attack_target(self)
+            for attacker in attackers:
+                for target in attack_targets:
+                    yield hsgame.replay.AttackAction(attacker, target, self)
+
+        if player.power.can_use():
+            if player.power.targetable:
+                for target in hsgame.targetting.find_spell_target(self):
+                    yield hsgame.replay.PowerAction(target, self)
+            else:
+                yield hsgame.replay.PowerAction(game=self)
+
+    def checkpoint(self):
+        return Checkpoint(self)
+
+    def rollback(self, checkpoint):
+        checkpoint.restore()
 
     def pre_game(self):
         card_keep_index = self.players[0].agent.do_card_check(self.players[0].hand)
@@ -637,6 +1131,7 @@ class Game(Bindable):
         else:
             self.current_player = self.players[0]
             self.other_player = self.players[1]
+        self.clear_target_cache()
         if self.current_player.max_mana < 10:
             self.current_player.max_mana += 1
 
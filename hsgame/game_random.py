@@ -0,0 +1,70 @@
+import hashlib
+import os
+import random
+
+__author__ = 'Daniel'
+
+
+def _stream_seed(seed, stream):
+    # Hashing the seed and the stream together gives unrelated states for neighbouring streams, so games seeded from
+    # the same master seed don't share any of their random numbers
+    digest = hashlib.blake2b("{0!r}:{1}".format(seed, stream).encode("utf-8"), digest_size=32).digest()
+    return int.from_bytes(digest, "little")
+
+
+class GameRandom:
+    """
+        The random numbers for one game.  Each GameRandom has its own state, so a game's random numbers depend only on
+        its seed and stream, not on what else has run in the process, as they do with the global random.randint.
+
+        Pass randint to Game in place of random.randint, or pass the GameRandom itself:
+
+            game = Game(decks, agents, GameRandom(seed, game_index))
+
+        randint(lower_bound, upper_bound) takes the numbers straight from a Mersenne Twister's getrandbits, which is
+        written in C, and is around twice as quick as random.randint, which goes through several layers of Python to
+        get there.  A generator written in Python, such as PCG or xorshift, needs so many Python operations for each
+        number that it is slower than either.
+
+        Games cloned with Game.clone get a copy of the state, and carry on with the same numbers as the original.
+    """
+
+    __slots__ = ['seed', 'stream', '_getrandbits']
+
+    def __init__(self, seed=None, stream=0):
+        """
+            @seed: int or string.  If None, a seed is chosen from the operating system's randomness, and can be read
+            from the seed attribute to play the game again.
+            @stream: int, which of the independent sequences for the seed to use.  A tournament uses one seed and a
+            stream for each game.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.stream = stream
+        self._getrandbits = random.Random(_stream_seed(seed, stream)).getrandbits
+
+    def randint(self, lower_bound, upper_bound):
+        """
+            A random int from lower_bound to upper_bound, including both, like random.randint
+        """
+        count = upper_bound - lower_bound + 1
+        if count <= 1:
+            if count == 1:
+                return lower_bound
+            raise ValueError("empty range for randint({0}, {1})".format(lower_bound, upper_bound))
+        # The fewest bits that can hold count - 1, so a power of two range never throws a number away
+        bits = (count - 1).bit_length()
+        # Numbers past the end of the range are thrown away rather than wrapped around, so every result is as likely
+        number = self._getrandbits(bits)
+        while number >= count:
+            number = self._getrandbits(bits)
+        return lower_bound + number
+
+    def substream(self, stream):
+        """
+            An independent GameRandom from the same seed, e.g. for each game of a tournament
+
+            @stream: int
+        """
+        return GameRandom(self.seed, stream)
@@ -18,6 +18,7 @@ class Power:
 
     def __init__(self, player):
         self.player = player
+        self.targetable = False
 
     def can_use(self):
         return self.player.mana >= 2
@@ -43,6 +44,7 @@ class MagePower(Power):
 
     def __init__(self, player):
         super().__init__(player)
+        self.targetable = True
 
     def use(self):
         super().use()
@@ -54,6 +56,7 @@ class PriestPower(Power):
 
     def __init__(self, player):
         super().__init__(player)
+        self.targetable = True
 
     def use(self):
         super().use()
@@ -1,5 +1,7 @@
+import array
 from random import randint
 import re
+import sys
 import hsgame
 import hsgame.constants
 import hsgame.game_objects
@@ -14,6 +16,224 @@ class ReplayException(Exception):
         super().__init__(message)
 
 
+BINARY_MAGIC = b"HSR"
+BINARY_VERSION = 2
+
+# The first byte of each action in the binary format.  The low three bits are the type of action, and the flags say
+# which of the optional parts follow.
+_PLAY = 0
+_SUMMON = 1
+_ATTACK = 2
+_POWER = 3
+_END = 4
+_CONCEDE = 5
+_HAS_TARGET = 8
+_HAS_OPTION = 16
+
+# array type codes for packing random numbers, by the number of bytes each number takes
+_RANDOM_TYPES = {1: 'B', 2: 'H', 4: 'I'}
+
+
+def _write_varint(buffer, value):
+    if value < 0:
+        raise ReplayException("Negative numbers can't be written to a binary replay")
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_string(buffer, string):
+    encoded = string.encode("utf-8")
+    _write_varint(buffer, len(encoded))
+    buffer.extend(encoded)
+
+
+def _write_character(buffer, character_ref):
+    # p1 is 0, p2 is 1, and minion n of a player adds (n + 1) * 2
+    ref = character_ref.split(':')
+    value = 0 if ref[0] == "p1" else 1
+    if len(ref) > 1:
+        value += (int(ref[1]) + 1) * 2
+    _write_varint(buffer, value)
+
+
+def _write_card(buffer, card):
+    ref = str(card.card_ref).split(':')
+    _write_varint(buffer, int(ref[0]))
+    if len(ref) > 1:
+        _write_varint(buffer, int(ref[1]))
+
+
+def _card_flags(card, target):
+    flags = 0
+    if target is not None:
+        flags |= _HAS_TARGET
+    if ':' in str(card.card_ref):
+        flags |= _HAS_OPTION
+    return flags
+
+
+class _BinaryReader:
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def varint(self):
+        data = self.data
+        position = self.position
+        value = data[position]
+        position += 1
+        if value >= 0x80:
+            value &= 0x7f
+            shift = 7
+            while True:
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+        self.position = position
+        return value
+
+    def bytes(self, length):
+        if self.position + length > len(self.data):
+            raise IndexError("Replay ended early")
+        result = self.data[self.position:self.position + length]
+        self.position += length
+        return result
+
+    def string(self):
+        return self.bytes(self.varint()).decode("utf-8")
+
+    def character(self):
+        value = self.varint()
+        player = "p1" if value % 2 == 0 else "p2"
+        if value < 2:
+            return player
+        return player + ":" + str(value // 2 - 1)
+
+    def card(self, flags):
+        card = ProxyCard(str(self.varint()))
+        if flags & _HAS_OPTION:
+            card.set_option(self.varint())
+        return card
+
+
+_LINE_PATTERN = re.compile("\s*(\w*)\s*\(([^)]*)\)\s*(;.*)?$")
+_HEADER_DIRECTIVES = {'deck', 'random', 'keep', 'snapshot'}
+
+
+def _parse_line(line):
+    (action, args) = _LINE_PATTERN.match(line).group(1, 2)
+    return action, [arg.strip() for arg in args.split(",")]
+
+
+def _parse_action(action, args):
+    if action == 'play':
+        card = args[0]
+        if len(args) > 1:
+            target = args[1]
+        else:
+            target = None
+        return SpellAction(ProxyCard(card), target)
+
+    elif action == 'summon':
+        card = args[0]
+
+        index = int(args[1])
+
+        if len(args) > 2:
+            target = args[2]
+        else:
+            target = None
+
+        return MinionAction(ProxyCard(card), index, target)
+    elif action == 'attack':
+        return AttackAction(args[0], args[1])
+    elif action == 'power':
+        if len(args[0]) > 0:
+            return PowerAction(args[0])
+        else:
+            return PowerAction()
+    elif action == 'end':
+        return TurnEndAction()
+    elif action == 'concede':
+        return ConcedeAction()
+    return None
+
+
+def _binary_replay(decks, random_numbers, keeps, snapshot_interval, action_count, actions):
+    """
+        Puts together a binary replay from its parts, with the actions already written by write_binary
+    """
+    buffer = bytearray(BINARY_MAGIC)
+    buffer.append(BINARY_VERSION)
+
+    # Cards are written as indexes into a table of the names used by this replay.  The registry's ids would be
+    # smaller still, but they change whenever a card is added, and replays have to outlive that.
+    deck_cards = [shorten_deck(deck.cards) for deck in decks]
+    names = []
+    name_indexes = {}
+    for cards in deck_cards:
+        for card in cards:
+            if card.name not in name_indexes:
+                name_indexes[card.name] = len(names)
+                names.append(card.name)
+    _write_varint(buffer, len(names))
+    for name in names:
+        _write_string(buffer, name)
+
+    _write_varint(buffer, len(decks))
+    for deck, cards in zip(decks, deck_cards):
+        _write_varint(buffer, deck.character_class)
+        _write_varint(buffer, len(cards))
+        for card in cards:
+            _write_varint(buffer, name_indexes[card.name])
+
+    # Random numbers are packed with the fewest bytes that fit the largest of them
+    largest = max(random_numbers, default=0)
+    width = 1 if largest < 0x100 else 2 if largest < 0x10000 else 4
+    packed = array.array(_RANDOM_TYPES[width], random_numbers)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    _write_varint(buffer, len(random_numbers))
+    buffer.append(width)
+    buffer.extend(packed.tobytes())
+
+    _write_varint(buffer, len(keeps))
+    for keep in keeps:
+        # Keeps read from a text replay are strings, and keep() is a single empty one
+        keep = [int(k) for k in keep if k != '']
+        _write_varint(buffer, len(keep))
+        for k in keep:
+            _write_varint(buffer, k)
+
+    # 0 for no snapshots, which isn't a valid interval
+    _write_varint(buffer, snapshot_interval or 0)
+
+    _write_varint(buffer, action_count)
+    buffer.extend(actions)
+    return buffer
+
+
+def shorten_deck(cards):
+    """
+        Finds the shortest list of cards which gives the deck when repeated, as the deck directive allows.  Mostly for
+        testing, where decks are usually made of a repeating pattern.
+    """
+    for pattern_length in range(1, len(cards)):
+        matched = True
+        for index in range(pattern_length, len(cards)):
+            if type(cards[index % pattern_length]) is not type(cards[index]):
+                matched = False
+                break
+        if matched:
+            return cards[0:pattern_length]
+    return cards
+
+
 class ProxyCharacter:
 
     def __init__(self, character_ref, game=None):
@@ -68,10 +288,10 @@ class ProxyCard:
         self.targetable = False
 
     def set_option(self, option):
-        self.card_ref = ":" + str(option)
+        self.card_ref = str(self.card_ref) + ":" + str(option)
 
     def resolve(self, game):
-        ref = self.card_ref.split(':')
+        ref = str(self.card_ref).split(':')
         if len(ref) > 1:
             game.current_player.agent.next_option = int(ref[1])
         return game.current_player.hand[int(ref[0])]
@@ -106,6 +326,12 @@ class SpellAction(ReplayAction):
             return 'play({0},{1})'.format(self.card.to_output(), self.target.to_output())
         return 'play({0})'.format(self.card.to_output())
 
+    def write_binary(self, buffer):
+        buffer.append(_PLAY | _card_flags(self.card, self.target))
+        _write_card(buffer, self.card)
+        if self.target is not None:
+            _write_character(buffer, self.target.to_output())
+
 
 class MinionAction(ReplayAction):
     def __init__(self, card, index, target=None, game=None):
@@ -121,6 +347,12 @@ class MinionAction(ReplayAction):
             return 'summon({0},{1},{2})'.format(self.card.to_output(), self.index, self.target.to_output())
         return 'summon({0},{1})'.format(self.card.to_output(), self.index)
 
+    def write_binary(self, buffer):
+        buffer.append(_SUMMON | _card_flags(self.card, self.target))
+        _write_card(buffer, self.card)
+        _write_varint(buffer, self.index)
+        if self.target is not None:
+            _write_character(buffer, self.target.to_output())
 
     def play(self, game):
         if self.target is not None:
@@ -128,7 +360,7 @@ class MinionAction(ReplayAction):
 
         game.current_player.agent.next_index = self.index
         game.play_card(self.card.resolve(game))
-        game.current_player.agent.nextIndex = -1
+        game.current_player.agent.next_index = -1
 
 
 class AttackAction(ReplayAction):
@@ -139,6 +371,11 @@ class AttackAction(ReplayAction):
     def to_output_string(self):
             return 'attack({0},{1})'.format(self.character.to_output(), self.target.to_output())
 
+    def write_binary(self, buffer):
+        buffer.append(_ATTACK)
+        _write_character(buffer, self.character.to_output())
+        _write_character(buffer, self.target.to_output())
+
     def play(self, game):
         game.current_player.agent.next_target = self.target.resolve(game)
         self.character.resolve(game).attack()
@@ -160,10 +397,17 @@ class PowerAction(ReplayAction):
         else:
             return 'power()'
 
+    def write_binary(self, buffer):
+        if self.target is not None:
+            buffer.append(_POWER | _HAS_TARGET)
+            _write_character(buffer, self.target.to_output())
+        else:
+            buffer.append(_POWER)
+
     def play(self, game):
         if self.target is not None:
-            game.current_player.agent.next_target = self.target.resolve()
-        self.character.resolve().attack()
+            game.current_player.agent.next_target = self.target.resolve(game)
+        game.current_player.power.use()
         game.current_player.agent.next_target = None
 
 
@@ -174,6 +418,9 @@ class TurnEndAction(ReplayAction):
     def to_output_string(self):
         return 'end()'
 
+    def write_binary(self, buffer):
+        buffer.append(_END)
+
     def play(self, game):
         pass
 
@@ -185,6 +432,9 @@ class ConcedeAction(ReplayAction):
     def to_output_string(self):
         return "concede()"
 
+    def write_binary(self, buffer):
+        buffer.append(_CONCEDE)
+
     def play(self, game):
         game.current_player.die()
 
@@ -194,86 +444,12 @@ class Replay:
     def __init__(self):
         self.actions = []
         self.random_numbers = []
-        self.last_card = None
-        self.card_class = None
-        self.last_target = None
-        self.last_index = None
         self.decks = []
         self.keeps = []
-
-    def save_decks(self, deck1, deck2):
-        self.decks = [deck1, deck2]
-
-    def record_random(self, result):
-        self.random_numbers.append(result)
-
-    def record_turn_end(self, game):
-        self._save_played_card(game)
-        self.actions.append(TurnEndAction())
-
-    def _save_played_card(self, game):
-        if self.last_card is not None:
-            if issubclass(self.card_class, hsgame.game_objects.MinionCard):
-                if self.last_card.targetable:
-                    self.actions.append(MinionAction(self.last_card, self.last_index, self.last_target, game))
-                    self.last_card = None
-                    self.last_index = None
-                    self.last_target = None
-                else:
-                    self.actions.append(MinionAction(self.last_card, self.last_index, game=game))
-                    self.last_card = None
-                    self.last_index = None
-            else:
-                if self.last_card.targetable:
-                    self.actions.append(SpellAction(self.last_card, self.last_target, game))
-                    self.last_card = None
-                    self.last_target = None
-                else:
-                    self.actions.append(SpellAction(self.last_card, game=game))
-                    self.last_card = None
-
-    def record_card_played(self, card, game):
-        self._save_played_card(game)
-        self.last_card = ProxyCard(card, game)
-        self.last_card.targetable = card.targetable
-        self.card_class = type(card)
-
-    def record_option_chosen(self, option, game):
-        self.last_card.set_option(option)
-
-    def record_attack(self, target, attacker, game):
-        self._save_played_card(game)
-        self.actions.append(AttackAction(attacker, target, game))
-
-    def record_power(self, game):
-        self._save_played_card(game)
-        self.actions.append(PowerAction(game=game))
-
-    def record_power_target(self, target, game):
-        self.actions[len(self.actions) - 1].target = ProxyCharacter(target, game)
-
-    def record_kept_index(self, cards, card_index, game):
-        k_arr = []
-        for index in range(0, len(cards)):
-            if card_index[index]:
-                k_arr.append(index)
-        self.keeps.append(k_arr)
+        # How many turns apart a SavedGame playing this replay takes snapshots, None for no snapshots
+        self.snapshot_interval = None
 
     def write_replay(self, file):
-
-        # Mostly for testing, this function will check if the deck is made up of a repeating pattern
-        # and if so, shorten the output, since the parser will generate the pattern from a shorter sample
-        def shorten_deck(cards):
-            for pattern_length in range(1, 15):
-                matched = True
-                for index in range(pattern_length, 30):
-                    if type(cards[index % pattern_length]) is not type(cards[index]):
-                        matched = False
-                        break
-                if matched:
-                    return cards[0:pattern_length]
-
-
         if 'write' not in dir(file):
             writer = open(file, 'w')
         else:
@@ -298,6 +474,9 @@ class Replay:
             writer.write(",".join([str(k) for k in keep]))
             writer.write(")\n")
 
+        if self.snapshot_interval is not None:
+            writer.write("snapshot({0})\n".format(self.snapshot_interval))
+
         for action in self.actions:
             writer.write(action.to_output_string() + "\n")
 
@@ -305,182 +484,575 @@ class Replay:
 
         if 'read' not in dir(replayfile):
             replayfile = open(replayfile, 'r')
-        line_pattern = re.compile("\s*(\w*)\s*\(([^)]*)\)\s*(;.*)?$")
         for line in replayfile:
-            (action, args) = line_pattern.match(line).group(1, 2)
-            args = [arg.strip() for arg in args.split(",")]
-            if action == 'play':
-                card = args[0]
-                if len(args) > 1:
-                    target = args[1]
-                else:
-                    target = None
-                self.actions.append(SpellAction(ProxyCard(card), target))
-
-            elif action == 'summon':
-                card = args[0]
-
-                index = int(args[1])
+            (action, args) = _parse_line(line)
+            if action in _HEADER_DIRECTIVES:
+                self._parse_header(action, args)
+            else:
+                replay_action = _parse_action(action, args)
+                if replay_action is not None:
+                    self.actions.append(replay_action)
+        replayfile.close()
+        self._default_keeps()
+
+    def _default_keeps(self):
+        # Replays without keep directives keep every card of both opening hands
+        if len(self.keeps) == 0:
+            self.keeps = [[0, 1, 2], [0, 1, 2, 3]]
+
+    def _parse_header(self, action, args):
+        if action == 'random':
+            if len(self.random_numbers) > 0:
+                raise ReplayException("Only one random number list per file")
+            if len(args[0]) > 0:
+                self.random_numbers = [int(num) for num in args]
+            else:
+                self.random_numbers = []
+        elif action == 'deck':
+            if len(self.decks) > 1:
+                raise ReplayException("Maximum of two decks per file")
+            deck_size = len(args) - 1
+            card_types = [hsgame.game_objects.card_registry.card_type(name) for name in args[1:]]
+            cards = [card_types[index % deck_size]() for index in range(0, 30)]
+            self.decks.append(hsgame.game_objects.Deck(cards, hsgame.constants.CHARACTER_CLASS.from_str(args[0])))
+
+        elif action == 'keep':
+            if len(self.keeps) > 1:
+                raise ReplayException("Maximum of two keep directives per file")
+            self.keeps.append(args)
+
+        elif action == 'snapshot':
+            if self.snapshot_interval is not None:
+                raise ReplayException("Only one snapshot directive per file")
+            self.snapshot_interval = int(args[0])
+            if self.snapshot_interval < 1:
+                raise ReplayException("Snapshots must be at least one turn apart")
+
+    def write_binary_replay(self, file):
+        """
+            Writes the replay in the binary format, which holds exactly what the text format does in fewer bytes, and
+            is quicker to read back.  See replay_format.md.
+
+            @file: the name of the file to write, or a file opened in binary mode
+        """
+        # The actions of a replay from read_replays are an iterator, and the count has to be known first
+        actions = list(self.actions)
+        action_buffer = bytearray()
+        for action in actions:
+            action.write_binary(action_buffer)
+        buffer = _binary_replay(self.decks, self.random_numbers, self.keeps, self.snapshot_interval, len(actions),
+                                action_buffer)
 
-                if len(args) > 2:
-                    target = args[2]
+        if 'write' not in dir(file):
+            with open(file, 'wb') as writer:
+                writer.write(buffer)
+        else:
+            file.write(buffer)
+
+    def parse_binary_replay(self, replayfile):
+        """
+            Reads a replay written by write_binary_replay
+
+            @replayfile: the name of the file to read, a file opened in binary mode, or the contents as bytes
+        """
+        if isinstance(replayfile, (bytes, bytearray, memoryview)):
+            data = bytes(replayfile)
+        elif 'read' not in dir(replayfile):
+            with open(replayfile, 'rb') as file:
+                data = file.read()
+        else:
+            data = replayfile.read()
+            replayfile.close()
+
+        if data[0:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ReplayException("Not a binary replay")
+        version = data[len(BINARY_MAGIC)] if len(data) > len(BINARY_MAGIC) else None
+        if version not in range(1, BINARY_VERSION + 1):
+            raise ReplayException("Unsupported binary replay version: {0}".format(version))
+
+        reader = _BinaryReader(data)
+        reader.position = len(BINARY_MAGIC) + 1
+        try:
+            self._read_binary(reader, version)
+        except IndexError:
+            raise ReplayException("Binary replay ended early")
+        if reader.position != len(data):
+            raise ReplayException("Unexpected data at the end of the binary replay")
+
+    def _read_binary(self, reader, version):
+        registry = hsgame.game_objects.card_registry
+        card_types = [registry.card_type(reader.string()) for index in range(0, reader.varint())]
+
+        deck_count = reader.varint()
+        if deck_count > 2:
+            raise ReplayException("Maximum of two decks per file")
+        for deck_index in range(0, deck_count):
+            character_class = reader.varint()
+            deck_types = [card_types[reader.varint()] for index in range(0, reader.varint())]
+            cards = [deck_types[index % len(deck_types)]() for index in range(0, 30)]
+            self.decks.append(hsgame.game_objects.Deck(cards, character_class))
+
+        count = reader.varint()
+        width = reader.varint()
+        if width not in _RANDOM_TYPES:
+            raise ReplayException("Unsupported random number size: {0}".format(width))
+        random_numbers = array.array(_RANDOM_TYPES[width])
+        if random_numbers.itemsize != width:
+            # The native size of the type is bigger than the stored one, so the numbers are read one at a time
+            packed = reader.bytes(count * width)
+            self.random_numbers = [int.from_bytes(packed[index:index + width], "little")
+                                   for index in range(0, len(packed), width)]
+        else:
+            random_numbers.frombytes(reader.bytes(count * width))
+            if sys.byteorder != "little":
+                random_numbers.byteswap()
+            self.random_numbers = random_numbers.tolist()
+
+        keep_count = reader.varint()
+        if keep_count > 2:
+            raise ReplayException("Maximum of two keep directives per file")
+        self.keeps = [[reader.varint() for index in range(0, reader.varint())] for keep in range(0, keep_count)]
+
+        # Version 1 had no snapshot interval
+        if version >= 2:
+            self.snapshot_interval = reader.varint() or None
+
+        for index in range(0, reader.varint()):
+            code = reader.varint()
+            action = code & 7
+            if action == _PLAY:
+                card = reader.card(code)
+                target = reader.character() if code & _HAS_TARGET else None
+                self.actions.append(SpellAction(card, target))
+            elif action == _SUMMON:
+                card = reader.card(code)
+                board_index = reader.varint()
+                target = reader.character() if code & _HAS_TARGET else None
+                self.actions.append(MinionAction(card, board_index, target))
+            elif action == _ATTACK:
+                self.actions.append(AttackAction(reader.character(), reader.character()))
+            elif action == _POWER:
+                if code & _HAS_TARGET:
+                    self.actions.append(PowerAction(reader.character()))
                 else:
-                    target = None
-
-                self.actions.append(MinionAction(ProxyCard(card), index, target))
-            elif action == 'attack':
-                self.actions.append(AttackAction(args[0], args[1]))
-            elif action == 'power':
-                if len(args) > 0:
-                    self.actions.append(PowerAction(args[0]))
-            elif action == 'end':
+                    self.actions.append(PowerAction())
+            elif action == _END:
                 self.actions.append(TurnEndAction())
-            elif action == 'random':
-                if len(self.random_numbers) > 0:
-                    raise ReplayException("Only one random number list per file")
-                if len(args[0]) > 0:
-                    self.random_numbers = [int(num) for num in args]
-                else:
-                    self.random_numbers = []
-            elif action == 'deck':
-                if len(self.decks) > 1:
-                    raise ReplayException("Maximum of two decks per file")
-                deck_size = len(args) - 1
-                cards = [hsgame.game_objects.card_lookup(args[1 + index % (deck_size)]) for index in range(0, 30)]
-                self.decks.append(hsgame.game_objects.Deck(cards, hsgame.constants.CHARACTER_CLASS.from_str(args[0])))
-
-            elif action == 'keep':
-                if len(self.keeps) > 1:
-                    raise ReplayException("Maximum of two keep directives per file")
-                self.keeps.append(args)
-
-            elif action == 'concede':
+            elif action == _CONCEDE:
                 self.actions.append(ConcedeAction())
-        replayfile.close()
-        if len(self.keeps) is 0:
-            self.keeps = [[0,1,2],[0,1,2,3]]
+            else:
+                raise ReplayException("Unknown action code: {0}".format(code))
+
+        self._default_keeps()
+
+def read_replays(replay_file):
+    """
+        Reads the replays from a file made of text replays one after the other, such as a log of many games.  Each
+        replay starts at a deck directive which comes after the actions of the one before.  Blank lines are skipped.
+
+        The replays are read as they are needed, and the actions of each replay are read as they are needed too, so
+        memory use doesn't depend on the size of the file.  Each replay's actions attribute is an iterator rather than
+        a list, and can only be gone through once.  Any actions left unread are skipped when the next replay is read.
+        A replay can be played without reading its actions first by passing it to SavedGame.
+
+        @replay_file: the name of the file to read, or an open file or other iterable of lines
+        @return: a generator of Replay
+    """
+    if isinstance(replay_file, str):
+        replay_file = open(replay_file, 'r')
+
+    def directives():
+        for line in replay_file:
+            if line.strip() != '':
+                yield _parse_line(line)
+
+    lines = directives()
+    pending = next(lines, None)
+
+    def actions():
+        nonlocal pending
+        while pending is not None and pending[0] not in _HEADER_DIRECTIVES:
+            replay_action = _parse_action(*pending)
+            pending = next(lines, None)
+            if replay_action is not None:
+                yield replay_action
+
+    try:
+        while pending is not None:
+            replay = Replay()
+            while pending is not None and pending[0] in _HEADER_DIRECTIVES:
+                if pending[0] == 'deck' and len(replay.decks) == 2:
+                    break
+                replay._parse_header(*pending)
+                pending = next(lines, None)
+            replay._default_keeps()
 
-class RecordingGame(hsgame.game_objects.Game):
+            replay.actions = actions()
+            yield replay
+            for unread in replay.actions:
+                pass
+    finally:
+        if 'close' in dir(replay_file):
+            replay_file.close()
 
-    def __init__(self, decks, agents):
-        game = self
 
-        class RecordingAgent:
+def _character_code(character, game):
+    # The number a character is written as in the binary format, see _write_character
+    if type(character) is hsgame.game_objects.Minion:
+        return (0 if character.player is game.players[0] else 1) + (character.index + 1) * 2
+    return 0 if character is game.players[0] else 1
 
-            __slots__ = ['agent']
 
-            def __init__(self, proxied_agent):
-                object.__setattr__(self, "agent", proxied_agent)
+class RecordingAgent:
+    """
+        Passes on the game's calls to an agent, noting the choices the replay needs.  The calls the game makes are
+        written out, so that only other attributes, such as those set by replay actions, go through __getattr__ and
+        __setattr__.
+    """
 
-            def choose_index(self, card):
-                index = self.agent.choose_index(card)
-                game.replay.last_index = index
-                return index
+    __slots__ = ['agent', 'game']
 
-            def choose_target(self, targets):
-                target = self.agent.choose_target(targets)
-                game.replay.last_target = target
-                return target
+    def __init__(self, proxied_agent, game):
+        object.__setattr__(self, "agent", proxied_agent)
+        object.__setattr__(self, "game", game)
 
-            def choose_option(self, *options):
-                option = self.agent.choose_option(options)
+    def do_card_check(self, cards):
+        return self.agent.do_card_check(cards)
 
-                game.replay.record_option_chosen(options.index(option))
-                return option
+    def do_turn(self, player):
+        return self.agent.do_turn(player)
 
+    def set_game(self, game):
+        self.agent.set_game(game)
 
-            def __getattr__(self, item):
-                return self.agent.__getattribute__(item)
+    def choose_index(self, card):
+        index = self.agent.choose_index(card)
+        self.game.last_index = index
+        return index
 
-            def __setattr__(self, key, value):
-                setattr(self.__getattribute__("agent"), key, value)
+    def choose_target(self, targets):
+        target = self.agent.choose_target(targets)
+        # Found now, before the card being played changes where the target is on the board.  Only the player whose
+        # turn it is chooses targets for the card they are playing.
+        if self.game.current_player.agent is self:
+            self.game.last_target = _character_code(target, self.game)
+        return target
 
-        def bind_attacks(character):
-            character.bind('attack_minion', self.replay.record_attack, character, self)
-            character.bind('attack_player', self.replay.record_attack, character, self)
+    def choose_option(self, *options):
+        option = self.agent.choose_option(*options)
+        self.game.last_option = options.index(option)
+        return option
 
-        self.replay = hsgame.replay.Replay()
-        agents = [RecordingAgent(agents[0]), RecordingAgent(agents[1])]
+    def __getattr__(self, item):
+        return getattr(self.agent, item)
 
-        super().__init__(decks, agents, self._find_random)
+    def __setattr__(self, key, value):
+        setattr(self.agent, key, value)
 
-        self.replay.save_decks(*decks)
 
-        self.bind("minion_added", bind_attacks)
+class RecordingGame(hsgame.game_objects.Game):
+    """
+        A game which records a replay of itself as it is played.
+
+        The actions are written straight into a buffer in the binary replay format, and the random numbers into an
+        array, instead of building a replay object for each action.  The replay is only put together when it is asked
+        for, or given to the sink when the game finishes.
+    """
+
+    def __init__(self, decks, agents, sink=None, random=randint):
+        """
+            @decks, agents, random: as for Game.  The numbers are recorded as they are used, so the replay plays back the
+            same whichever source of random numbers the game had, e.g. a hsgame.game_random.GameRandom.
+            @sink: a function which is given the replay, in the binary format, when the game has finished.  For
+            instance, ReplayCorpus.append_raw, or the write method of a file opened in binary mode.
+        """
+        self.sink = sink
+        self._random = random.randint if hasattr(random, "randint") else random
+        self.replay_decks = list(decks)
+        # Random numbers are kept as shorts, and switched to a bigger type if one doesn't fit
+        self.random_numbers = array.array('H')
+        self._record_random = self.random_numbers.append
+        self.keeps = []
+        self.actions = bytearray()
+        self.action_count = 0
+
+        # The card or power being used isn't written until its choices are known
+        self.pending = None
+        self.pending_card = None
+        self.last_index = None
+        self.last_target = None
+        self.last_option = None
+        # Only set when the power needs a target, unlike last_target, which is set for attacks too
+        self.power_target = None
+
+        super().__init__(decks, [RecordingAgent(agents[0], self), RecordingAgent(agents[1], self)], self._find_random)
 
-        self.bind("kept_cards", self.replay.record_kept_index, self)
+        self.bind("kept_cards", self._record_keep)
+        # Attacks are found through the game's events, rather than binding to every minion as it is added
+        for event in ["minion_on_minion_attack", "minion_on_player_attack", "player_on_minion_attack",
+                      "player_on_player_attack"]:
+            self.bind(event, self._record_attack)
 
         for player in self.players:
-            player.bind("turn_ended", self.replay.record_turn_end, self)
-            player.bind("used_power", self.replay.record_power, self)
-            player.bind("found_power_target", self.replay.record_power_target, self)
-            player.bind("card_played", self.replay.record_card_played, self)
-            bind_attacks(player)
+            player.bind("turn_ended", self._record_turn_end)
+            player.bind("used_power", self._record_power)
+            player.bind("found_power_target", self._record_power_target)
+            player.bind("card_played", self._record_card_played)
 
     def _find_random(self, lower_bound, upper_bound):
-        result = randint(lower_bound, upper_bound)
-        self.replay.record_random(result)
+        result = self._random(lower_bound, upper_bound)
+        try:
+            self._record_random(result)
+        except OverflowError:
+            self.random_numbers = array.array('L', self.random_numbers)
+            self._record_random = self.random_numbers.append
+            self._record_random(result)
         return result
 
+    def _write_pending(self):
+        pending = self.pending
+        if pending is None:
+            return
+        self.pending = None
+        buffer = self.actions
+        self.action_count += 1
+
+        if pending == _POWER:
+            if self.power_target is not None:
+                buffer.append(_POWER | _HAS_TARGET)
+                _write_varint(buffer, self.power_target)
+            else:
+                buffer.append(_POWER)
+            return
 
-class SavedGame(hsgame.game_objects.Game):
+        target = self.last_target
+        code = pending
+        if target is not None:
+            code |= _HAS_TARGET
+        if self.last_option is not None:
+            code |= _HAS_OPTION
+        buffer.append(code)
+        _write_varint(buffer, self.pending_card)
+        if self.last_option is not None:
+            _write_varint(buffer, self.last_option)
+        if pending == _SUMMON:
+            _write_varint(buffer, self.last_index)
+        if target is not None:
+            _write_varint(buffer, target)
+
+    def _record_card_played(self, card):
+        self._write_pending()
+        hand = self.current_player.hand
+        for index in range(0, len(hand)):
+            if hand[index] is card:
+                self.pending_card = index
+                break
+        else:
+            raise ReplayException("Could not find card in hand")
+        self.pending = _PLAY if card.is_spell() else _SUMMON
+        # Set by RecordingAgent.choose_target if the card asks for a target, including cards such as Starfall which
+        # only ask for one with some of their options
+        self.last_target = None
+        self.last_option = None
+
+    def play_card(self, card):
+        super().play_card(card)
+        # Every choice for the card is made while it is played, and anything chosen later is for something else
+        self._write_pending()
+
+    def _record_power(self):
+        self._write_pending()
+        self.pending = _POWER
+        self.power_target = None
+
+    def _record_power_target(self, target):
+        self.power_target = _character_code(target, self)
+
+    def _record_attack(self, attacker, target):
+        self._write_pending()
+        self.actions.append(_ATTACK)
+        _write_varint(self.actions, _character_code(attacker, self))
+        _write_varint(self.actions, _character_code(target, self))
+        self.action_count += 1
+
+    def _record_turn_end(self):
+        self._write_pending()
+        self.actions.append(_END)
+        self.action_count += 1
+
+    def _record_keep(self, cards, card_index):
+        self.keeps.append([index for index in range(0, len(cards)) if card_index[index]])
+
+    def replay_bytes(self):
+        """
+            The replay so far in the binary format.  A hero power used last is only included once the game has
+            finished or another action has been taken, since until then its target might not have been chosen.
+        """
+        return bytes(_binary_replay(self.replay_decks, self.random_numbers, self.keeps, None, self.action_count,
+                                    self.actions))
+
+    @property
+    def replay(self):
+        """
+            The replay so far, as a Replay.  It is read from replay_bytes each time.
+        """
+        replay = Replay()
+        replay.parse_binary_replay(self.replay_bytes())
+        return replay
 
-    def __init__(self, replay_file):
+    def start(self):
+        super().start()
+        self._write_pending()
+        if self.sink is not None:
+            self.sink(self.replay_bytes())
 
-        replay = Replay()
-        replay.parse_replay(replay_file)
 
-        action_index = 0
-        random_index = 0
-        game_ref = self
-        k_index = 0
+class _ReplaySource:
+    """
+        The parts of a SavedGame which don't change as it is played: the replay being played and the snapshots taken
+        of the game.  Every copy of the game shares the same source, which Game.clone leaves alone.
+    """
+    def __init__(self, replay):
+        self.replay = replay
+        self.actions = replay.actions
+        if not isinstance(self.actions, list):
+            self.actions = iter(self.actions)
+        # Turn number -> copy of the game after that many turns
+        self.snapshots = {}
 
-        def replay_random(start, end):
-            nonlocal random_index
-            random_index += 1
-            return replay.random_numbers[random_index - 1]
+    def __deepcopy__(self, memo):
+        return self
 
-        def null_random(start, end):
-            return 0
 
-        class ReplayAgent:
+class ReplayAgent:
+
+    def __init__(self, game):
+        self.game = game
+        self.next_target = None
+        self.next_index = -1
+        self.next_option = None
+
+    def do_card_check(self, cards):
+        keep_arr = [False] * len(cards)
+        for index in self.game.source.replay.keeps[self.game.keep_index]:
+            keep_arr[int(index)] = True
+        self.game.keep_index += 1
+        return keep_arr
+
+    def do_turn(self, player):
+        while True:
+            action = self.game.next_action()
+            if action is None or player.dead or type(action) is TurnEndAction:
+                break
+            action.play(self.game)
+
+    def set_game(self, game):
+        self.game = game
 
-            def __init__(self):
-                self.next_target = None
-                self.next_index = -1
-                self.next_option = None
+    def choose_target(self, targets):
+        return self.next_target
 
-            def do_card_check(self, cards):
-                nonlocal k_index
-                keep_arr = [False] * len(cards)
-                for index in replay.keeps[k_index]:
-                    keep_arr[int(index)] = True
-                k_index += 1
-                return keep_arr
+    def choose_index(self, card):
+        return self.next_index
 
-            def do_turn(self, player):
-                nonlocal action_index
-                while action_index < len(replay.actions) and not player.dead and type(replay.actions[action_index]) is not hsgame.replay.TurnEndAction:
-                    replay.actions[action_index].play(game_ref)
-                    action_index += 1
+    def choose_option(self, *options):
+        return options[self.next_option]
 
-                action_index += 1
 
-            def set_game(self, game):
-                pass
+class SavedGame(hsgame.game_objects.Game):
 
-            def choose_target(self, targets):
-                return self.next_target
+    def __init__(self, replay_file, snapshot_interval=None):
+        """
+            @replay_file: the name of a replay file, an open replay file, or a Replay.  The replay's actions are played
+            as they are read, so a Replay from read_replays is played without reading all of its actions first.
+            @snapshot_interval: int, take a copy of the game every this many turns, so that seek can start from the
+            nearest one.  Defaults to the replay's snapshot directive, if it has one.
+        """
 
-            def choose_index(self, card):
-                return self.next_index
+        if isinstance(replay_file, Replay):
+            replay = replay_file
+        else:
+            replay = Replay()
+            replay.parse_replay(replay_file)
 
-            def choose_option(self, *options):
-                return options[self.next_option]
+        self.source = _ReplaySource(replay)
+        self.snapshot_interval = snapshot_interval or replay.snapshot_interval
+        # The number of actions, random numbers and keeps used so far, and turns played
+        self.action_index = 0
+        self.random_index = 0
+        self.keep_index = 0
+        self.turn = 0
 
         if len(replay.random_numbers) is 0:
-            random_func = null_random
+            random_func = self._null_random
         else:
-            random_func = replay_random
-
-        super().__init__(replay.decks, [ReplayAgent(), ReplayAgent()], random_func)
\ No newline at end of file
+            random_func = self._replay_random
+
+        super().__init__(replay.decks, [ReplayAgent(self), ReplayAgent(self)], random_func)
+
+    def _replay_random(self, start, end):
+        self.random_index += 1
+        return self.source.replay.random_numbers[self.random_index - 1]
+
+    def _null_random(self, start, end):
+        return 0
+
+    def next_action(self):
+        """
+            The next action of the replay, or None once they have all been played
+        """
+        actions = self.source.actions
+        self.action_index += 1
+        if type(actions) is list:
+            if self.action_index > len(actions):
+                return None
+            return actions[self.action_index - 1]
+        return next(actions, None)
+
+    def start(self):
+        self.pre_game()
+        self.current_player = self.players[1]
+        self._take_snapshot()
+        while not self.game_ended:
+            self.play_single_turn()
+
+    def play_single_turn(self):
+        super().play_single_turn()
+        self.turn += 1
+        self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshots = self.source.snapshots
+        if self.snapshot_interval is not None and self.turn % self.snapshot_interval == 0 \
+                and self.turn not in snapshots:
+            snapshots[self.turn] = self.clone()
+
+    def seek(self, turn):
+        """
+            Finds the state of the game after the given number of turns.  It is a copy of the nearest snapshot before
+            that turn, played forward, so this game and its snapshots aren't changed.  Use play_single_turn to carry
+            on playing the copy.
+
+            The whole game is played first if it hasn't been already, and snapshots are taken as it is, so the first
+            seek is as slow as playing the replay.  Snapshots are only kept in memory, by this game and its copies, so
+            each new SavedGame of a replay pays for that first seek again.  The replay's actions have to be a list
+            rather than streamed.
+
+            @turn: int, the number of turns played.  0 is after the cards to keep have been chosen, before the first
+            turn.  If the game ended before then, the state at its end is returned.
+            @return: SavedGame
+        """
+        if turn < 0:
+            raise ReplayException("Can't seek to turn {0}, turns start at 0".format(turn))
+        if self.snapshot_interval is None:
+            raise ReplayException("Seeking needs snapshots, but no snapshot interval was given")
+        if type(self.source.actions) is not list:
+            raise ReplayException("Seeking needs all of the replay's actions, but they are being streamed")
+        if len(self.source.snapshots) == 0:
+            self.start()
+
+        nearest = max([snapshot_turn for snapshot_turn in self.source.snapshots if snapshot_turn <= turn])
+        game = self.source.snapshots[nearest].clone()
+        while game.turn < turn and not game.game_ended:
+            game.play_single_turn()
+        return game
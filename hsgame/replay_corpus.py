@@ -0,0 +1,194 @@
+import mmap
+import os
+import struct
+
+from hsgame.replay import Replay, ReplayException, BINARY_MAGIC
+
+__author__ = 'Daniel'
+
+INDEX_MAGIC = b"HSRI"
+INDEX_VERSION = 1
+
+_HEADER_SIZE = len(INDEX_MAGIC) + 1
+_OFFSET = struct.Struct("<Q")
+
+
+def _map(path):
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ReplayCorpus:
+    """
+        A collection of replays kept in two files: a data file with the replays one after the other in the binary
+        format, and an index file (the data file's name with .idx added) with the offset where each replay ends.
+        Replays can only be added to the end.
+
+        Both files are memory mapped, so getting a replay by its position, or going through all of them, reads
+        straight from the mapping rather than seeking and reading the files, and the index doesn't have to be loaded.
+        A replay is only in the corpus once its offset has been written to the index, so anything left at the end of
+        the data file by an append that didn't finish is ignored, and written over by the next one.
+
+        Questions about what happened in a game are answered by playing the replays, for example:
+
+            def innervate_on_turn_one(replay):
+                game = SavedGame(replay)
+                turns = []
+                played = []
+                game.players[0].bind("turn_started", lambda: turns.append(True))
+                game.players[0].bind("card_played", lambda card: played.append((len(turns), card.name)))
+                game.start()
+                return (1, "Innervate") in played
+
+            matches = list(corpus.find(innervate_on_turn_one))
+    """
+    def __init__(self, path):
+        """
+            @path: the name of the data file.  The files are created if they don't exist.
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, 'wb') as index_file:
+                index_file.write(INDEX_MAGIC + bytes([INDEX_VERSION]))
+        if not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+
+        self._data = None
+        self._index = None
+        self._data_writer = None
+        self._index_writer = None
+        self._open_maps()
+        if self._index[0:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            self.close()
+            raise ReplayException("Not a replay corpus index: " + self.index_path)
+        if self._index[len(INDEX_MAGIC)] != INDEX_VERSION:
+            version = self._index[len(INDEX_MAGIC)]
+            self.close()
+            raise ReplayException("Unsupported replay corpus version: {0}".format(version))
+
+    def _open_maps(self):
+        self._close_maps()
+        self._data = _map(self.path)
+        self._index = _map(self.index_path)
+        self._length = (len(self._index) - _HEADER_SIZE) // _OFFSET.size
+        self._data_end = self._end(self._length - 1)
+        self._stale = False
+
+    def _close_maps(self):
+        for mapped in [self._data, self._index]:
+            if mapped is not None:
+                mapped.close()
+        self._data = None
+        self._index = None
+
+    def _check_maps(self):
+        if self._stale:
+            self._open_maps()
+
+    def _end(self, index):
+        if index < 0:
+            return 0
+        return _OFFSET.unpack_from(self._index, _HEADER_SIZE + index * _OFFSET.size)[0]
+
+    def __len__(self):
+        return self._length
+
+    def raw(self, index):
+        """
+            The bytes of a replay in the binary format
+        """
+        self._check_maps()
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Replay index out of range")
+        return self._data[self._end(index - 1):self._end(index)]
+
+    def __getitem__(self, index):
+        replay = Replay()
+        replay.parse_binary_replay(self.raw(index))
+        return replay
+
+    def __iter__(self):
+        for index in range(0, len(self)):
+            yield self[index]
+
+    def find(self, predicate):
+        """
+            Goes through every replay in the corpus and yields the index of each one the predicate is true for
+
+            @predicate: a function taking a Replay and returning a bool
+        """
+        for index in range(0, len(self)):
+            if predicate(self[index]):
+                yield index
+
+    def append(self, replay):
+        """
+            Adds a replay to the end of the corpus
+
+            @replay: Replay
+            @return: int, the index of the new replay
+        """
+        return self.extend([replay]) - 1
+
+    def extend(self, replays):
+        """
+            Adds replays to the end of the corpus, for instance all those read from a log by read_replays
+
+            @replays: iterable of Replay
+            @return: int, the number of replays in the corpus afterwards
+        """
+        return self._extend(replays, Replay.write_binary_replay)
+
+    def append_raw(self, data):
+        """
+            Adds a replay which is already in the binary format, such as one given to the sink of a RecordingGame
+
+            @data: bytes
+            @return: int, the index of the new replay
+        """
+        if data[0:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ReplayException("Not a binary replay")
+        return self._extend([data], lambda replay, file: file.write(replay)) - 1
+
+    def _extend(self, replays, write):
+        # The files are only mapped again when a replay is next read, so adding replays one at a time stays cheap
+        if self._data_writer is None:
+            self._data_writer = open(self.path, 'r+b')
+            self._index_writer = open(self.index_path, 'r+b')
+        length = self._length
+        self._data_writer.seek(self._data_end)
+        self._index_writer.seek(_HEADER_SIZE + length * _OFFSET.size)
+        ends = bytearray()
+        for replay in replays:
+            write(replay, self._data_writer)
+            ends.extend(_OFFSET.pack(self._data_writer.tell()))
+            length += 1
+        self._data_writer.truncate()
+        # The replays have to be in the data file before the index says they are there
+        self._data_writer.flush()
+        self._index_writer.write(ends)
+        self._index_writer.truncate()
+        self._index_writer.flush()
+        self._length = length
+        self._data_end = self._data_writer.tell()
+        self._stale = True
+        return length
+
+    def close(self):
+        self._close_maps()
+        for writer in [self._data_writer, self._index_writer]:
+            if writer is not None:
+                writer.close()
+        self._data_writer = None
+        self._index_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
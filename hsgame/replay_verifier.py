@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sys
+import time
+
+from hsgame.replay import SavedGame, read_replays
+from hsgame.replay_corpus import ReplayCorpus
+
+__author__ = 'Daniel'
+
+# The number of replays from a corpus verified by each task
+CORPUS_SHARD_SIZE = 500
+
+
+class ReplayDigest:
+    def __init__(self, key, turns, health, board, error=None):
+        """
+            @key: string, which replay this is: the file it came from and its position in the file, as path#index
+            @turns: int, the number of turns started in the game
+            @health: string, the health and armour of each player at the end, in play order
+            @board: string, a hash of the minions on each side of the board and the size of each hand at the end
+            @error: string, the message of the exception that stopped the replay, if any
+        """
+        self.key = key
+        self.turns = turns
+        self.health = health
+        self.board = board
+        self.error = error
+
+    def fields(self):
+        return [("turns", str(self.turns)), ("health", self.health), ("board", self.board),
+                ("error", self.error or "")]
+
+    def to_line(self):
+        return "\t".join([self.key] + [value for name, value in self.fields()]) + "\n"
+
+    @staticmethod
+    def from_line(line):
+        key, turns, health, board, error = line.rstrip("\n").split("\t")
+        return ReplayDigest(key, int(turns), health, board, error or None)
+
+
+def replay_digest(key, replay):
+    """
+        Plays a replay and records the state the game finished in
+    """
+    game = SavedGame(replay)
+    turns = 0
+
+    def turn_started():
+        nonlocal turns
+        turns += 1
+
+    for player in game.players:
+        player.bind("turn_started", turn_started)
+
+    try:
+        game.start()
+    except Exception as e:
+        # Kept to one line, for the baseline file
+        error = " ".join("{0}: {1}".format(type(e).__name__, e).split())
+        return ReplayDigest(key, turns, "", "", error)
+
+    health = ",".join("{0}+{1}".format(player.health, player.armour) for player in game.players)
+    board = hashlib.sha1()
+    for player in game.players:
+        board.update("{0}|".format(len(player.hand)).encode("utf-8"))
+        for minion in player.minions:
+            board.update("{0},{1},{2},{3};".format(minion.card.name, minion.attack_power, minion.defense,
+                                                   minion.max_defense).encode("utf-8"))
+        board.update(b"/")
+    return ReplayDigest(key, turns, health, board.hexdigest()[0:16])
+
+
+def _is_corpus(path):
+    return os.path.exists(path + ".idx")
+
+
+def verify_file(path, start=None, stop=None):
+    """
+        Plays the replays in a file and returns their digests
+
+        @path: a text file of one or more replays, or the data file of a ReplayCorpus
+        @start, stop: for a corpus, the range of replays to play.  Defaults to all of them.
+    """
+    digests = []
+    if _is_corpus(path):
+        with ReplayCorpus(path) as corpus:
+            for index in range(start or 0, len(corpus) if stop is None else stop):
+                digests.append(replay_digest("{0}#{1}".format(path, index), corpus[index]))
+    else:
+        for index, replay in enumerate(read_replays(path)):
+            digests.append(replay_digest("{0}#{1}".format(path, index), replay))
+    return digests
+
+
+def _verify_task(task):
+    return verify_file(*task)
+
+
+def _tasks(paths):
+    # Text files are verified whole, and corpora in shards so that a big corpus is spread over the workers
+    for path in paths:
+        if _is_corpus(path):
+            with ReplayCorpus(path) as corpus:
+                length = len(corpus)
+            for start in range(0, length, CORPUS_SHARD_SIZE):
+                yield path, start, min(start + CORPUS_SHARD_SIZE, length)
+        else:
+            yield path, None, None
+
+
+class VerificationResult:
+    def __init__(self):
+        self.digests = {}
+        # (key, field, expected value, actual value) for each field which doesn't match the baseline
+        self.divergences = []
+        # Replays which aren't in the baseline
+        self.unknown = []
+        self.elapsed = 0
+
+    def add(self, digest, baseline):
+        self.digests[digest.key] = digest
+        if baseline is None:
+            return
+        if digest.key not in baseline:
+            self.unknown.append(digest.key)
+            return
+        for (name, expected), (actual_name, actual) in zip(baseline[digest.key].fields(), digest.fields()):
+            if expected != actual:
+                self.divergences.append((digest.key, name, expected, actual))
+
+    def diverged(self):
+        return sorted(set(key for key, name, expected, actual in self.divergences))
+
+    def errors(self):
+        return sorted(key for key, digest in self.digests.items() if digest.error is not None)
+
+    def write_report(self, writer):
+        writer.write("{0} replays, {1} diverged, {2} failed, {3} not in the baseline".format(
+            len(self.digests), len(self.diverged()), len(self.errors()), len(self.unknown)))
+        if self.elapsed > 0:
+            writer.write(" in {0:.2f}s ({1:.1f} replays/sec)".format(self.elapsed, len(self.digests) / self.elapsed))
+        writer.write("\n")
+        for key, name, expected, actual in sorted(self.divergences):
+            writer.write("{0}: {1} was {2!r}, now {3!r}\n".format(key, name, expected, actual))
+        for key in self.errors():
+            writer.write("{0} failed: {1}\n".format(key, self.digests[key].error))
+
+
+def read_baseline(file):
+    """
+        Reads digests written by write_baseline
+
+        @return: dictionary from replay key to ReplayDigest
+    """
+    baseline = {}
+    with open(file, "r") as reader:
+        for line in reader:
+            if line.strip() != "":
+                digest = ReplayDigest.from_line(line)
+                baseline[digest.key] = digest
+    return baseline
+
+
+def write_baseline(digests, file):
+    with open(file, "w") as writer:
+        for key in sorted(digests):
+            writer.write(digests[key].to_line())
+
+
+def verify_replays(paths, baseline=None, processes=None):
+    """
+        Plays every replay in the given files and compares the state each game ended in with a baseline.
+
+        @paths: list of files, each either text replays or a ReplayCorpus data file
+        @baseline: dictionary from replay key to ReplayDigest, as returned by read_baseline.  If None, the digests are
+        only recorded.
+        @processes: int, the number of worker processes.  Defaults to the number of CPUs.  With 1, the replays are
+        played in this process
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    result = VerificationResult()
+    tasks = list(_tasks(paths))
+    start = time.perf_counter()
+    if processes == 1:
+        for task in tasks:
+            for digest in _verify_task(task):
+                result.add(digest, baseline)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for digests in pool.imap_unordered(_verify_task, tasks):
+                for digest in digests:
+                    result.add(digest, baseline)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays replays and checks that they end the same way as before")
+    parser.add_argument("replays", nargs="+", help="Text replay files, or the data files of replay corpora")
+    parser.add_argument("--baseline", required=True,
+                        help="The file of digests to compare with.  Written if it doesn't exist.")
+    parser.add_argument("--update", action="store_true", help="Replace the baseline with the new digests")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update:
+        baseline = read_baseline(args.baseline)
+    result = verify_replays(args.replays, baseline, args.processes)
+    result.write_report(sys.stdout)
+    if baseline is None:
+        write_baseline(result.digests, args.baseline)
+    return 1 if result.divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
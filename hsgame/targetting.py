@@ -1,74 +1,100 @@
 __author__ = 'Daniel'
 
-def find_spell_target(game, criteria_function=lambda target: True):
-    def filter_function(target):
-        return criteria_function(target) and target.spell_targettable()
 
-    targets = game.other_player.minions.copy()
-    targets.extend(game.current_player.minions)
-    targets.append(game.other_player)
-    targets.append(game.current_player)
+def _any_target(target):
+    return True
 
-    targets = [target for target in targets if filter_function(target)]
-    return targets
 
+def _cached(find):
+    """
+        Keeps the targets found by a function in the game's target cache, so that asking again before the board
+        changes gives back the same tuple instead of building a new one.  The game empties the cache when a minion is
+        added or removed, when a minion's stealth changes, and at the start of each turn.  Calls with criteria
+        aren't cached, as the criteria can depend on anything.
+    """
+    def find_cached(game, criteria_function=None):
+        if criteria_function is not None:
+            return find(game, criteria_function)
+        cache = game.target_cache
+        if find in cache:
+            return cache[find]
+        targets = find(game, _any_target)
+        cache[find] = targets
+        return targets
 
-def find_battlecry_target(game):
-    targets = game.other_player.minions.copy()
-    targets.extend(game.current_player.minions)
-    targets.append(game.other_player)
-    targets.append(game.current_player)
+    find_cached.__name__ = find.__name__
+    find_cached.__doc__ = find.__doc__
+    return find_cached
 
-    return targets
 
+def _spell_targets(targets, criteria_function):
+    return tuple([target for target in targets if criteria_function(target) and target.spell_targettable()])
 
-def find_enemy_spell_target(game, criteria_function=lambda target: True):
-    def filter_function(target):
-        return criteria_function(target) and target.spell_targettable()
 
-    targets = game.other_player.minions.copy()
-    targets.append(game.other_player)
+@_cached
+def find_spell_target(game, criteria_function):
+    return _spell_targets(game.other_player.minions + game.current_player.minions +
+                          [game.other_player, game.current_player], criteria_function)
 
-    targets = [target for target in targets if filter_function(target)]
-    return targets
 
+@_cached
+def find_battlecry_target(game, criteria_function):
+    return tuple([target for target in game.other_player.minions + game.current_player.minions +
+                  [game.other_player, game.current_player] if criteria_function(target)])
 
-def find_minion_spell_target(game, criteria_function=lambda target: True):
-    def filter_function(target):
-        return criteria_function(target) and target.spell_targettable()
 
-    targets = game.other_player.minions.copy()
-    targets.extend(game.current_player.minions)
+@_cached
+def find_enemy_spell_target(game, criteria_function):
+    return _spell_targets(game.other_player.minions + [game.other_player], criteria_function)
 
-    targets = [target for target in targets if filter_function(target)]
-    return targets
+
+@_cached
+def find_minion_spell_target(game, criteria_function):
+    return _spell_targets(game.other_player.minions + game.current_player.minions, criteria_function)
 
 
-def find_minion_battlecry_target(game):
-    targets = game.other_player.minions.copy()
-    targets.extend(game.current_player.minions)
-    if len(targets) is 0:
+@_cached
+def find_minion_battlecry_target(game, criteria_function):
+    targets = tuple([target for target in game.other_player.minions + game.current_player.minions
+                     if criteria_function(target)])
+    if len(targets) == 0:
         return None
     return targets
 
 
-def find_enemy_minion_spell_target(game, criteria_function=lambda target: True):
-    def filter_function(target):
-        return criteria_function(target) and target.spell_targettable()
+@_cached
+def find_enemy_minion_spell_target(game, criteria_function):
+    return _spell_targets(game.other_player.minions, criteria_function)
 
-    targets = game.other_player.minions.copy()
 
-    targets = [target for target in targets if filter_function(target)]
+@_cached
+def find_enemy_minion_battlecry_target(game, criteria_function):
+    targets = tuple([target for target in game.other_player.minions if criteria_function(target)])
+    if len(targets) == 0:
+        return None
     return targets
 
-def find_enemy_minion_battlecry_target(game):
-    targets = game.other_player.minions.copy()
-    if len(targets) is 0:
+
+@_cached
+def find_friendly_minion_battlecry_target(game, criteria_function):
+    targets = tuple([target for target in game.current_player.minions if criteria_function(target)])
+    if len(targets) == 0:
         return None
     return targets
 
-def find_friendly_minion_battlecry_target(game):
-    targets = game.current_player.minions.copy()
-    if len(targets) is 0:
-        return None
-    return targets
\ No newline at end of file
+
+def find_attack_target(game):
+    found_taunt = False
+    targets = []
+    for enemy in game.other_player.minions:
+        if enemy.taunt and not enemy.stealth:
+            found_taunt = True
+        if not enemy.stealth:
+            targets.append(enemy)
+
+    if found_taunt:
+        targets = [target for target in targets if target.taunt]
+    else:
+        targets.append(game.other_player)
+
+    return targets
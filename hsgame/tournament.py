@@ -0,0 +1,221 @@
+import argparse
+import importlib
+import multiprocessing
+import sys
+import time
+
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Deck, Game, card_lookup
+from hsgame.game_random import GameRandom
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+class GameResult:
+    def __init__(self, index, seed, winner, turns, cards_played, error=None):
+        """
+            @index: int, the position of the game in the tournament
+            @seed: the seed used for the game's random numbers
+            @winner: int, the index of the winning deck, or None for a draw
+            @turns: int
+            @cards_played: list of dictionaries, one for each deck, from card name to the number of times it was played
+            @error: string, the message of the exception that stopped the game, if any
+        """
+        self.index = index
+        self.seed = seed
+        self.winner = winner
+        self.turns = turns
+        self.cards_played = cards_played
+        self.error = error
+
+
+class TournamentResult:
+    def __init__(self, deck_names):
+        self.deck_names = deck_names
+        self.games = 0
+        self.wins = [0, 0]
+        self.draws = 0
+        self.errors = []
+        self.turns = 0
+        self.shortest = None
+        self.longest = None
+        # For each deck, card name -> [times played, times played in a game the deck won]
+        self.card_stats = [{}, {}]
+        self.elapsed = 0
+
+    def add(self, result):
+        if result.error is not None:
+            self.errors.append(result)
+            return
+
+        self.games += 1
+        if result.winner is None:
+            self.draws += 1
+        else:
+            self.wins[result.winner] += 1
+        self.turns += result.turns
+        if self.shortest is None or result.turns < self.shortest:
+            self.shortest = result.turns
+        if self.longest is None or result.turns > self.longest:
+            self.longest = result.turns
+
+        for deck_index in range(0, 2):
+            stats = self.card_stats[deck_index]
+            for name, count in result.cards_played[deck_index].items():
+                if name not in stats:
+                    stats[name] = [0, 0]
+                stats[name][0] += count
+                if result.winner == deck_index:
+                    stats[name][1] += count
+
+    def win_rate(self, deck_index):
+        if self.games == 0:
+            return 0
+        return self.wins[deck_index] / self.games
+
+    def average_length(self):
+        if self.games == 0:
+            return 0
+        return self.turns / self.games
+
+    def write_report(self, writer):
+        writer.write("{0} games, {1} draws, {2} errors".format(self.games, self.draws, len(self.errors)))
+        if self.elapsed > 0:
+            writer.write(" in {0:.2f}s ({1:.1f} games/sec)".format(self.elapsed, self.games / self.elapsed))
+        writer.write("\n")
+        writer.write("Game length: {0:.1f} turns on average, {1} to {2}\n".format(self.average_length(),
+                                                                                  self.shortest, self.longest))
+        for deck_index in range(0, 2):
+            writer.write("Deck {0} ({1}): {2} wins, {3:.1%}\n".format(deck_index + 1, self.deck_names[deck_index],
+                                                                     self.wins[deck_index],
+                                                                     self.win_rate(deck_index)))
+            stats = self.card_stats[deck_index]
+            for name in sorted(stats, key=lambda card_name: -stats[card_name][0]):
+                played, won = stats[name]
+                writer.write("    {0}: played {1} times, {2:.1%} in won games\n".format(name, played, won / played))
+        for result in self.errors:
+            writer.write("Game {0} (seed {1}) failed: {2}\n".format(result.index, result.seed, result.error))
+
+
+def make_deck(deck_spec):
+    """
+        Builds a deck from a tuple of a class name and a list of card names.  As with the replay format, the cards are
+        repeated until the deck has 30 cards.
+    """
+    class_name, card_names = deck_spec
+    cards = [card_lookup(card_names[index % len(card_names)]) for index in range(0, 30)]
+    return Deck(cards, CHARACTER_CLASS.from_str(class_name))
+
+
+def game_seed(seed, index):
+    return "{0}:{1}".format(seed, index)
+
+
+def play_game(index, seed, deck_specs, agent_types):
+    decks = [make_deck(deck_spec) for deck_spec in deck_specs]
+    game = Game(decks, [agent_types[0](), agent_types[1]()], GameRandom(seed, index))
+
+    turns = 0
+    cards_played = [{}, {}]
+
+    def turn_started():
+        nonlocal turns
+        turns += 1
+
+    def card_played(card, counts):
+        counts[card.name] = counts.get(card.name, 0) + 1
+
+    for player in game.players:
+        player.bind("turn_started", turn_started)
+        player.bind("card_played", card_played, cards_played[decks.index(player.deck)])
+
+    try:
+        game.start()
+    except Exception as e:
+        # Bugs in card code are reported with the game rather than stopping the whole tournament
+        error = "{0}: {1}".format(type(e).__name__, e)
+        return GameResult(index, game_seed(seed, index), None, turns, cards_played, error)
+
+    winner = None
+    for player in game.players:
+        if player.dead:
+            if winner is None:
+                winner = 1 - decks.index(player.deck)
+            else:
+                winner = None
+                break
+
+    return GameResult(index, game_seed(seed, index), winner, turns, cards_played)
+
+
+def _play_game_task(task):
+    return play_game(*task)
+
+
+def run_tournament(deck_specs, agent_types, games, processes=None, seed=0):
+    """
+        Plays a number of games between two decks, each controlled by a type of agent, and collects the results.
+
+        @deck_specs: list of two (class name, card names) tuples, see make_deck
+        @agent_types: list of two agent classes, the first plays the first deck
+        @games: int
+        @processes: int, the number of worker processes.  Defaults to the number of CPUs.  With 1, the games are
+        played in this process
+        @seed: The seed each game's random numbers are derived from.  Each game has its own stream of the seed, see
+        hsgame.game_random.GameRandom, so the results depend only on the seed, not on the number of processes.
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    result = TournamentResult([deck_spec[0] + ": " + ", ".join(deck_spec[1]) for deck_spec in deck_specs])
+    tasks = [(index, seed, deck_specs, agent_types) for index in range(0, games)]
+    start = time.perf_counter()
+    if processes == 1:
+        for task in tasks:
+            result.add(_play_game_task(task))
+    else:
+        # Enough chunks that the workers stay busy, but large enough that sending the tasks is cheap
+        chunk_size = max(1, games // (processes * 8))
+        with multiprocessing.Pool(processes) as pool:
+            for game_result in pool.imap_unordered(_play_game_task, tasks, chunk_size):
+                result.add(game_result)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _load_agent(path):
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _parse_deck(deck_string):
+    class_name, cards = deck_string.split(":", 1)
+    return class_name.strip(), [card.strip() for card in cards.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays games between two decks and reports the results")
+    parser.add_argument("--deck", action="append", required=True, type=_parse_deck,
+                        help="A deck, as 'Class:card 1,card 2,...'.  Given twice.")
+    parser.add_argument("--agent", action="append",
+                        help="The agent class for a deck, as module.Class.  Given once for each deck.  "
+                             "Defaults to hsgame.agents.basic_agents.PredictableBot")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if len(args.deck) != 2:
+        parser.error("exactly two decks are needed")
+    agents = args.agent or ["hsgame.agents.basic_agents.PredictableBot"] * 2
+    if len(agents) != 2:
+        parser.error("either no agents or one for each deck must be given")
+
+    result = run_tournament(args.deck, [_load_agent(agent) for agent in agents], args.games, args.processes,
+                            args.seed)
+    result.write_report(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import collections
+import operator
+
+__author__ = 'Daniel'
+
+_MASK = (1 << 64) - 1
+
+_minion_fields = operator.attrgetter("attack_power", "temp_attack", "defense", "max_defense", "taunt",
+                                     "divine_shield", "_stealth", "frozen", "frozen_this_turn", "active", "charge",
+                                     "wind_fury", "used_wind_fury", "immune_to_spells", "spell_power")
+_player_fields = operator.attrgetter("health", "armour", "mana", "max_mana", "attack_power", "fatigue", "frozen",
+                                     "frozen_this_turn", "active")
+
+# Tags which keep the features of different parts of the game from having the same key
+_PLAYER, _MINION, _HAND, _DECK, _SECRET, _TURN = range(0, 6)
+
+
+def _multiset_key(tag, player_index, names):
+    # Each copy of a card has its own key, as the keys of two copies of the same card would cancel each other out
+    key = 0
+    copies = {}
+    for name in names:
+        copy = copies.get(name, 0)
+        copies[name] = copy + 1
+        key ^= hash((tag, player_index, name, copy))
+    return key
+
+
+def minion_key(minion, player_index, position):
+    """
+        The key of a minion in a place on the board.  The keys of the features of a game are XORed together for its
+        hash, so a minion which has changed can be swapped in with hash ^ minion_key(before) ^ minion_key(after).
+    """
+    return hash((_MINION, player_index, position, minion.card.name) + _minion_fields(minion))
+
+
+def player_key(player, player_index):
+    """
+        The key of everything about a player that isn't a card: health, armour, mana and so on
+    """
+    return hash((_PLAYER, player_index) + _player_fields(player))
+
+
+def hand_key(player, player_index):
+    """
+        The key of the cards in a player's hand, in order, with their current cost.  The order is part of the key as the
+        actions kept in a search tree, such as "play(0)", pick cards by their place in the hand.
+    """
+    return hash((_HAND, player_index) + tuple([(card.name, card.mana) for card in player.hand]))
+
+
+def deck_key(player, player_index):
+    """
+        The key of the cards left in a player's deck, whatever order they will be drawn in
+    """
+    cards = player.deck.cards
+    return _multiset_key(_DECK, player_index, [cards[position].name for position in player.deck.unused])
+
+
+def state_hash(game):
+    """
+        A 64 bit hash of the state of the game, for finding positions which have been reached before.  Each feature of
+        the game (each minion in its place on the board, each player's health and mana, the cards in each hand, each
+        card in the deck and in play as a secret, and whose turn it is) has a key, and the keys are XORed together.
+        Games which have been reached by playing the same things in a different order hash the same, as the order the
+        cards will be drawn in isn't part of the hash.
+
+        Unlike a Zobrist hash, the keys aren't kept up to date as the game changes.  Card effects change the attributes
+        of minions and players directly, in too many places to follow, so the hash is worked out from the whole game
+        each time.  The key of a feature is Python's hash of a tuple describing it, so it is effectively random and,
+        as it is computed rather than kept in a table, there is nothing to fill up as the search finds new minions and
+        stats.  Python randomizes the hashes of strings for each process, so hashes can only be compared within a
+        process.
+
+        Only the state in attributes is hashed.  Effects which are only held in closures bound to events, such as
+        deathrattles and buffs which end with the turn, are left out, as are whatever the random number generator will
+        give next.
+    """
+    key = hash((_TURN, game.players.index(game.current_player)))
+    for player_index, player in enumerate(game.players):
+        key ^= player_key(player, player_index) ^ hand_key(player, player_index) ^ deck_key(player, player_index)
+        for position, minion in enumerate(player.minions):
+            key ^= minion_key(minion, player_index, position)
+        for secret in player.secrets:
+            key ^= hash((_SECRET, player_index, secret.name))
+    return key & _MASK
+
+
+class TranspositionTable:
+    """
+        A table from game hashes (see state_hash) to whatever a search keeps about the game, for instance the nodes of
+        a search tree, so that games reached along different paths share what has been found about them.
+
+        The table holds up to capacity entries.  Adding one more evicts the entry that was used least recently.  One
+        table can be shared by any number of agents in a process, as long as they keep the same kind of values in it.
+    """
+
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(False)
+
+    def setdefault(self, key, value):
+        """
+            The value for the key, or if there isn't one, stores and returns the given value
+        """
+        existing = self.get(key, _missing)
+        if existing is _missing:
+            self.put(key, value)
+            return value
+        return existing
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_missing = object()
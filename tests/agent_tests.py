@@ -1,9 +1,12 @@
+import multiprocessing
 import random
 from hsgame.agents.user_agents import Observer
 from hsgame.constants import CHARACTER_CLASS
 from hsgame.game_objects import Deck, Game, card_lookup
 from hsgame.agents.basic_agents import DoNothingBot
+from hsgame.agents.search_agents import MCTSAgent, ParallelMCTSAgent
 import hsgame.cards
+from tests.testing_utils import lethal_position, mixed_deck, play_against_nothing
 
 __author__ = 'Daniel'
 
@@ -34,3 +37,72 @@ class TestObserver(unittest.TestCase):
         obs.observe(game)
         game.start()
         self.assertEqual(6905, len(string.getvalue()))
+
+
+def search_in_worker(seed):
+    # Workers of a pool are daemonic, and can't start processes of their own
+    game = lethal_position(lambda: ParallelMCTSAgent(2, time_budget=None, iterations=40, seed=seed))
+    agent = game.current_player.agent
+    rollouts = agent.rollouts
+    return agent.search(game), agent.rollouts - rollouts
+
+
+class TestMCTSAgent(unittest.TestCase):
+
+    def assertFindsLethal(self, game, iterations):
+        minions = len(game.current_player.minions)
+        rollouts = game.current_player.agent.rollouts
+
+        # Any of the boars can attack for the win, but ending the turn would let the game go on
+        self.assertRegex(game.current_player.agent.search(game), r"attack\(p\d:\d,p\d\)")
+        self.assertEqual(1, game.other_player.health)
+        self.assertEqual(minions, len(game.current_player.minions))
+        self.assertEqual(rollouts + iterations, game.current_player.agent.rollouts)
+
+        game.current_player.agent.do_turn(game.current_player)
+        self.assertTrue(game.other_player.dead)
+
+    def test_finds_lethal(self):
+        self.assertFindsLethal(lethal_position(lambda: MCTSAgent(None, 40, seed=3)), 40)
+
+    def test_root_parallel_search(self):
+        game = lethal_position(lambda: ParallelMCTSAgent(2, time_budget=None, iterations=40, seed=3))
+        self.assertFindsLethal(game, 40)
+
+    def test_leaf_parallel_search(self):
+        game = lethal_position(lambda: ParallelMCTSAgent(2, 5, time_budget=None, iterations=40, seed=3))
+        self.assertFindsLethal(game, 40)
+
+    def test_parallel_search_in_daemon(self):
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            key, rollouts = pool.apply(search_in_worker, (3,))
+        self.assertRegex(key, r"attack\(p\d:\d,p\d\)")
+        self.assertEqual(40, rollouts)
+
+    def test_simulations_draw_differently(self):
+        random.seed(1568)
+        agent = MCTSAgent(None, 10, seed=1)
+        game = Game([mixed_deck(CHARACTER_CLASS.PALADIN), mixed_deck(CHARACTER_CLASS.DRUID)],
+                    [agent, DoNothingBot()])
+        game.pre_game()
+
+        def draws(game):
+            player = game.current_player
+            for draw in range(0, 5):
+                player.draw()
+            return tuple([card.name for card in player.hand[-5:]])
+
+        simulations = [draws(agent.simulation(game, agent.rollout_agents())) for index in range(0, 20)]
+        # The copies don't see the cards the game itself will draw next
+        self.assertGreater(len(set(simulations)), 1)
+        self.assertLess(simulations.count(draws(game)), len(simulations))
+
+    def test_play_game(self):
+        random.seed(1568)
+        agent = MCTSAgent(None, 10, seed=1)
+        player = play_against_nothing(agent)
+        self.assertFalse(player.dead)
+        self.assertTrue(player.game.other_player.dead or player.game.current_player.dead)
+        self.assertGreater(agent.rollouts, 0)
+        self.assertGreater(agent.rollouts_per_second(), 0)
+
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from hsgame.agents.basic_agents import DoNothingBot
+from hsgame.cards import ArcaneExplosion, Consecration, HolyNova, BloodfenRaptor, StonetuskBoar
+from tests.testing_agents import MinionPlayingAgent
+from tests.testing_utils import generate_game_for
+from hsgame.board_mirror import BoardMirror
+
+__author__ = 'Daniel'
+
+
+class TestBoardMirror(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1857)
+        self.game = generate_game_for(BloodfenRaptor, StonetuskBoar, MinionPlayingAgent, MinionPlayingAgent)
+        for turn in range(0, 8):
+            self.game.play_single_turn()
+        self.game._start_turn()
+        minions = self.game.other_player.minions
+        minions[0].divine_shield = True
+        minions[1].increase_health(2)
+        minions[1].defense -= 1
+        minions[2].taunt = True
+        minions[3].stealth = True
+        minions[3].frozen = True
+
+    def test_state(self):
+        minions = self.game.other_player.minions
+        mirror = BoardMirror([self.game.other_player])
+        self.assertEqual(1, len(mirror))
+        self.assertEqual([4], list(mirror.minion_count()))
+        self.assertEqual([True] * 4 + [False] * 3, list(mirror.present[0]))
+        self.assertEqual([minion.attack_power for minion in minions], list(mirror.attack[0, 0:4]))
+        self.assertEqual([minion.defense for minion in minions], list(mirror.health[0, 0:4]))
+        self.assertEqual([minion.max_defense for minion in minions], list(mirror.max_health[0, 0:4]))
+        self.assertEqual([True, False, False, False], list(mirror.divine_shield[0, 0:4]))
+        self.assertEqual([False, False, True, False], list(mirror.taunt[0, 0:4]))
+        self.assertEqual([False, False, False, True], list(mirror.stealth[0, 0:4]))
+        self.assertEqual([False, False, True, False] + [False] * 3, list(mirror.attackable()[0]))
+        self.assertEqual([minion.can_attack() for minion in minions] + [False] * 3, list(mirror.can_attack()[0]))
+        self.assertEqual([sum([minion.attack_power for minion in minions if minion.can_attack()])],
+                         list(mirror.attack_power()))
+
+        minions[2].silence()
+        self.assertTrue(mirror.taunt[0, 2])
+        mirror.refresh()
+        self.assertFalse(mirror.taunt[0, 2])
+        self.assertEqual([minion.can_be_attacked() for minion in minions] + [False] * 3, list(mirror.attackable()[0]))
+
+    def test_several_boards(self):
+        mirror = BoardMirror(self.game.players)
+        self.assertEqual(2, len(mirror))
+        self.assertEqual([len(player.minions) for player in self.game.players], list(mirror.minion_count()))
+        self.assertEqual([BoardMirror([player]).killed_by(amount).sum()
+                          for player, amount in zip(self.game.players, [1, 2])],
+                         list(mirror.killed_by([1, 2]).sum(axis=1)))
+
+        for minion in self.game.current_player.minions.copy():
+            minion.die(None)
+        mirror.refresh()
+        self.assertEqual(0, mirror.minion_count()[self.game.players.index(self.game.current_player)])
+        self.assertEqual(0, mirror.attack_power()[self.game.players.index(self.game.current_player)])
+
+    def test_area_damage(self):
+        for card, amount in [(ArcaneExplosion, 1), (Consecration, 2)]:
+            mirror = BoardMirror([self.game.other_player])
+            killed = mirror.killed_by(amount)[0]
+            survivors = mirror.present[0] & ~killed
+            health = mirror.health_after_damage(amount)[0]
+
+            clone = self.game.clone([DoNothingBot(), DoNothingBot()])
+            card().use(clone.current_player, clone)
+            self.assertEqual(survivors.sum(), len(clone.other_player.minions))
+            self.assertEqual(list(health[survivors]), [minion.defense for minion in clone.other_player.minions])
+
+    def test_healing(self):
+        self.game._end_turn()
+        self.game._start_turn()
+        mirror = BoardMirror([self.game.current_player])
+        health = mirror.health_after_healing(2)[mirror.present]
+
+        HolyNova().use(self.game.current_player, self.game)
+        self.assertEqual(list(health), [minion.defense for minion in self.game.current_player.minions])
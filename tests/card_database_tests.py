@@ -0,0 +1,64 @@
+import io
+import unittest
+
+from hsgame.card_database import CardDatabase, card_database
+from hsgame.cards import StonetuskBoar, Moonfire
+from hsgame.constants import CHARACTER_CLASS, MINION_TYPE
+
+__author__ = 'Daniel'
+
+CARDS = """Implemented?,Name,Text,Race,Class,Cost,Attack,Health,Type,Minion/Spell
+yes,Stonetusk Boar,Charge,Beast,,1,1,1,Basic,Minion
+yes,Moonfire,Deal 1 damage.,,Druid,0,,,Basic,Spell
+no,Made Up Beast,,Beast,Druid,3,3,3,Expert,Minion
+no,Made Up Murloc,,Murloc,,7,5,5,Expert,Minion
+"""
+
+
+class TestCardDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.database = CardDatabase(io.StringIO(CARDS))
+
+    def test_columns(self):
+        row = self.database.row("Stonetusk Boar")
+        self.assertEqual(0, row)
+        self.assertEqual(1, self.database.cost[row])
+        self.assertEqual(1, self.database.attack[row])
+        self.assertEqual(MINION_TYPE.BEAST, self.database.race[row])
+        self.assertEqual(CHARACTER_CLASS.ALL, self.database.character_class[row])
+        self.assertIs(StonetuskBoar, self.database.card_types[row])
+
+        row = self.database.row("Moonfire")
+        self.assertEqual(-1, self.database.attack[row])
+        self.assertEqual(-1, self.database.health[row])
+        self.assertIs(Moonfire, self.database.card_types[row])
+        self.assertIsNone(self.database.card_types[self.database.row("Made Up Beast")])
+
+    def test_select(self):
+        database = self.database
+        self.assertEqual(["Stonetusk Boar", "Moonfire", "Made Up Beast", "Made Up Murloc"],
+                         database.names_of(database.select()))
+        self.assertEqual(["Moonfire", "Made Up Beast"],
+                         database.names_of(database.select(character_class=CHARACTER_CLASS.DRUID)))
+        self.assertEqual(["Stonetusk Boar", "Made Up Beast"], database.names_of(database.select(race=MINION_TYPE.BEAST)))
+        self.assertEqual(["Made Up Beast"], database.names_of(database.select(race=MINION_TYPE.BEAST, implemented=False)))
+        self.assertEqual(["Moonfire"], database.names_of(database.select(kind="Spell")))
+        self.assertEqual(["Made Up Murloc"], database.names_of(database.select(cost=7, card_set="Expert")))
+        self.assertEqual(["Stonetusk Boar", "Moonfire"], database.names_of(database.select(max_cost=2)))
+        self.assertEqual(4, database.count(database.select(max_cost=20)))
+        self.assertEqual(0, database.select(max_cost=-1))
+        self.assertEqual(0, database.select(race=MINION_TYPE.DRAGON))
+
+        self.assertEqual(["Stonetusk Boar", "Made Up Murloc"],
+                         database.names_of(database.playable_by(CHARACTER_CLASS.MAGE)))
+        self.assertEqual([StonetuskBoar, Moonfire],
+                         database.card_types_of(database.playable_by(CHARACTER_CLASS.DRUID)))
+
+    def test_cards_file(self):
+        database = card_database()
+        self.assertIs(database, card_database())
+        self.assertEqual(database.names_of(database.select(implemented=True)),
+                         [name for name, implemented in zip(database.names, database.implemented) if implemented])
+        for row in database.rows(database.select(implemented=True)):
+            self.assertIsNotNone(database.card_types[row], database.names[row])
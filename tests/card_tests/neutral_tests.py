@@ -3,6 +3,7 @@ from hsgame.agents.basic_agents import DoNothingBot
 from tests.testing_agents import MinionPlayingAgent
 from tests.testing_utils import generate_game_for
 from hsgame.cards import *
+import hsgame.targetting
 
 __author__ = 'Daniel'
 
@@ -63,5 +64,18 @@ class TestCommon(unittest.TestCase):
         self.assertEqual(1, game.current_player.minions[0].max_defense)
         self.assertEqual("Elven Archer", game.current_player.minions[0].card.name)
 
+    def test_FaerieDragon(self):
+        game = generate_game_for(FaerieDragon, StonetuskBoar, MinionPlayingAgent, DoNothingBot)
+        for turn in range(0, 3):
+            game.play_single_turn()
 
-
+        self.assertEqual(1, len(game.current_player.minions))
+        dragon = game.current_player.minions[0]
+        self.assertEqual("Faerie Dragon", dragon.card.name)
+        self.assertEqual(3, dragon.attack_power)
+        self.assertEqual(2, dragon.defense)
+        self.assertNotIn(dragon, hsgame.targetting.find_spell_target(game))
+        self.assertIn(dragon, hsgame.targetting.find_battlecry_target(game))
+
+        dragon.silence()
+        self.assertIn(dragon, hsgame.targetting.find_spell_target(game))
@@ -181,4 +181,11 @@ class TestPriest(unittest.TestCase):
         self.assertEqual(4, len(game.players[0].hand))
         self.assertEqual("Mogu'shan Warden", game.players[0].hand[-1].name)
         self.assertEqual(4, len(game.players[1].hand))
+
+    def testMindVisionEmptyHand(self):
+        game = generate_game_for(MindVision, MogushanWarden, SpellTestingAgent, MinionPlayingAgent)
+        game.players[1].hand = []
+        game.play_single_turn()
+        self.assertEqual(3, len(game.players[0].hand))
+        self.assertEqual(0, len(game.players[1].hand))
         
\ No newline at end of file
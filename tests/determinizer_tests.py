@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from hsgame.agents.basic_agents import DoNothingBot, PredictableBot
+from hsgame.agents.search_agents import MCTSAgent
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.determinizer import Determinizer
+from hsgame.game_objects import Game, Deck, card_lookup
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+class TestDeterminizer(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1702)
+        names = ["Mind Vision", "Stonetusk Boar", "Bloodfen Raptor", "Novice Engineer", "Holy Smite", "Elven Archer"]
+        self.deck_names = [names[index % len(names)] for index in range(0, 30)]
+        self.game = Game([self.make_deck(), self.make_deck()], [DoNothingBot(), DoNothingBot()])
+        self.determinizer = Determinizer(self.game, 5)
+        self.game.pre_game()
+        self.observer, self.opponent = self.game.players
+
+    def make_deck(self):
+        return Deck([card_lookup(name) for name in self.deck_names], CHARACTER_CLASS.PRIEST)
+
+    def cards_left(self, player):
+        # The names of the cards in the player's hand and deck
+        return sorted([card.name for card in player.hand] + [player.deck.cards[position].name
+                                                             for position in player.deck.unused])
+
+    def test_sample(self):
+        hands = set()
+        for index in range(0, 30):
+            sample = self.determinizer.sample(self.observer)
+            observer, opponent = sample.players
+            self.assertEqual([card.name for card in self.observer.hand], [card.name for card in observer.hand])
+            self.assertEqual(self.cards_left(self.opponent), self.cards_left(opponent))
+            self.assertEqual(self.opponent.deck.left, opponent.deck.left)
+            self.assertEqual(len(self.opponent.hand), len(opponent.hand))
+            hands.add(tuple([card.name for card in opponent.hand]))
+
+            # The sample is played on with cards from its own copy of the deck
+            for card in opponent.hand:
+                self.assertIn(card, opponent.deck.cards)
+                self.assertNotIn(card, self.opponent.deck.cards)
+            opponent.draw()
+        self.assertGreater(len(hands), 5)
+        self.assertEqual(30, self.opponent.deck.left + len(self.opponent.hand))
+
+    def test_revealed_cards(self):
+        self.game.current_player = self.observer
+        self.game.other_player = self.opponent
+        self.observer.mana = 1
+        self.observer.hand.append(card_lookup("Mind Vision"))
+        self.game.play_card(self.observer.hand[-1])
+        revealed = self.observer.hand[-1].name
+        self.assertEqual(len(self.opponent.hand) - 1, len(self.determinizer.hidden_cards(self.observer)))
+        shown = [index for index in range(0, len(self.opponent.hand))
+                 if index not in self.determinizer.hidden_cards(self.observer)][0]
+        self.assertEqual(revealed, self.opponent.hand[shown].name)
+
+        for index in range(0, 20):
+            self.assertEqual(revealed, self.determinizer.sample(self.observer).players[1].hand[shown].name)
+
+        # Once the card has left the hand, nothing in the hand is known
+        self.opponent.put_back(self.opponent.hand[shown])
+        self.assertEqual(len(self.opponent.hand), len(self.determinizer.hidden_cards(self.observer)))
+
+    def test_search(self):
+        agent = MCTSAgent(None, 10, seed=4, determinize=True)
+        game = Game([self.make_deck(), self.make_deck()], [agent, PredictableBot()])
+        game.start()
+        self.assertTrue(game.game_ended)
+        self.assertGreater(agent.rollouts, 0)
@@ -0,0 +1,158 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from hsgame.agents.basic_agents import DoNothingBot
+from hsgame.agents.search_agents import GreedyAgent, END_TURN
+from hsgame.cards import BloodfenRaptor, StonetuskBoar
+from hsgame.evaluation import state_vector, state_vectors, FEATURES, Evaluator, LinearEvaluator, MATERIAL, TEMPO, \
+    LETHAL_THREAT, DEFAULT
+from tests.testing_agents import MinionPlayingAgent
+from tests.testing_utils import generate_game_for, lethal_position, play_against_nothing
+
+__author__ = 'Daniel'
+
+EVALUATORS = [MATERIAL, TEMPO, LETHAL_THREAT, DEFAULT]
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1857)
+        self.game = generate_game_for(BloodfenRaptor, StonetuskBoar, MinionPlayingAgent, MinionPlayingAgent)
+        for turn in range(0, 6):
+            self.game.play_single_turn()
+        self.game._start_turn()
+
+    def features(self, player_index):
+        return dict(zip(FEATURES, state_vector(self.game, player_index)))
+
+    def test_state_vector(self):
+        player_index = self.game.players.index(self.game.current_player)
+        features = self.features(player_index)
+        player = self.game.current_player
+        opponent = self.game.other_player
+
+        self.assertEqual(len(FEATURES), len(state_vector(self.game, player_index)))
+        self.assertEqual(player.health, features["health"])
+        self.assertEqual(opponent.health, features["opponent_health"])
+        self.assertEqual(player.mana, features["mana"])
+        self.assertEqual(len(player.hand), features["hand"])
+        self.assertEqual(opponent.deck.left, features["opponent_deck"])
+        self.assertEqual(len(player.minions), features["minions"])
+        self.assertEqual(sum([minion.attack_power for minion in player.minions]), features["attack"])
+        self.assertEqual(sum([minion.defense for minion in opponent.minions]), features["opponent_minion_health"])
+        self.assertEqual(sum([minion.attack_power for minion in player.minions if minion.can_attack()]),
+                         features["ready_attack"])
+        self.assertEqual(0, features["taunt_health"])
+
+        # The same features, seen by the other player
+        other = self.features(1 - player_index)
+        for feature in FEATURES[:len(FEATURES) // 2]:
+            self.assertEqual(features[feature], other["opponent_" + feature])
+
+        player.armour = 3
+        self.assertEqual(player.health + 3, self.features(player_index)["health"])
+
+    def test_scores(self):
+        player_index = self.game.players.index(self.game.current_player)
+        for evaluator in EVALUATORS:
+            score = evaluator(self.game, player_index)
+            self.assertGreater(score, 0)
+            self.assertLess(score, 1)
+
+        # Tempo counts the mana left unspent by the player whose turn it is, so only the others are symmetric
+        for evaluator in [MATERIAL, LETHAL_THREAT]:
+            self.assertAlmostEqual(1, evaluator(self.game, player_index) + evaluator(self.game, 1 - player_index))
+
+        # Tempo only looks at the board
+        before = [evaluator(self.game, player_index) for evaluator in [MATERIAL, LETHAL_THREAT, DEFAULT]]
+        self.game.other_player.health -= 10
+        for evaluator, score in zip([MATERIAL, LETHAL_THREAT, DEFAULT], before):
+            self.assertGreater(evaluator(self.game, player_index), score)
+        before = TEMPO(self.game, player_index)
+        self.game.other_player.minions[0].die(None)
+        self.assertGreater(TEMPO(self.game, player_index), before)
+
+        self.game.other_player.health = 0
+        for evaluator in EVALUATORS:
+            self.assertEqual(1.0, evaluator(self.game, player_index))
+            self.assertEqual(0.0, evaluator(self.game, 1 - player_index))
+        self.game.current_player.health = 0
+        for evaluator in EVALUATORS:
+            self.assertEqual(0.5, evaluator(self.game, player_index))
+
+    def test_lethal_threat(self):
+        player_index = self.game.players.index(self.game.current_player)
+        self.game.other_player.health = 30
+        self.game.current_player.health = 30
+        without = LETHAL_THREAT(self.game, player_index)
+        self.game.other_player.health = sum([minion.attack_power for minion in self.game.current_player.minions])
+        self.assertLess(without, 0.9)
+        self.assertGreater(LETHAL_THREAT(self.game, player_index), 0.95)
+
+    def test_unknown_feature(self):
+        self.assertRaises(KeyError, LinearEvaluator, {"health": 1, "speed": 2}, 1)
+
+    def test_abstract(self):
+        self.assertRaises(TypeError, Evaluator)
+
+        class HealthEvaluator(Evaluator):
+            def score_position(self, vector):
+                return vector[0] / 60
+
+        self.assertEqual(self.game.players[0].health / 60, HealthEvaluator()(self.game, 0))
+
+    def test_batch(self):
+        games = [self.game]
+        for turn in range(0, 6):
+            self.game.play_single_turn()
+            games.append(self.game.clone())
+        games[1].players[0].health = 0
+        games[2].players[1].health = -2
+        games[3].players[0].health = 0
+        games[3].players[1].health = 0
+
+        vectors = state_vectors(games, 0)
+        self.assertEqual((len(games), len(FEATURES)), vectors.shape)
+        self.assertEqual(list(state_vector(games[4], 0)), vectors[4].tolist())
+        for evaluator in EVALUATORS:
+            expected = [evaluator(game, 0) for game in games]
+            for score, single in zip(evaluator.score_games(games, 0), expected):
+                self.assertAlmostEqual(single, score)
+            self.assertEqual([0.0, 1.0, 0.5], evaluator.score_games(games, 0)[1:4])
+            self.assertEqual([], evaluator.score_games([], 0))
+
+        # Without NumPy, the games are scored one at a time
+        with patch("hsgame.evaluation.numpy", None):
+            for evaluator in EVALUATORS:
+                self.assertEqual([evaluator(game, 0) for game in games], evaluator.score_games(games, 0))
+            self.assertRaises(ImportError, state_vectors, games, 0)
+
+
+class TestGreedyAgent(unittest.TestCase):
+
+    def test_lethal(self):
+        random.seed(1857)
+        game = lethal_position(GreedyAgent)
+
+        self.assertRegex(game.current_player.agent.best_action(game), r"attack\(p\d:\d,p\d\)")
+        self.assertEqual(1, game.other_player.health)
+        game.current_player.agent.do_turn(game.current_player)
+        self.assertTrue(game.other_player.dead)
+
+    def test_nothing_to_do(self):
+        random.seed(1857)
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, GreedyAgent, DoNothingBot)
+        game.current_player = game.players[1]
+        game._start_turn()
+        game.current_player.mana = 0
+        game.current_player.hand = []
+        self.assertEqual(END_TURN, game.current_player.agent.best_action(game))
+
+    def test_play_game(self):
+        random.seed(1568)
+        agent = GreedyAgent(seed=1)
+        player = play_against_nothing(agent)
+        self.assertFalse(player.dead)
+        self.assertTrue(player.game.other_player.dead or player.game.current_player.dead)
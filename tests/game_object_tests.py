@@ -1,18 +1,21 @@
 import copy
 from hsgame.agents.basic_agents import DoNothingBot
-from hsgame.constants import CHARACTER_CLASS
-from tests.testing_agents import SpellTestingAgent
+from hsgame.constants import CHARACTER_CLASS, CARD_RARITY
+from tests.testing_agents import SpellTestingAgent, MinionPlayingAgent, ActionAgent
 from tests.testing_utils import generate_game_for
-from hsgame.cards import StonetuskBoar
+from hsgame.cards import StonetuskBoar, KeeperOfTheGrove, Starfall
 
 __author__ = 'Daniel'
 import random
 import unittest
 from unittest.mock import Mock, call
 
-from hsgame.game_objects import Player, Game, Deck, Bindable, card_lookup, SecretCard
+from hsgame.game_objects import Player, Game, Deck, Bindable, card_lookup, SecretCard, GameException, MinionCard, \
+    CardRegistry, card_registry
 
 import hsgame.cards
+import hsgame.targetting
+from hsgame.replay import SpellAction, MinionAction, AttackAction, PowerAction
 
 
 class TestGame(unittest.TestCase):
@@ -129,7 +132,298 @@ class TestGame(unittest.TestCase):
             #Now the events should be reset
             game.play_single_turn()
 
+    def test_clone(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, MinionPlayingAgent, DoNothingBot)
+        for turn in range(0, 3):
+            game.play_single_turn()
 
+        minion = game.players[0].minions[0]
+        minion.increase_attack(2)
+        clone = game.clone()
+
+        self.assertIsNot(clone.players[0], game.players[0])
+        self.assertIs(clone.players[0].game, clone)
+        self.assertIs(clone.players[0].agent.game, clone)
+        self.assertIn(clone.players[1].hand[0], clone.players[1].deck.cards)
+        self.assertNotIn(clone.players[1].hand[0], game.players[1].deck.cards)
+
+        cloned_minion = clone.players[0].minions[0]
+        self.assertIs(cloned_minion.player, clone.players[0])
+        self.assertIn(clone.players[0].events["turn_ended"][-1].function.__self__, clone.players[0].minions)
+
+        # The closure bound by increase_attack has to affect the clone only
+        cloned_minion.silence()
+        self.assertEqual(1, cloned_minion.attack_power)
+        self.assertEqual(3, minion.attack_power)
+
+        for turn in range(0, 4):
+            clone.play_single_turn()
+        self.assertEqual(4, len(clone.players[0].minions))
+        self.assertEqual(2, len(game.players[0].minions))
+        self.assertEqual(game.players[0].deck.left - 2, clone.players[0].deck.left)
+
+    def test_clone_with_agents(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, MinionPlayingAgent, DoNothingBot)
+        agents = [DoNothingBot(), DoNothingBot()]
+        clone = game.clone(agents)
+        self.assertIs(clone.players[0].agent, agents[0])
+        self.assertIs(clone.players[1].agent, agents[1])
+        self.assertIs(agents[0].game, clone)
+        self.assertIs(game.players[0].agent.game, game)
+
+    def test_rollback(self):
+        def game_state(game):
+            def object_state(game_object):
+                fields = getattr(game_object, "__dict__", {}).copy()
+                for game_object_type in type(game_object).__mro__:
+                    for slot in getattr(game_object_type, "__slots__", []):
+                        if hasattr(game_object, slot):
+                            fields[slot] = getattr(game_object, slot)
+                return dict([(key, value.copy() if type(value) in [list, dict] else value)
+                             for key, value in fields.items()])
+
+            return [object_state(game)] + \
+                   [object_state(player) for player in game.players] + \
+                   [object_state(player.deck) for player in game.players] + \
+                   [object_state(minion) for player in game.players for minion in player.minions] + \
+                   [object_state(card) for player in game.players for card in player.hand]
+
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, MinionPlayingAgent, MinionPlayingAgent)
+        for turn in range(0, 4):
+            game.play_single_turn()
+        game._start_turn()
+        before = game_state(game)
+        hand = game.current_player.hand.copy()
+        minions = [player.minions.copy() for player in game.players]
+
+        checkpoint = game.checkpoint()
+        game.play_card(game.current_player.hand[0])
+        game.current_player.minions[0].attack()
+        game.current_player.minions[0].increase_attack(2)
+        game.current_player.power.use()
+        game.current_player.increase_attack(1)
+        game.current_player.attack()
+        self.assertNotEqual(before, game_state(game))
+
+        game.rollback(checkpoint)
+        self.assertEqual(before, game_state(game))
+        self.assertListEqual(hand, game.current_player.hand)
+        self.assertListEqual(minions, [player.minions for player in game.players])
+
+        # The same checkpoint can be used more than once
+        game.play_card(game.current_player.hand[0])
+        game._end_turn()
+        game.play_single_turn()
+        game.rollback(checkpoint)
+        self.assertEqual(before, game_state(game))
+        game._end_turn()
+        game.play_single_turn()
+
+    def test_legal_actions(self):
+        game = generate_game_for(KeeperOfTheGrove, StonetuskBoar, ActionAgent, MinionPlayingAgent)
+        for turn in range(0, 4):
+            game.play_single_turn()
+        game._start_turn()
+        game.current_player.mana = 4
+
+        actions = list(game.legal_actions())
+        minion_actions = [action for action in actions if type(action) is MinionAction]
+        power_actions = [action for action in actions if type(action) is PowerAction]
+        # Each keeper can use either option on either of the boars
+        self.assertEqual(len(game.current_player.hand) * 4, len(minion_actions))
+        self.assertEqual(1, len(power_actions))
+        self.assertEqual(len(actions), len(minion_actions) + len(power_actions))
+
+        for action in actions:
+            clone = game.clone([ActionAgent(), MinionPlayingAgent()])
+            action.play(clone)
+            if type(action) is MinionAction:
+                self.assertEqual(1, len(clone.current_player.minions))
+                self.assertEqual(0, clone.current_player.mana)
+                if action.card.card_ref.endswith(":0"):
+                    self.assertEqual(1, len(clone.other_player.minions))
+                else:
+                    self.assertEqual(2, len(clone.other_player.minions))
+            else:
+                self.assertEqual(2, clone.current_player.mana)
+        self.assertEqual(0, len(game.current_player.minions))
+        self.assertEqual(4, game.current_player.mana)
+
+    def test_legal_option_targets(self):
+        game = generate_game_for(Starfall, StonetuskBoar, ActionAgent, MinionPlayingAgent)
+        for turn in range(0, 4):
+            game.play_single_turn()
+        game._start_turn()
+        game.current_player.mana = 5
+        boars = len(game.other_player.minions)
+        self.assertGreater(boars, 1)
+
+        # The first option damages every minion, and the second asks for the one minion to damage
+        actions = [action for action in game.legal_actions() if type(action) is SpellAction]
+        self.assertEqual(len(game.current_player.hand) * (1 + boars), len(actions))
+        for action in actions:
+            clone = game.clone([ActionAgent(), MinionPlayingAgent()])
+            action.play(clone)
+            if action.card.card_ref.endswith(":1"):
+                self.assertIsNotNone(action.target)
+                self.assertEqual(boars - 1, len(clone.other_player.minions))
+            else:
+                self.assertIsNone(action.target)
+                self.assertEqual(0, len(clone.other_player.minions))
+
+    def test_legal_attack_actions(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, ActionAgent, MinionPlayingAgent)
+        for turn in range(0, 4):
+            game.play_single_turn()
+        game._start_turn()
+        game.current_player.mana = 1
+        game.other_player.minions[0].taunt = True
+
+        actions = list(game.legal_actions())
+        self.assertEqual([MinionAction] * len(game.current_player.hand), [type(action) for action in actions])
+
+        [action for action in actions if type(action) is MinionAction][0].play(game)
+        actions = list(game.legal_actions())
+        attacks = [action for action in actions if type(action) is AttackAction]
+        self.assertEqual(["attack(p1:0,p2:0)"], [action.to_output_string() for action in attacks])
+        attacks[0].play(game)
+        self.assertEqual(0, len(game.current_player.minions))
+        self.assertEqual(1, len(game.other_player.minions))
+        self.assertFalse(game.other_player.minions[0].taunt)
+
+    def test_target_cache(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, MinionPlayingAgent, MinionPlayingAgent)
+        for turn in range(0, 2):
+            game.play_single_turn()
+        game._start_turn()
+
+        targets = hsgame.targetting.find_spell_target(game)
+        self.assertEqual(4, len(targets))
+        self.assertIs(targets, hsgame.targetting.find_spell_target(game))
+        self.assertEqual(1, len(hsgame.targetting.find_spell_target(game, lambda target: target is game.current_player)))
+
+        minion = game.other_player.minions[0]
+        minion.stealth = True
+        targets = hsgame.targetting.find_spell_target(game)
+        self.assertEqual(3, len(targets))
+        self.assertNotIn(minion, targets)
+        self.assertIn(minion, hsgame.targetting.find_battlecry_target(game))
+
+        clone = game.clone()
+        self.assertEqual([clone.other_player, clone.current_player],
+                         list(hsgame.targetting.find_spell_target(clone)[1:]))
+
+        minion.silence()
+        self.assertEqual(4, len(hsgame.targetting.find_spell_target(game)))
+
+        game.current_player.agent.do_turn(game.current_player)
+        self.assertEqual(3, len(hsgame.targetting.find_minion_spell_target(game)))
+        self.assertEqual(2, len(hsgame.targetting.find_friendly_minion_battlecry_target(game)))
+
+        game.current_player.minions[0].die(None)
+        self.assertEqual(2, len(hsgame.targetting.find_minion_spell_target(game)))
+        self.assertEqual(1, len(hsgame.targetting.find_friendly_minion_battlecry_target(game)))
+
+        game._end_turn()
+        game._start_turn()
+        self.assertEqual(1, len(hsgame.targetting.find_friendly_minion_battlecry_target(game)))
+        self.assertEqual((game.other_player.minions[0], game.other_player),
+                         hsgame.targetting.find_enemy_spell_target(game))
+
+
+class TestDeck(unittest.TestCase):
+
+    def test_draw_order(self):
+        # The random number picks the nth card still in the deck, in the order the deck was given in
+        cards = [card_lookup(name) for name in ["Stonetusk Boar", "Moonfire", "Wrath", "Claw", "Innervate"] * 6]
+        deck = Deck(cards, CHARACTER_CLASS.DRUID)
+        remaining = cards.copy()
+        hand = []
+        numbers = random.Random(5)
+        for turn in range(0, 40):
+            if len(hand) > 0 and numbers.randint(0, 3) == 0:
+                card = hand.pop(numbers.randint(0, len(hand) - 1))
+                deck.put_back(card)
+                remaining = [deck_card for deck_card in cards if deck_card in remaining or deck_card is card]
+            elif deck.can_draw():
+                index = numbers.randint(0, deck.left - 1)
+                card = deck.draw(lambda lower, upper: index)
+                self.assertIs(remaining[index], card)
+                remaining.pop(index)
+                hand.append(card)
+            self.assertEqual(len(remaining), deck.left)
+
+    def test_put_back(self):
+        cards = [card_lookup("Stonetusk Boar") for index in range(0, 30)]
+        deck = Deck(cards, CHARACTER_CLASS.DRUID)
+        self.assertRaises(GameException, deck.put_back, cards[3])
+        self.assertRaises(GameException, deck.put_back, card_lookup("Stonetusk Boar"))
+        card = deck.draw(lambda lower, upper: 3)
+        self.assertIs(cards[3], card)
+        deck.put_back(card)
+        self.assertEqual(30, deck.left)
+        self.assertIs(cards[3], deck.draw(lambda lower, upper: 3))
+
+
+
+class TestCardRegistry(unittest.TestCase):
+
+    def test_lookup(self):
+        card = card_lookup("Stonetusk Boar")
+        self.assertIsInstance(card, StonetuskBoar)
+        self.assertIsNot(card, card_lookup("Stonetusk Boar"))
+        self.assertIs(StonetuskBoar, card_registry.card_type("Stonetusk Boar"))
+        self.assertRaises(KeyError, card_lookup, "Not a card")
+
+        # Only the cards themselves are registered, not the classes they are built on
+        self.assertNotIn(MinionCard, card_registry.by_id)
+        self.assertNotIn(SecretCard, card_registry.by_id)
+
+    def test_indexes(self):
+        names = card_registry.names()
+        self.assertEqual(sorted(names), names)
+        for name in names:
+            self.assertEqual(name, card_registry.from_id(card_registry.card_id(name)).name)
+
+        self.assertIn(StonetuskBoar, card_registry.for_class(CHARACTER_CLASS.ALL))
+        self.assertIn(StonetuskBoar, card_registry.for_mana(1))
+        self.assertIn(StonetuskBoar, card_registry.for_rarity(CARD_RARITY.FREE))
+        self.assertIn(KeeperOfTheGrove, card_registry.for_class(CHARACTER_CLASS.DRUID))
+        self.assertNotIn(KeeperOfTheGrove, card_registry.for_class(CHARACTER_CLASS.ALL))
+
+    def test_local_classes_not_registered(self):
+        class TestCard(MinionCard):
+            def __init__(self):
+                super().__init__("Stonetusk Boar", 1, CHARACTER_CLASS.ALL, CARD_RARITY.FREE)
+
+        self.assertIs(StonetuskBoar, card_registry.card_type("Stonetusk Boar"))
+
+    def test_late_registration(self):
+        class FirstCard(MinionCard):
+            def __init__(self):
+                super().__init__("First", 1, CHARACTER_CLASS.ALL, CARD_RARITY.FREE)
+
+        class SecondCard(MinionCard):
+            def __init__(self):
+                super().__init__("Second", 2, CHARACTER_CLASS.MAGE, CARD_RARITY.RARE)
+
+        registry = CardRegistry()
+        registry.register(MinionCard)
+        registry.register(SecondCard)
+        self.assertEqual(["Second"], registry.names())
+        registry.register(FirstCard)
+        self.assertEqual(["First", "Second"], registry.names())
+        self.assertIsInstance(registry.from_id(0), FirstCard)
+
+        class DuplicateCard(MinionCard):
+            def __init__(self):
+                super().__init__("First", 3, CHARACTER_CLASS.ALL, CARD_RARITY.FREE)
+
+        registry.register(DuplicateCard)
+        self.assertRaises(GameException, registry.names)
+        # The failed build leaves nothing half done for later calls to find
+        self.assertEqual([MinionCard, SecondCard, FirstCard], registry.card_types)
+        self.assertRaises(GameException, registry.card_id, "First")
 
 
 class TestBinding(unittest.TestCase):
@@ -167,5 +461,22 @@ class TestBinding(unittest.TestCase):
         event.assert_called_with(5)
         event2.assert_called_with()
 
+    def test_bind_during_trigger(self):
+        calls = []
+        binder = Bindable()
+
+        def first():
+            calls.append("first")
+            binder.bind("test", lambda: calls.append("late"))
+            binder.trigger("test")
+
+        binder.bind_once("test", first)
+        binder.bind("test", lambda: calls.append("second"))
+        binder.trigger("test")
+        self.assertEqual(calls, ["first", "second", "late", "second"])
+        self.assertEqual(len(binder.events["test"]), 2)
 
+        binder.unbind("test", binder.events["test"][0].function)
+        binder.unbind("test", binder.events["test"][0].function)
+        self.assertNotIn("test", binder.events)
 
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from hsgame.agents.basic_agents import PredictableBot
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Game, Deck, card_lookup
+from hsgame.game_random import GameRandom, _stream_seed
+from hsgame.replay import RecordingGame, SavedGame
+
+import hsgame.cards
+
+__author__ = 'Daniel'
+
+
+class TestGameRandom(unittest.TestCase):
+
+    def make_decks(self):
+        return [Deck([card_lookup(name) for name in ["Stonetusk Boar", "Bloodfen Raptor", "Arcane Missiles"] * 10],
+                     CHARACTER_CLASS.MAGE),
+                Deck([card_lookup(name) for name in ["Novice Engineer", "Moonfire", "Claw"] * 10],
+                     CHARACTER_CLASS.DRUID)]
+
+    def make_game(self, random):
+        return Game(self.make_decks(), [PredictableBot(), PredictableBot()], random)
+
+    def test_bounds(self):
+        numbers = GameRandom(7)
+        for upper_bound in [0, 1, 2, 3, 7, 8, 9, 29]:
+            self.assertEqual(set(range(0, upper_bound + 1)),
+                             set(numbers.randint(0, upper_bound) for index in range(0, 2000)))
+        large = [numbers.randint(0, 1000) for index in range(0, 2000)]
+        self.assertLessEqual(max(large), 1000)
+        self.assertGreaterEqual(min(large), 0)
+        self.assertEqual(set(range(-3, 3)), set(numbers.randint(-3, 2) for index in range(0, 500)))
+        self.assertRaises(ValueError, numbers.randint, 3, 2)
+
+        # Ranges whose size is a power of two use each number drawn, without throwing any away
+        for upper_bound in [1, 3, 31]:
+            bits = (upper_bound + 1).bit_length() - 1
+            draws = random.Random(_stream_seed(7, 0)).getrandbits
+            numbers = GameRandom(7)
+            self.assertEqual([draws(bits) for index in range(0, 100)],
+                             [numbers.randint(0, upper_bound) for index in range(0, 100)])
+
+    def test_streams(self):
+        def numbers(game_random):
+            return [game_random.randint(0, 1 << 30) for index in range(0, 10)]
+
+        self.assertEqual(numbers(GameRandom(5)), numbers(GameRandom(5)))
+        self.assertEqual(numbers(GameRandom(5, 2)), numbers(GameRandom(5).substream(2)))
+        sequences = [numbers(GameRandom(5, 0)), numbers(GameRandom(5, 1)), numbers(GameRandom(6, 0)),
+                     numbers(GameRandom("5", 0))]
+        self.assertEqual(4, len(set(tuple(sequence) for sequence in sequences)))
+
+        unseeded = GameRandom()
+        self.assertEqual(numbers(unseeded.substream(0)), numbers(GameRandom(unseeded.seed)))
+
+    def test_game(self):
+        game = self.make_game(GameRandom(3, 4))
+        game.start()
+        again = self.make_game(GameRandom(3, 4).randint)
+        again.start()
+        self.assertEqual([player.health for player in game.players], [player.health for player in again.players])
+        self.assertEqual([player.deck.left for player in game.players], [player.deck.left for player in again.players])
+
+    def test_clone(self):
+        game = self.make_game(GameRandom(11))
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 6):
+            game.play_single_turn()
+        clone = game.clone()
+        for turn in range(0, 6):
+            game.play_single_turn()
+            clone.play_single_turn()
+        self.assertEqual([[card.name for card in player.hand] for player in game.players],
+                         [[card.name for card in player.hand] for player in clone.players])
+        self.assertEqual(game.random(0, 1 << 30), clone.random(0, 1 << 30))
+
+    def test_recording(self):
+        game = RecordingGame(self.make_decks(), [PredictableBot(), PredictableBot()], random=GameRandom(8))
+        game.start()
+        saved = SavedGame(game.replay)
+        saved.start()
+        self.assertEqual([player.health for player in game.players], [player.health for player in saved.players])
+        self.assertEqual([player.deck.left for player in game.players],
+                         [player.deck.left for player in saved.players])
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO, BytesIO
+from os import listdir
+import re
+
+from hsgame.replay import Replay, SavedGame, ReplayException
+from hsgame.replay_corpus import ReplayCorpus
+
+__author__ = 'Daniel'
+
+
+def replay_text(replay):
+    output = StringIO()
+    replay.write_replay(output)
+    return output.getvalue()
+
+
+class TestReplayCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "replays.dat")
+        self.files = sorted(filter(lambda file: re.compile(r'.*\.rep$').match(file), listdir("tests/replays")))
+        self.replays = []
+        for rfile in self.files:
+            replay = Replay()
+            replay.parse_replay("tests/replays/" + rfile)
+            self.replays.append(replay)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_random_access(self):
+        with ReplayCorpus(self.path) as corpus:
+            self.assertEqual(len(corpus), 0)
+            self.assertEqual(corpus.append(self.replays[0]), 0)
+            self.assertEqual(corpus.extend(self.replays[1:] * 2), len(self.replays) * 2 - 1)
+
+        with ReplayCorpus(self.path) as corpus:
+            self.assertEqual(len(corpus), len(self.replays) * 2 - 1)
+            self.assertEqual(replay_text(corpus[0]), replay_text(self.replays[0]))
+            self.assertEqual(replay_text(corpus[-1]), replay_text(self.replays[-1]))
+            self.assertEqual([replay_text(replay) for replay in corpus],
+                             [replay_text(replay) for replay in self.replays + self.replays[1:]])
+            self.assertRaises(IndexError, corpus.raw, len(corpus))
+
+            # Replays added after the files are mapped can be read
+            corpus.append(self.replays[0])
+            self.assertEqual(len(corpus), len(self.replays) * 2)
+            self.assertEqual(replay_text(corpus[len(corpus) - 1]), replay_text(self.replays[0]))
+
+    def test_append_raw(self):
+        binary = BytesIO()
+        self.replays[1].write_binary_replay(binary)
+        with ReplayCorpus(self.path) as corpus:
+            self.assertEqual(corpus.append_raw(binary.getvalue()), 0)
+            self.assertEqual(corpus.raw(0), binary.getvalue())
+            self.assertEqual(replay_text(corpus[0]), replay_text(self.replays[1]))
+            self.assertRaises(ReplayException, corpus.append_raw, b"deck(Mage,Stonetusk Boar)")
+            self.assertEqual(len(corpus), 1)
+
+    def test_find(self):
+        def boar_on_turn_one(replay):
+            game = SavedGame(replay)
+            turns = []
+            played = []
+            game.players[0].bind("turn_started", lambda: turns.append(True))
+            game.players[0].bind("card_played", lambda card: played.append((len(turns), card.name)))
+            game.start()
+            return (1, "Stonetusk Boar") in played
+
+        with ReplayCorpus(self.path) as corpus:
+            corpus.extend(self.replays)
+            self.assertEqual([self.files[index] for index in corpus.find(boar_on_turn_one)],
+                             ["example.rep", "stonetusk_power.rep"])
+
+    def test_unfinished_append(self):
+        with ReplayCorpus(self.path) as corpus:
+            corpus.extend(self.replays[0:2])
+
+        # Data written without its offset being added to the index isn't part of the corpus
+        with open(self.path, 'ab') as data:
+            data.write(b"HSR\x01\x05")
+        with ReplayCorpus(self.path) as corpus:
+            self.assertEqual(len(corpus), 2)
+            corpus.append(self.replays[2])
+            self.assertEqual(replay_text(corpus[2]), replay_text(self.replays[2]))
+
+        with open(self.path + ".idx", 'r+b') as index:
+            index.write(b"XXXX")
+        self.assertRaises(ReplayException, ReplayCorpus, self.path)
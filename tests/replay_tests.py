@@ -1,9 +1,9 @@
 import unittest
-from io import StringIO
+from io import StringIO, BytesIO
 from os import listdir
 import re
 
-from hsgame.replay import Replay, RecordingGame, SavedGame
+from hsgame.replay import Replay, RecordingGame, SavedGame, ReplayException, read_replays
 from hsgame.agents.basic_agents import PredictableBot
 from hsgame.constants import CHARACTER_CLASS
 from hsgame.cards import *
@@ -37,6 +37,141 @@ class TestReplay(unittest.TestCase):
 
             self.assertEqual(output.getvalue(), file_string)
 
+    def test_binary_round_trip(self):
+        self.maxDiff = None
+        for rfile in filter(lambda file: re.compile(r'.*\.rep$').match(file), listdir("tests/replays")):
+            replay = Replay()
+            replay.parse_replay("tests/replays/" + rfile)
+            text = StringIO()
+            replay.write_replay(text)
+
+            binary = BytesIO()
+            replay.write_binary_replay(binary)
+            binary_replay = Replay()
+            binary_replay.parse_binary_replay(binary.getvalue())
+            output = StringIO()
+            binary_replay.write_replay(output)
+
+            self.assertEqual(output.getvalue(), text.getvalue())
+            self.assertLess(len(binary.getvalue()), len(text.getvalue()))
+
+    def test_binary_round_trip_without_repeats(self):
+        replay = Replay()
+        names = hsgame.game_objects.card_registry.names()[0:15]
+        replay.parse_replay(StringIO("deck(Mage," + ",".join(names + names[::-1]) + ")\n"
+                                     "deck(Hunter,Stonetusk Boar)\nrandom(1,300,70000)\nend()\n"))
+        binary = BytesIO()
+        replay.write_binary_replay(binary)
+        binary_replay = Replay()
+        binary_replay.parse_binary_replay(binary.getvalue())
+
+        self.assertEqual([card.name for card in binary_replay.decks[0].cards], names + names[::-1])
+        self.assertEqual(binary_replay.decks[1].character_class, CHARACTER_CLASS.HUNTER)
+        self.assertEqual(binary_replay.random_numbers, [1, 300, 70000])
+        self.assertEqual(binary_replay.keeps, [[0, 1, 2], [0, 1, 2, 3]])
+
+        self.assertRaises(ReplayException, Replay().parse_binary_replay, b"deck(Mage,Wisp)")
+        self.assertRaises(ReplayException, Replay().parse_binary_replay, binary.getvalue()[:-1])
+
+    def test_reading_many_replays(self):
+        self.maxDiff = None
+        files = sorted(filter(lambda file: re.compile(r'.*\.rep$').match(file), listdir("tests/replays")))
+        archive = ""
+        expected = []
+        for rfile in files:
+            f = open("tests/replays/" + rfile, 'r')
+            archive += f.read() + "\n\n"
+            f.close()
+            replay = Replay()
+            replay.parse_replay("tests/replays/" + rfile)
+            output = StringIO()
+            replay.write_replay(output)
+            expected.append(output.getvalue())
+
+        outputs = []
+        for replay in read_replays(StringIO(archive)):
+            output = StringIO()
+            replay.write_replay(output)
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs, expected)
+
+        # Actions that aren't read are skipped
+        replays = read_replays(StringIO(archive))
+        first = next(replays)
+        next(first.actions)
+        self.assertEqual(len(list(replays)), len(files) - 1)
+        self.assertEqual(list(first.actions), [])
+
+        # Replays without any actions
+        replays = list(read_replays(StringIO("deck(Mage,Stonetusk Boar)\ndeck(Druid,Innervate)\n" * 3)))
+        self.assertEqual(len(replays), 3)
+        self.assertEqual(replays[2].decks[1].character_class, CHARACTER_CLASS.DRUID)
+
+    def test_loading_streamed_game(self):
+        f = open("tests/replays/example.rep", 'r')
+        archive = f.read()
+        f.close()
+        games = 0
+        for replay in read_replays(StringIO(archive + archive)):
+            game = SavedGame(replay)
+            game.start()
+            games += 1
+            self.assertEqual(game.current_player.deck.character_class, CHARACTER_CLASS.DRUID)
+            self.assertEqual(game.current_player.health, 29)
+            self.assertTrue(game.current_player.dead)
+        self.assertEqual(games, 2)
+
+    def test_seeking(self):
+        def state(game):
+            return [(player.health, player.armour, player.mana, player.max_mana, [card.name for card in player.hand],
+                     [(minion.card.name, minion.attack_power, minion.defense) for minion in player.minions],
+                     player.deck.left) for player in game.players] + \
+                   [game.current_player.name, game.action_index, game.random_index, game.turn, game.game_ended]
+
+        played = SavedGame("tests/replays/stonetusk_innervate.rep")
+        played.pre_game()
+        played.current_player = played.players[1]
+        states = [state(played)]
+        while not played.game_ended:
+            played.play_single_turn()
+            states.append(state(played))
+
+        game = SavedGame("tests/replays/stonetusk_innervate.rep", 5)
+        self.assertEqual(state(game.seek(7)), states[7])
+        self.assertEqual(sorted(game.source.snapshots), [0, 5, 10, 15])
+        self.assertEqual(state(game), states[-1])
+        for turn in range(0, len(states)):
+            self.assertEqual(state(game.seek(turn)), states[turn])
+        self.assertEqual(state(game.seek(100)), states[-1])
+        self.assertRaises(ReplayException, game.seek, -1)
+        self.assertEqual(sorted(game.source.snapshots), [0, 5, 10, 15])
+
+        # A copy found by seeking can be played on to the end
+        game = game.seek(12)
+        while not game.game_ended:
+            game.play_single_turn()
+        self.assertEqual(state(game), states[-1])
+
+        self.assertRaises(ReplayException, SavedGame("tests/replays/stonetusk_innervate.rep").seek, 3)
+
+    def test_snapshot_directive(self):
+        replay = Replay()
+        replay.parse_replay(StringIO("deck(Mage,Stonetusk Boar)\ndeck(Druid,Innervate)\nsnapshot(10)\nend()\n"))
+        self.assertEqual(replay.snapshot_interval, 10)
+        self.assertEqual(SavedGame(replay).snapshot_interval, 10)
+
+        output = StringIO()
+        replay.write_replay(output)
+        self.assertIn("snapshot(10)\n", output.getvalue())
+
+        binary = BytesIO()
+        replay.write_binary_replay(binary)
+        binary_replay = Replay()
+        binary_replay.parse_binary_replay(binary.getvalue())
+        self.assertEqual(binary_replay.snapshot_interval, 10)
+
+        self.assertRaises(ReplayException, Replay().parse_replay, StringIO("snapshot(0)\n"))
+
     def test_loading_game(self):
         game = SavedGame("tests/replays/example.rep")
 
@@ -64,6 +199,72 @@ class TestReplay(unittest.TestCase):
         self.assertEqual(output.getvalue(), f.read())
         f.close()
 
+    def test_recording_choices(self):
+        random.seed(1357)
+        logged = []
+        deck1 = hsgame.game_objects.Deck([ArgentProtector(), StonetuskBoar(), Consecration()] * 10,
+                                         CHARACTER_CLASS.PALADIN)
+        deck2 = hsgame.game_objects.Deck([Wrath(), KeeperOfTheGrove(), DruidOfTheClaw(), Innervate()] * 7 +
+                                         [Wrath(), Innervate()], CHARACTER_CLASS.DRUID)
+        game = RecordingGame([deck1, deck2], [PredictableBot(), PredictableBot()], logged.append)
+
+        states = []
+
+        def turn_ended(game):
+            if not game.game_ended:
+                states.append([(player.health, [(minion.card.name, minion.defense) for minion in player.minions])
+                               for player in game.players])
+
+        for player in game.players:
+            player.bind("turn_ended", turn_ended, game)
+        game.start()
+
+        self.assertEqual(logged, [game.replay_bytes()])
+        replay = Replay()
+        replay.parse_binary_replay(logged[0])
+        output = StringIO()
+        replay.write_replay(output)
+        # Wrath's option and target, and Argent Protector's target
+        self.assertIn("play(0:0,p2:0)\n", output.getvalue())
+        self.assertIn("summon(0,0,p2:0)\n", output.getvalue())
+
+        saved = SavedGame(replay)
+        replayed_states = []
+        for player in saved.players:
+            player.bind("turn_ended", turn_ended, saved)
+        states, recorded_states = replayed_states, states
+        saved.start()
+        self.assertEqual(replayed_states, recorded_states)
+
+        # Starfall only asks for a target with its second option
+        class LastOptionBot(PredictableBot):
+            def choose_option(self, *options):
+                return options[-1]
+
+        random.seed(1357)
+        logged = []
+        deck1 = hsgame.game_objects.Deck([StonetuskBoar(), BloodfenRaptor()] * 15, CHARACTER_CLASS.MAGE)
+        deck2 = hsgame.game_objects.Deck([Starfall(), Innervate()] * 15, CHARACTER_CLASS.DRUID)
+        game = RecordingGame([deck1, deck2], [PredictableBot(), LastOptionBot()], logged.append)
+        states = []
+        for player in game.players:
+            player.bind("turn_ended", turn_ended, game)
+        game.start()
+
+        replay = Replay()
+        replay.parse_binary_replay(logged[0])
+        output = StringIO()
+        replay.write_replay(output)
+        self.assertRegex(output.getvalue(), r"play\(\d+:1,p\d:\d+\)\n")
+
+        saved = SavedGame(replay)
+        replayed_states = []
+        for player in saved.players:
+            player.bind("turn_ended", turn_ended, saved)
+        states, recorded_states = replayed_states, states
+        saved.start()
+        self.assertEqual(replayed_states, recorded_states)
+
     def test_option_replay(self):
         game = SavedGame("tests/replays/stonetusk_power.rep")
         game.start()
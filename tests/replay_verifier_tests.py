@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+from hsgame.replay import Replay
+from hsgame.replay_corpus import ReplayCorpus
+from hsgame.replay_verifier import verify_replays, read_baseline, write_baseline
+import hsgame.replay_verifier
+
+__author__ = 'Daniel'
+
+REPLAYS = ["tests/replays/example.rep", "tests/replays/stonetusk_innervate.rep", "tests/replays/stonetusk_power.rep"]
+
+
+class TestReplayVerifier(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_digests(self):
+        result = verify_replays(REPLAYS, processes=1)
+        self.assertEqual(sorted(result.digests), [path + "#0" for path in REPLAYS])
+        digest = result.digests["tests/replays/stonetusk_innervate.rep#0"]
+        self.assertEqual(digest.turns, 18)
+        self.assertEqual(digest.health, "-4+0,1+0")
+        self.assertIsNone(digest.error)
+
+        parallel = verify_replays(REPLAYS, processes=2)
+        self.assertEqual({key: digest.to_line() for key, digest in parallel.digests.items()},
+                         {key: digest.to_line() for key, digest in result.digests.items()})
+
+    def test_divergences(self):
+        baseline_file = os.path.join(self.directory, "baseline.txt")
+        write_baseline(verify_replays(REPLAYS, processes=1).digests, baseline_file)
+        baseline = read_baseline(baseline_file)
+        self.assertEqual(verify_replays(REPLAYS, baseline, processes=1).divergences, [])
+
+        baseline["tests/replays/example.rep#0"].turns = 3
+        del baseline["tests/replays/stonetusk_power.rep#0"]
+        result = verify_replays(REPLAYS, baseline, processes=1)
+        self.assertEqual(result.divergences, [("tests/replays/example.rep#0", "turns", "3", "6")])
+        self.assertEqual(result.unknown, ["tests/replays/stonetusk_power.rep#0"])
+        output = StringIO()
+        result.write_report(output)
+        self.assertIn("tests/replays/example.rep#0: turns was '3', now '6'", output.getvalue())
+
+    def test_corpus_and_errors(self):
+        replays = []
+        for path in REPLAYS:
+            replay = Replay()
+            replay.parse_replay(path)
+            replays.append(replay)
+        corpus_path = os.path.join(self.directory, "replays.dat")
+        with ReplayCorpus(corpus_path) as corpus:
+            corpus.extend(replays * 3)
+
+        broken = os.path.join(self.directory, "broken.rep")
+        with open(broken, "w") as file:
+            file.write("deck(Mage,Stonetusk Boar)\ndeck(Druid,Innervate)\nplay(9)\n")
+
+        shard_size = hsgame.replay_verifier.CORPUS_SHARD_SIZE
+        hsgame.replay_verifier.CORPUS_SHARD_SIZE = 2
+        try:
+            result = verify_replays([corpus_path, broken], processes=2)
+        finally:
+            hsgame.replay_verifier.CORPUS_SHARD_SIZE = shard_size
+
+        self.assertEqual(len(result.digests), 10)
+        expected = verify_replays(REPLAYS, processes=1).digests
+        for index in range(0, 9):
+            self.assertEqual(result.digests["{0}#{1}".format(corpus_path, index)].fields(),
+                             expected[REPLAYS[index % 3] + "#0"].fields())
+        self.assertEqual(result.errors(), [broken + "#0"])
+        self.assertTrue(result.digests[broken + "#0"].error.startswith("IndexError"))
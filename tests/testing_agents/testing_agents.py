@@ -61,4 +61,26 @@ class MinionAttackingAgent(MinionPlayingAgent):
         super().do_turn(player)
         for minion in player.minions.copy():
             if minion.can_attack():
-                minion.attack()
\ No newline at end of file
+                minion.attack()
+
+class ActionAgent(DoNothingBot):
+    def __init__(self):
+        super().__init__()
+        self.next_target = None
+        self.next_index = -1
+        self.next_option = None
+
+    def choose_target(self, targets):
+        if self.next_target is not None:
+            return self.next_target
+        return super().choose_target(targets)
+
+    def choose_index(self, card):
+        if self.next_index >= 0:
+            return self.next_index
+        return super().choose_index(card)
+
+    def choose_option(self, *options):
+        if self.next_option is not None:
+            return options[self.next_option]
+        return super().choose_option(*options)
@@ -1,6 +1,8 @@
 import copy
+from hsgame.agents.basic_agents import DoNothingBot
+from hsgame.cards import StonetuskBoar
 from hsgame.constants import CHARACTER_CLASS
-from hsgame.game_objects import Deck, Game
+from hsgame.game_objects import Deck, Game, card_lookup
 
 __author__ = 'Daniel'
 class StackedDeck(Deck):
@@ -14,13 +16,10 @@ class StackedDeck(Deck):
         super().__init__(cards, character_class)
 
     def draw(self, random):
-        for card_index in range(0, 30):
-            if not self.used[card_index]:
-                self.used[card_index] = True
-                self.left -= 1
-                return self.cards[card_index]
+        if not self.can_draw():
+            return None
 
-        return None
+        return super().draw(lambda lower, upper: lower)
 
 
 def generate_game_for(card1, card2, first_agent_type, second_agent_type):
@@ -44,3 +43,33 @@ def generate_game_for(card1, card2, first_agent_type, second_agent_type):
     game.pre_game()
     return game
 
+
+
+def lethal_position(make_agent):
+    """
+        A game in which the player using the agent made by make_agent can win by attacking with any of their boars
+    """
+    game = generate_game_for(StonetuskBoar, StonetuskBoar, make_agent, DoNothingBot)
+    for turn in range(0, 3):
+        game.play_single_turn()
+    game._start_turn()
+    if isinstance(game.current_player.agent, DoNothingBot):
+        game._end_turn()
+        game._start_turn()
+    game.other_player.health = 1
+    game.current_player.mana = 0
+    return game
+
+
+def mixed_deck(character_class):
+    return Deck([card_lookup(name) for name in ["Argent Protector", "Keeper of the Grove", "Wrath",
+                                                "Bloodfen Raptor", "Consecration"] * 6], character_class)
+
+
+def play_against_nothing(agent):
+    """
+        Plays a whole game of mixed decks between agent and a DoNothingBot, and returns the agent's player
+    """
+    game = Game([mixed_deck(CHARACTER_CLASS.PALADIN), mixed_deck(CHARACTER_CLASS.DRUID)], [agent, DoNothingBot()])
+    game.start()
+    return [player for player in game.players if player.agent is agent][0]
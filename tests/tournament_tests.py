@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+
+from hsgame.agents.basic_agents import PredictableBot, DoNothingBot
+from hsgame.tournament import run_tournament, play_game, main
+
+__author__ = 'Daniel'
+
+
+class BrokenBot(DoNothingBot):
+    # Stands in for a bug in a card, which can raise any kind of exception
+    def do_turn(self, player):
+        raise TypeError("broken")
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.decks = [("Mage", ["Stonetusk Boar", "Bloodfen Raptor", "Arcane Missiles"]),
+                      ("Druid", ["Novice Engineer", "Moonfire", "Claw"])]
+
+    def test_play_game(self):
+        result = play_game(0, 1234, self.decks, [PredictableBot, DoNothingBot])
+        self.assertIsNone(result.error)
+        self.assertEqual(0, result.winner)
+        self.assertGreater(result.turns, 0)
+        self.assertEqual({}, result.cards_played[1])
+        self.assertGreater(sum(result.cards_played[0].values()), 0)
+
+        again = play_game(0, 1234, self.decks, [PredictableBot, DoNothingBot])
+        self.assertEqual(result.turns, again.turns)
+        self.assertEqual(result.cards_played, again.cards_played)
+
+    def test_errors(self):
+        result = play_game(3, 1234, self.decks, [BrokenBot, DoNothingBot])
+        self.assertEqual("TypeError: broken", result.error)
+        self.assertIsNone(result.winner)
+
+        result = run_tournament(self.decks, [BrokenBot, BrokenBot], 4, processes=1, seed=5)
+        self.assertEqual(0, result.games)
+        self.assertEqual(4, len(result.errors))
+
+    def test_tournament(self):
+        result = run_tournament(self.decks, [PredictableBot, PredictableBot], 20, processes=1, seed=5)
+        self.assertEqual(20, result.games + len(result.errors))
+        self.assertEqual(result.games, result.wins[0] + result.wins[1] + result.draws)
+        self.assertLessEqual(result.shortest, result.average_length())
+        self.assertGreaterEqual(result.longest, result.average_length())
+        for played, won in result.card_stats[0].values():
+            self.assertLessEqual(won, played)
+
+        parallel = run_tournament(self.decks, [PredictableBot, PredictableBot], 20, processes=2, seed=5)
+        self.assertEqual(result.wins, parallel.wins)
+        self.assertEqual(result.turns, parallel.turns)
+        self.assertEqual(result.card_stats, parallel.card_stats)
+
+    def test_command_line(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["--deck", "Mage:Stonetusk Boar", "--deck", "Druid:Novice Engineer", "--games", "4",
+                  "--processes", "1", "--agent", "hsgame.agents.basic_agents.PredictableBot",
+                  "--agent", "hsgame.agents.basic_agents.DoNothingBot"])
+        self.assertTrue(output.getvalue().startswith("4 games, 0 draws, 0 errors"))
+        self.assertIn("Deck 1 (Mage: Stonetusk Boar): 4 wins, 100.0%", output.getvalue())
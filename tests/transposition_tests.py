@@ -0,0 +1,109 @@
+import random
+import unittest
+
+from hsgame.agents.search_agents import MCTSAgent
+from hsgame.cards import StonetuskBoar
+from hsgame.constants import CHARACTER_CLASS
+from hsgame.game_objects import Game, Deck, card_lookup
+from hsgame.transpositions import state_hash, TranspositionTable, minion_key
+from tests.testing_agents import ActionAgent
+from tests.testing_utils import generate_game_for
+
+__author__ = 'Daniel'
+
+
+class TestStateHash(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1857)
+        cards = [card_lookup(name) for name in ["Stonetusk Boar", "Bloodfen Raptor", "Elven Archer"] * 10]
+        self.game = Game([Deck(cards, CHARACTER_CLASS.MAGE), Deck(cards.copy(), CHARACTER_CLASS.MAGE)],
+                         [ActionAgent(), ActionAgent()])
+        self.game.pre_game()
+        self.game.current_player = self.game.players[1]
+        self.game._start_turn()
+        self.game.current_player.mana = 10
+
+    def play(self, game, name, index):
+        player = game.current_player
+        card = [card for card in player.hand if card.name == name][0]
+        player.agent.next_index = index
+        game.play_card(card)
+        player.agent.next_index = -1
+
+    def test_transposition(self):
+        names = sorted(set([card.name for card in self.game.current_player.hand]))
+        self.assertGreater(len(names), 1)
+        clone = self.game.clone()
+        self.assertEqual(state_hash(self.game), state_hash(clone))
+
+        self.play(self.game, names[0], 0)
+        self.play(self.game, names[1], 1)
+        self.play(clone, names[1], 0)
+        self.assertNotEqual(state_hash(self.game), state_hash(clone))
+        self.play(clone, names[0], 0)
+        self.assertEqual(state_hash(self.game), state_hash(clone))
+
+        # The same minions in a different order are a different game
+        swapped = self.game.clone()
+        minions = swapped.current_player.minions
+        minions[0], minions[1] = minions[1], minions[0]
+        self.assertNotEqual(state_hash(self.game), state_hash(swapped))
+
+        # So are the same cards in a different order in the hand, as actions pick cards by their place in it
+        reordered = self.game.clone()
+        hand = reordered.current_player.hand
+        other = [index for index, card in enumerate(hand) if card.name != hand[0].name][0]
+        hand[0], hand[other] = hand[other], hand[0]
+        self.assertNotEqual(state_hash(self.game), state_hash(reordered))
+
+    def test_changes(self):
+        self.play(self.game, self.game.current_player.hand[0].name, 0)
+        before = state_hash(self.game)
+        minion = self.game.current_player.minions[0]
+        player_index = self.game.players.index(self.game.current_player)
+        old_key = minion_key(minion, player_index, 0)
+        minion.defense -= 1
+        after = state_hash(self.game)
+        self.assertNotEqual(before, after)
+        # The hash can be updated with the keys of the parts which have changed
+        self.assertEqual(after, (before ^ old_key ^ minion_key(minion, player_index, 0)) & (1 << 64) - 1)
+
+        self.game.current_player.mana -= 1
+        self.assertNotEqual(after, state_hash(self.game))
+        self.assertLess(state_hash(self.game), 1 << 64)
+        self.assertGreaterEqual(state_hash(self.game), 0)
+
+        turn = state_hash(self.game)
+        self.game.current_player = self.game.other_player
+        self.assertNotEqual(turn, state_hash(self.game))
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_eviction(self):
+        table = TranspositionTable(2)
+        table.put(1, "one")
+        table.put(2, "two")
+        self.assertEqual("one", table.get(1))
+        table.put(3, "three")
+        # 2 was used least recently
+        self.assertEqual(2, len(table))
+        self.assertNotIn(2, table)
+        self.assertIsNone(table.get(2))
+        self.assertEqual("one", table.setdefault(1, "uno"))
+        self.assertEqual("four", table.setdefault(4, "four"))
+        self.assertEqual([1, 4], list(table.entries))
+        self.assertEqual(2, table.hits)
+        self.assertEqual(2, table.misses)
+
+    def test_shared_by_agents(self):
+        random.seed(1857)
+        table = TranspositionTable(1000)
+        game = generate_game_for(StonetuskBoar, StonetuskBoar,
+                                 lambda: MCTSAgent(None, 30, seed=1, transpositions=table),
+                                 lambda: MCTSAgent(None, 30, seed=2, transpositions=table))
+        for turn in range(0, 6):
+            game.play_single_turn()
+        self.assertGreater(len(table), 0)
+        self.assertGreater(table.hits, 0)